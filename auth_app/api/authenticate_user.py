@@ -1,23 +1,44 @@
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
 from rest_framework import serializers
-from rest_framework.authentication import authenticate
 
 from auth_app.api.dicts import LoginUserDict
+from auth_app.hashing import run_password_hashing
 
 
 def authenticate_user(attrs: LoginUserDict):
     """
     Authenticate a user based on provided login credentials.
 
-    Given a dictionary with email and password, attempts to
-    authenticate the user using Django's authentication system.
-    Raises a validation error when credentials are invalid,
-    otherwise returns the authenticated User instance.
+    Given a dictionary with username and password, checks the password
+    like Django's ModelBackend, but runs the hashing on the bounded pool
+    of auth_app.hashing. Unknown usernames are hashed as well, so they
+    take as long as wrong passwords. Raises a validation error when
+    credentials are invalid, otherwise returns the authenticated User
+    instance.
+
+    Raises:
+        serializers.ValidationError: If the credentials are invalid.
+        HashingUnavailable: If the hashing pool is saturated.
     """
     username = attrs.get("username")
     password = attrs.get("password")
 
-    user = authenticate(username=username, password=password)
-    if not user:
+    user = User._default_manager.filter(username=username).first()
+    if user is None:
+        run_password_hashing(make_password, password)
+        is_valid = False
+    else:
+        outdated = []
+        is_valid = run_password_hashing(
+            check_password, password, user.password, outdated.append
+        )
+        if is_valid and outdated:
+            # The hasher's parameters changed since the password was set.
+            user.password = run_password_hashing(make_password, password)
+            user.save(update_fields=["password"])
+
+    if not is_valid or not user.is_active:
         raise serializers.ValidationError(
             f"Invalid username or password for {username} and {password}"
         )
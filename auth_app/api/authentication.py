@@ -0,0 +1,211 @@
+"""
+Token authentication with an in-process cache.
+
+DRF's TokenAuthentication loads the token and its user with one query
+on every request. CachedTokenAuthentication keeps recent token lookups
+in a bounded LRU with a TTL per process, so repeated requests with the
+same token skip that query.
+
+Entries are dropped by signal handlers (see auth_app.signals) when a
+token is saved or deleted and when its user or the user's profile is
+saved or deleted, e.g. deactivated. Those signals only reach the
+process that made the change, so other processes notice changes at the
+latest after TOKEN_AUTH_CACHE_TTL seconds.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from auth_app.api.helpers import get_user_profile
+from auth_app.api.signed_tokens import (
+    InvalidSignedToken,
+    get_token_user,
+    is_signed_token,
+    verify_signed_token,
+)
+
+TOKEN_AUTH_CACHE_SIZE = 1024
+TOKEN_AUTH_CACHE_TTL = 60
+
+
+class TokenCache:
+    """
+    Thread-safe LRU of tokens with their users, expiring after a TTL.
+
+    The size and TTL are read from the TOKEN_AUTH_CACHE_SIZE and
+    TOKEN_AUTH_CACHE_TTL settings on every write, so they can be changed
+    in tests.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Return the cached token for a key and count a hit or miss.
+
+        Returns:
+            Token or None: The token with its user, or None if the key is
+                not cached or its entry expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, token, generation):
+        """
+        Cache a token loaded from the database.
+
+        Args:
+            key (str): The token key.
+            token (Token): The token with its user.
+            generation (int): The cache's generation read before the
+                token was loaded. If an entry was invalidated since, the
+                token may be stale and is not cached.
+        """
+        max_size = getattr(
+            settings, "TOKEN_AUTH_CACHE_SIZE", TOKEN_AUTH_CACHE_SIZE
+        )
+        ttl = getattr(settings, "TOKEN_AUTH_CACHE_TTL", TOKEN_AUTH_CACHE_TTL)
+        if max_size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._remove(key)
+            self._entries[key] = (token, time.monotonic() + ttl)
+            self._keys_by_user.setdefault(token.user_id, set()).add(key)
+            while len(self._entries) > max_size:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key):
+        """Drop the entry of a token key."""
+        with self._lock:
+            self.generation += 1
+            self._remove(key)
+
+    def delete_user(self, user_id):
+        """Drop the entries of every token of a user."""
+        with self._lock:
+            self.generation += 1
+            for key in self._keys_by_user.get(user_id, set()).copy():
+                self._remove(key)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """
+        Return the hit and miss counters of this process.
+
+        Returns:
+            dict: Number of hits and misses, the resulting hit rate (None
+                while no request has been counted) and the cached tokens.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else None,
+                "size": len(self._entries),
+            }
+
+    def _remove(self, key):
+        """Remove an entry; the caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[0].user_id
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication answering repeated tokens from token_cache.
+
+    Tokens are loaded with their user and the user's profile, so role
+    permissions (see auth_app.api.permissions) need no query either.
+    Every request gets its own copies of the cached token, user and
+    profile, so changes a view makes to request.user never leak into
+    other requests.
+    """
+
+    def authenticate_credentials(self, key):
+        """
+        Return the user and token of a key, loading them on a cache miss.
+
+        Signed tokens (see auth_app.api.signed_tokens) are verified in
+        memory instead; their payload is returned as the token.
+
+        Raises:
+            AuthenticationFailed: If the token does not exist, is invalid,
+                expired or revoked, or its user is inactive.
+        """
+        if is_signed_token(key):
+            try:
+                payload = verify_signed_token(key)
+            except InvalidSignedToken as error:
+                raise AuthenticationFailed(_(str(error)))
+            return get_token_user(payload), payload
+
+        token = token_cache.get(key)
+        if token is None:
+            generation = token_cache.generation
+            model = self.get_model()
+            try:
+                token = model.objects.select_related("user__userprofile").get(
+                    key=key
+                )
+            except model.DoesNotExist:
+                raise AuthenticationFailed(_("Invalid token."))
+            token_cache.set(key, token, generation)
+
+        if not token.user.is_active:
+            raise AuthenticationFailed(_("User inactive or deleted."))
+
+        user = copy.copy(token.user)
+        profile = get_user_profile(token.user)
+        if profile is not None:
+            user.userprofile = copy.copy(profile)
+        token = copy.copy(token)
+        token.user = user
+        return user, token
+
+
+def get_token_cache_stats():
+    """Return hit and miss counters of the token authentication cache."""
+    return token_cache.get_stats()
@@ -1,8 +1,25 @@
 import os
 
+from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.fields.files import FieldFile
 
 
 def extract_filename(field_file: FieldFile) -> str:
     """Extracts only the filename from a Django FieldFile object."""
     return os.path.basename(field_file.name)
+
+
+def get_user_profile(user):
+    """
+    Return the profile of a user, or None if the user has none.
+
+    Users authenticated by CachedTokenAuthentication come with their
+    profile, so this runs no query. Other users load it once, afterwards
+    it is cached on the user instance for the rest of the request.
+    """
+    if not user or not user.is_authenticated:
+        return None
+    try:
+        return user.userprofile
+    except ObjectDoesNotExist:
+        return None
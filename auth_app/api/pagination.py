@@ -0,0 +1,23 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserProfileCursorPagination(CursorPagination):
+    """
+    Keyset pagination class for the profile lists.
+
+    Opt-in, selected with the 'pagination=cursor' query parameter.
+    Profiles are ordered by their user's id, which is unique, so pages
+    are located by the last user id alone and deep pages cost the same
+    as the first one. No COUNT query runs.
+
+    Attributes:
+        page_size (int): Default number of items per page (50).
+        page_size_query_param (str): Query parameter name for custom page size.
+        max_page_size (int): Maximum allowed items per page (200).
+        ordering (str): Keyset ordering (oldest users first).
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "user_id"
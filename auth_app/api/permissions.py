@@ -1,6 +1,6 @@
 from rest_framework.permissions import BasePermission, IsAuthenticated
 
-from auth_app.models import UserProfile
+from auth_app.api.helpers import get_user_profile
 
 
 class IsBusinessUser(BasePermission):
@@ -17,9 +17,7 @@ class IsBusinessUser(BasePermission):
         if not IsAuthenticated().has_permission(request, view):
             return False
 
-        user_profile = UserProfile.objects.filter(
-            user_id=request.user.id
-        ).first()
+        user_profile = get_user_profile(request.user)
         if not user_profile:
             return False
 
@@ -40,9 +38,7 @@ class IsCustomerUser(BasePermission):
         if not IsAuthenticated().has_permission(request, view):
             return False
 
-        user_profile = UserProfile.objects.filter(
-            user_id=request.user.id
-        ).first()
+        user_profile = get_user_profile(request.user)
         if not user_profile:
             return False
 
@@ -0,0 +1,35 @@
+from auth_app.models import UserProfile
+from core.projection import Field, FileField, Projection
+
+USER_FIELDS = {
+    "user": Field("user_id"),
+    "username": Field("user__username"),
+    "first_name": Field("user__first_name"),
+    "last_name": Field("user__last_name"),
+}
+
+
+class UserProfileProjection(Projection):
+    """Projection of BaseUserProfileSerializer."""
+
+    model = UserProfile
+    fields = {
+        "file": FileField(UserProfile),
+        "type": Field(),
+        **USER_FIELDS,
+    }
+
+
+class UserProfileBusinessProjection(Projection):
+    """Projection of BaseUserProfileBusinessSerializer."""
+
+    model = UserProfile
+    fields = {
+        "file": FileField(UserProfile),
+        "type": Field(),
+        "location": Field(),
+        "tel": Field(),
+        "description": Field(),
+        "working_hours": Field(),
+        **USER_FIELDS,
+    }
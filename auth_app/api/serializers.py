@@ -1,10 +1,13 @@
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
-from rest_framework.validators import UniqueValidator
 
 from auth_app.api.authenticate_user import authenticate_user
 from auth_app.api.helpers import extract_filename
+from auth_app.api.signed_tokens import issue_token, signed_tokens_enabled
+from auth_app.hashing import run_password_hashing
 from auth_app.models import UserProfile
 
 
@@ -63,7 +66,7 @@ class BaseUserProfileSerializer(serializers.ModelSerializer):
             dict: Serialized data including user profile and related user fields.
         """
         data = super().to_representation(instance)
-        data["user"] = instance.user.id
+        data["user"] = instance.user_id
         data["username"] = instance.user.username
         data["first_name"] = instance.user.first_name
         data["last_name"] = instance.user.last_name
@@ -203,32 +206,17 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
     Handles incoming registration data, enforces email and username
     uniqueness, matches password fields, and creates the User
-    along with a related UserProfile. Returns a token and
-    profile information on output.
+    along with a related UserProfile and token in one transaction.
+    Returns a token and profile information on output.
     """
 
     repeated_password = serializers.CharField(max_length=100, write_only=True)
     type = serializers.ChoiceField(
         choices=UserProfile.Type.choices, write_only=True
     )
-    email = serializers.EmailField(
-        required=True,
-        validators=[
-            UniqueValidator(
-                queryset=User.objects.all(),
-                message="Email already exists",
-            )
-        ],
-    )
-    username = serializers.CharField(
-        required=True,
-        validators=[
-            UniqueValidator(
-                queryset=User.objects.all(),
-                message="Username already exists",
-            )
-        ],
-    )
+    # Uniqueness is enforced by the database (see create).
+    email = serializers.EmailField(required=True)
+    username = serializers.CharField(required=True)
 
     class Meta:
         model = User
@@ -256,33 +244,72 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """
-        Create a new user and associated user profile.
+        Create a new user with profile and token in one transaction.
+
+        Username and email uniqueness are not checked up front: the
+        inserts rely on the unique constraints of the user table, and a
+        violation is reported with the same messages as the former
+        validators. A successful registration takes three INSERTs.
 
         Args:
             validated_data (dict): Validated data from the serializer.
 
         Returns:
             User: The newly created user instance.
+
+        Raises:
+            HashingUnavailable: If the password hashing pool is saturated.
+            serializers.ValidationError: If the username or email is
+                already taken.
         """
         profile_type = validated_data.pop("type")
         validated_data.pop("repeated_password")
 
-        user = User.objects.create_user(
-            username=validated_data["username"],
-            email=validated_data["email"],
-            password=validated_data["password"],
+        # Hashed on the bounded pool instead of inside create_user.
+        password = run_password_hashing(
+            make_password, validated_data["password"]
         )
-
-        UserProfile.objects.create(user=user, type=profile_type)
+        username = User.normalize_username(validated_data["username"])
+        email = User.objects.normalize_email(validated_data["email"])
+        try:
+            with transaction.atomic():
+                user = User.objects.create(
+                    username=username, email=email, password=password
+                )
+                UserProfile.objects.create(user=user, type=profile_type)
+                if not signed_tokens_enabled():
+                    Token.objects.create(user=user)
+        except IntegrityError:
+            raise self.get_duplicate_error(username, email)
 
         return user
 
+    def get_duplicate_error(self, username, email):
+        """
+        Return the validation error of a failed registration insert.
+
+        Only runs after a unique constraint failed, so successful
+        registrations never pay for the lookup.
+        """
+        if User.objects.filter(username=username).exists():
+            return serializers.ValidationError(
+                {"username": ["Username already exists"]}
+            )
+        if User.objects.filter(email=email).exists():
+            return serializers.ValidationError(
+                {"email": ["Email already exists"]}
+            )
+        return serializers.ValidationError(
+            {"error": "Registration failed, please try again."}
+        )
+
     def to_representation(self, instance):
         """
         Convert the user instance to authentication response format.
 
-        Creates or retrieves an authentication token and returns user
-        credentials along with the token.
+        Issues an authentication token, signed or opaque (see
+        auth_app.api.signed_tokens), and returns user credentials along
+        with the token.
 
         Args:
             instance (User): The user instance to serialize.
@@ -290,9 +317,8 @@ class RegistrationSerializer(serializers.ModelSerializer):
         Returns:
             dict: Dictionary containing token, username, email, and user_id.
         """
-        token, created = Token.objects.get_or_create(user=instance)
         return {
-            "token": token.key,
+            "token": issue_token(instance),
             "username": instance.username,
             "email": instance.email,
             "user_id": instance.id,
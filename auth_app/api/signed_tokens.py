@@ -0,0 +1,250 @@
+"""
+Stateless, HMAC-signed auth tokens.
+
+With SIGNED_TOKENS enabled, login and registration issue signed tokens
+instead of the opaque tokens stored in the authtoken table. A signed
+token carries the user id, staff flags, profile id and type, the time it
+was issued and its expiry, and is verified with HMAC-SHA256 in memory.
+Opaque tokens issued before keep working, so both formats can be used
+side by side during a migration.
+
+Tokens are signed with the first key of SIGNED_TOKEN_KEYS and verified
+with all of them, so keys are rotated by prepending a new key and
+removing the old one once its tokens expired. Without SIGNED_TOKEN_KEYS
+the SECRET_KEY and SECRET_KEY_FALLBACKS are used.
+
+Revocations cover all tokens of a user issued before a point in time,
+e.g. when the user is deactivated or the staff flags or profile type
+change. They are stored in the TokenRevocation table until the revoked
+tokens expire and read through a snapshot per process (see
+RevocationCache), so they reach every process within
+SIGNED_TOKEN_REVOCATION_INTERVAL seconds and cannot be evicted.
+"""
+
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework.authtoken.models import Token
+
+from auth_app.api.helpers import get_user_profile
+from auth_app.models import TokenRevocation, UserProfile
+
+SIGNED_TOKEN_SALT = "auth_app.signed_token"
+SIGNED_TOKEN_TTL = 24 * 60 * 60
+SIGNED_TOKEN_REVOCATION_INTERVAL = 5
+
+
+class InvalidSignedToken(Exception):
+    """Raised for signed tokens that are forged, expired or revoked."""
+
+
+class RevocationCache:
+    """
+    Snapshot of the unexpired token revocations of this process.
+
+    The snapshot is reloaded with one query once it is older than
+    SIGNED_TOKEN_REVOCATION_INTERVAL seconds, read from the settings on
+    every check so it can be changed in tests. Revocations made in this
+    process drop it, so they apply to the next verification.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def get_revoked_before(self, user_id):
+        """
+        Return the time up to which a user's tokens are revoked.
+
+        Returns:
+            int: Milliseconds since the epoch, or -1 if no token of the
+                user is revoked.
+        """
+        interval = getattr(
+            settings,
+            "SIGNED_TOKEN_REVOCATION_INTERVAL",
+            SIGNED_TOKEN_REVOCATION_INTERVAL,
+        )
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - snapshot[0] >= interval:
+            snapshot = self._load()
+        return snapshot[1].get(user_id, -1)
+
+    def clear(self):
+        """Drop the snapshot, so the next check reloads it."""
+        with self._lock:
+            self.generation += 1
+            self._snapshot = None
+
+    def _load(self):
+        """Load the unexpired revocations and keep them if still current."""
+        generation = self.generation
+        loaded_at = time.monotonic()
+        revoked_before = dict(
+            TokenRevocation.objects.filter(
+                expires_at__gt=_now_ms()
+            ).values_list("user_id", "revoked_before")
+        )
+        snapshot = (loaded_at, revoked_before)
+        with self._lock:
+            # A revocation made during the query may be missing.
+            if generation == self.generation:
+                self._snapshot = snapshot
+        return snapshot
+
+
+revocation_cache = RevocationCache()
+
+
+def signed_tokens_enabled():
+    """Return True if login and registration issue signed tokens."""
+    return getattr(settings, "SIGNED_TOKENS", False)
+
+
+def is_signed_token(key):
+    """Return True if a token key has the signed format."""
+    # Opaque tokens are hex digests, signed ones end with ':signature'.
+    return ":" in key
+
+
+def get_signer():
+    """Return the signer using the current and previous signing keys."""
+    keys = getattr(settings, "SIGNED_TOKEN_KEYS", None) or [
+        settings.SECRET_KEY,
+        *settings.SECRET_KEY_FALLBACKS,
+    ]
+    return signing.Signer(
+        key=keys[0],
+        fallback_keys=keys[1:],
+        salt=SIGNED_TOKEN_SALT,
+        algorithm="sha256",
+    )
+
+
+def get_token_ttl():
+    """Return the lifetime of signed tokens in seconds."""
+    return getattr(settings, "SIGNED_TOKEN_TTL", SIGNED_TOKEN_TTL)
+
+
+def issue_token(user):
+    """
+    Return the token login and registration hand out to a user.
+
+    Signed if SIGNED_TOKENS is enabled, otherwise the user's opaque
+    token, created on first use.
+    """
+    if signed_tokens_enabled():
+        return issue_signed_token(user)
+    try:
+        # Already loaded after registration.
+        return user.auth_token.key
+    except Token.DoesNotExist:
+        token, _ = Token.objects.get_or_create(user=user)
+        return token.key
+
+
+def issue_signed_token(user):
+    """
+    Return a signed token for a user.
+
+    Args:
+        user (User): The user, with its profile loaded or loadable.
+
+    Returns:
+        str: The token, to be sent as 'Token <token>' like opaque ones.
+    """
+    profile = get_user_profile(user)
+    now = _now_ms()
+    payload = {
+        "uid": user.pk,
+        "staff": user.is_staff,
+        "super": user.is_superuser,
+        "pid": profile.pk if profile else None,
+        "type": profile.type if profile else None,
+        "iat": now,
+        "exp": now + get_token_ttl() * 1000,
+        "jti": secrets.token_urlsafe(8),
+    }
+    return get_signer().sign_object(payload)
+
+
+def verify_signed_token(key):
+    """
+    Return the payload of a valid signed token.
+
+    Runs no database query apart from the periodic reload of the
+    revocations (see RevocationCache).
+
+    Raises:
+        InvalidSignedToken: If the signature does not match any key, or
+            the token expired or was revoked.
+    """
+    try:
+        payload = get_signer().unsign_object(key)
+    except (signing.BadSignature, ValueError):
+        raise InvalidSignedToken("Invalid token.")
+    if payload["exp"] <= _now_ms():
+        raise InvalidSignedToken("Token has expired.")
+    if payload["iat"] <= revocation_cache.get_revoked_before(payload["uid"]):
+        raise InvalidSignedToken("Token has been revoked.")
+    return payload
+
+
+def get_token_user(payload):
+    """
+    Return the user described by a signed token's payload.
+
+    The user is built from the payload without a query. Only its id,
+    staff flags and profile id and type are set; code that needs other
+    fields has to load the user.
+    """
+    user = User(
+        id=payload["uid"],
+        is_active=True,
+        is_staff=payload["staff"],
+        is_superuser=payload["super"],
+    )
+    _mark_loaded(user)
+    if payload["pid"] is not None:
+        profile = UserProfile(id=payload["pid"], type=payload["type"])
+        _mark_loaded(profile)
+        user.userprofile = profile
+    return user
+
+
+def revoke_signed_tokens_of_user(user_id):
+    """
+    Revoke every signed token issued to a user until now.
+
+    Also deletes the revocations whose tokens all expired, so the table
+    stays as small as the set of revoked, still valid tokens.
+    """
+    now = _now_ms()
+    TokenRevocation.objects.filter(expires_at__lte=now).delete()
+    TokenRevocation.objects.update_or_create(
+        user_id=user_id,
+        defaults={
+            "revoked_before": now,
+            "expires_at": now + get_token_ttl() * 1000,
+        },
+    )
+    revocation_cache.clear()
+    # Other threads may reload the snapshot before the row is committed.
+    transaction.on_commit(revocation_cache.clear)
+
+
+def _mark_loaded(instance):
+    """Mark an instance built from token claims as an existing row."""
+    instance._state.adding = False
+    instance._state.db = DEFAULT_DB_ALIAS
+
+
+def _now_ms():
+    """Return the current time in milliseconds."""
+    return int(time.time() * 1000)
@@ -1,10 +1,18 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
 from rest_framework import generics
-from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from auth_app.api.pagination import UserProfileCursorPagination
 from auth_app.api.permissions import IsProfileOwner
+from auth_app.api.projections import (
+    UserProfileBusinessProjection,
+    UserProfileProjection,
+)
 from auth_app.api.serializers import (
     BaseUserProfileBusinessSerializer,
     BaseUserProfileSerializer,
@@ -13,7 +21,16 @@ from auth_app.api.serializers import (
     UpdateUserProfileSerializer,
     UserProfileBusinessSerializer,
 )
+from auth_app.api.signed_tokens import issue_token
 from auth_app.models import UserProfile
+from core.conditional import (
+    get_lookup_value,
+    get_not_modified_response,
+    make_etag,
+    set_validator_headers,
+)
+from core.pagination import CursorOptInMixin
+from core.projection import ProjectionMixin
 
 
 class RegistrationView(generics.CreateAPIView):
@@ -50,10 +67,9 @@ class LoginView(ObtainAuthToken):
         )
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]  # type: ignore
-        token, _ = Token.objects.get_or_create(user=user)
         return Response(
             {
-                "token": token.key,
+                "token": issue_token(user),
                 "username": user.username,
                 "email": user.email,
                 "user_id": user.userprofile.pk,
@@ -86,8 +102,120 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
             return UpdateUserProfileSerializer
         return super().get_serializer_class()
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return the profile, or 304 if the client's copy is still current.
+
+        The response also contains fields of the related user, which has
+        no modification timestamp. The ETag is therefore derived from all
+        represented values, read in a single query, while Last-Modified
+        follows the profile's updated_at.
+        """
+        values = get_lookup_value(
+            self,
+            UserProfile.objects.values(
+                "id",
+                "file",
+                "type",
+                "location",
+                "tel",
+                "description",
+                "working_hours",
+                "created_at",
+                "updated_at",
+                "user__username",
+                "user__first_name",
+                "user__last_name",
+                "user__email",
+            ),
+        )
+        if values is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = make_etag(request, "profile", *values.values())
+        updated_at = values["updated_at"]
+        response = get_not_modified_response(request, etag, updated_at)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+            set_validator_headers(response, etag, updated_at)
+        return response
+
 
-class BusinessProfilesView(generics.ListAPIView):
+class ProfileListView(CursorOptInMixin, ProjectionMixin, generics.ListAPIView):
+    """
+    Base view of the profile lists.
+
+    Without parameters the full list is returned as before. Clients opt
+    in to keyset pages with 'pagination=cursor' (see
+    UserProfileCursorPagination) or to a streamed NDJSON response with
+    'stream=ndjson'. Rows are read together with their user in one query
+    per page or streamed batch.
+
+    Attributes:
+        profile_type (str): Type of the listed profiles.
+        stream_batch_size (int): Profiles read per query while streaming.
+    """
+
+    permission_classes = [IsAuthenticated]
+    cursor_pagination_class = UserProfileCursorPagination
+    profile_type = None
+    stream_batch_size = 1000
+
+    def get_queryset(self):
+        """Return the profiles of profile_type with their users."""
+        return UserProfile.objects.filter(
+            type=self.profile_type
+        ).select_related("user")
+
+    def list(self, request, *args, **kwargs):
+        """Return the profiles, streamed if the client asks for NDJSON."""
+        if request.query_params.get("stream") == "ndjson":
+            return StreamingHttpResponse(
+                self.stream_profiles(), content_type="application/x-ndjson"
+            )
+        return super().list(request, *args, **kwargs)
+
+    def stream_profiles(self):
+        """
+        Yield all profiles as NDJSON lines, one batch at a time.
+
+        Batches are read by keyset on the user id, so memory stays
+        bounded and every batch is an index range scan, however many
+        profiles exist.
+        """
+        projection = self.get_projection("list")
+        queryset = self.filter_queryset(self.get_queryset()).order_by(
+            "user_id"
+        )
+        if projection is not None:
+            queryset = projection.get_queryset(queryset)
+
+        def render(rows):
+            if projection is not None:
+                return projection.render(rows)
+            return self.get_serializer(rows, many=True).data
+
+        last_user_id = None
+        while True:
+            batch = queryset
+            if last_user_id is not None:
+                batch = batch.filter(user_id__gt=last_user_id)
+            rows = list(batch[: self.stream_batch_size])
+            if not rows:
+                return
+            yield "".join(
+                json.dumps(item, cls=DjangoJSONEncoder) + "\n"
+                for item in render(rows)
+            )
+            last_row = rows[-1]
+            last_user_id = (
+                last_row["user_id"]
+                if isinstance(last_row, dict)
+                else last_row.user_id
+            )
+
+
+class BusinessProfilesView(ProfileListView):
     """
     API view for listing business user profiles.
 
@@ -96,14 +224,11 @@ class BusinessProfilesView(generics.ListAPIView):
     """
 
     serializer_class = BaseUserProfileBusinessSerializer
-    permission_classes = [IsAuthenticated]
-
-    def get_queryset(self):
-        """Return all profiles with type 'business'."""
-        return UserProfile.objects.filter(type="business")
+    projection_classes = {"list": UserProfileBusinessProjection}
+    profile_type = "business"
 
 
-class CustomerProfilesView(generics.ListAPIView):
+class CustomerProfilesView(ProfileListView):
     """
     API view for listing customer user profiles.
 
@@ -112,8 +237,5 @@ class CustomerProfilesView(generics.ListAPIView):
     """
 
     serializer_class = BaseUserProfileSerializer
-    permission_classes = [IsAuthenticated]
-
-    def get_queryset(self):
-        """Return all profiles with type 'customer'."""
-        return UserProfile.objects.filter(type="customer")
+    projection_classes = {"list": UserProfileProjection}
+    profile_type = "customer"
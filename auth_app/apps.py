@@ -1,5 +1,37 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class AuthAppConfig(AppConfig):
     name = "auth_app"
+
+    def ready(self):
+        """Connect the signal handlers of the auth app."""
+        from django.contrib.auth.models import User
+        from rest_framework.authtoken.models import Token
+
+        from auth_app.models import UserProfile
+        from auth_app.signals import (
+            invalidate_token_cache_on_profile_change,
+            invalidate_token_cache_on_token_change,
+            invalidate_token_cache_on_user_change,
+            revoke_signed_tokens_on_staff_change,
+            revoke_signed_tokens_on_type_change,
+            revoke_signed_tokens_on_user_change,
+            revoke_signed_tokens_on_user_delete,
+        )
+
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_token_cache_on_token_change, sender=Token
+            )
+            signal.connect(invalidate_token_cache_on_user_change, sender=User)
+            signal.connect(
+                invalidate_token_cache_on_profile_change, sender=UserProfile
+            )
+        post_save.connect(revoke_signed_tokens_on_user_change, sender=User)
+        post_delete.connect(revoke_signed_tokens_on_user_delete, sender=User)
+        pre_save.connect(revoke_signed_tokens_on_staff_change, sender=User)
+        pre_save.connect(
+            revoke_signed_tokens_on_type_change, sender=UserProfile
+        )
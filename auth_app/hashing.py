@@ -0,0 +1,194 @@
+"""
+Password hashing on a bounded thread pool.
+
+Hashing a password with PBKDF2 takes tens of milliseconds of CPU. Login
+and registration run it on PASSWORD_HASHING_WORKERS pool threads, so a
+burst of logins cannot occupy every request thread of a worker. At most
+PASSWORD_HASHING_QUEUE calls wait for a free pool thread; further calls
+are rejected right away with 503 and a Retry-After header instead of
+piling up. hashlib releases the GIL while hashing, so the pool threads
+do not block the request threads.
+
+Pool threads only hash, they never touch the database.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+PASSWORD_HASHING_WORKERS = 2
+PASSWORD_HASHING_QUEUE = 8
+PASSWORD_HASHING_TIMEOUT = 10
+PASSWORD_HASHING_RETRY_AFTER = 1
+LATENCY_SAMPLES = 1000
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+class HashingUnavailable(APIException):
+    """
+    Raised when the hashing pool is saturated or too slow.
+
+    DRF answers it with 503 and sends wait as the Retry-After header.
+    """
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many login attempts, please try again shortly."
+    default_code = "hashing_unavailable"
+    wait = PASSWORD_HASHING_RETRY_AFTER
+
+
+class HashingStats:
+    """
+    Thread-safe counters and recent latencies of the hashing stage.
+
+    Queue wait is the time a call waited for a pool thread, hashing time
+    the time the pool thread spent on it. Percentiles are computed from
+    the last LATENCY_SAMPLES calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Reset all counters and samples."""
+        with self._lock:
+            self.completed = 0
+            self.rejected = 0
+            self.timed_out = 0
+            self.queue_wait = deque(maxlen=LATENCY_SAMPLES)
+            self.hashing = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, queue_wait, hashing):
+        """Record the latencies of a completed call in seconds."""
+        with self._lock:
+            self.completed += 1
+            self.queue_wait.append(queue_wait)
+            self.hashing.append(hashing)
+
+    def record_rejected(self):
+        """Count a call rejected because the queue was full."""
+        with self._lock:
+            self.rejected += 1
+
+    def record_timed_out(self):
+        """Count a call that did not finish within the timeout."""
+        with self._lock:
+            self.timed_out += 1
+
+    def get_stats(self):
+        """
+        Return the counters and latency percentiles in milliseconds.
+
+        Returns:
+            dict: Number of completed, rejected and timed out calls and
+                p50, p95 and max of the queue wait and hashing time, or
+                None for the latencies while no call completed.
+        """
+        with self._lock:
+            return {
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "queue_wait_ms": _summarize(self.queue_wait),
+                "hashing_ms": _summarize(self.hashing),
+            }
+
+
+hashing_stats = HashingStats()
+
+
+def get_executor():
+    """
+    Return the hashing pool and the semaphore bounding its queue.
+
+    Both are created on first use. The semaphore has one slot per pool
+    thread plus PASSWORD_HASHING_QUEUE slots for waiting calls.
+    """
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            workers = getattr(
+                settings, "PASSWORD_HASHING_WORKERS", PASSWORD_HASHING_WORKERS
+            )
+            queue = getattr(
+                settings, "PASSWORD_HASHING_QUEUE", PASSWORD_HASHING_QUEUE
+            )
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="password-hashing"
+            )
+            _slots = threading.BoundedSemaphore(workers + queue)
+    return _executor, _slots
+
+
+def run_password_hashing(func, *args, **kwargs):
+    """
+    Run a hashing function on the pool and return its result.
+
+    Args:
+        func: Function hashing or checking a password, e.g.
+            make_password. It must not use the database.
+        *args: Positional arguments of func.
+        **kwargs: Keyword arguments of func.
+
+    Raises:
+        HashingUnavailable: If all pool threads and queue slots are busy,
+            or the call did not finish within PASSWORD_HASHING_TIMEOUT
+            seconds.
+    """
+    executor, slots = get_executor()
+    if not slots.acquire(blocking=False):
+        hashing_stats.record_rejected()
+        raise HashingUnavailable()
+
+    submitted = time.perf_counter()
+
+    def run():
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        hashing_stats.record(
+            started - submitted, time.perf_counter() - started
+        )
+        return result
+
+    try:
+        future = executor.submit(run)
+    except BaseException:
+        slots.release()
+        raise
+    # The slot is freed when the call ends, even after a timeout.
+    future.add_done_callback(lambda _: slots.release())
+    timeout = getattr(
+        settings, "PASSWORD_HASHING_TIMEOUT", PASSWORD_HASHING_TIMEOUT
+    )
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        hashing_stats.record_timed_out()
+        raise HashingUnavailable()
+
+
+def get_hashing_stats():
+    """Return counters and latencies of the password hashing pool."""
+    return hashing_stats.get_stats()
+
+
+def _summarize(samples):
+    """Return p50, p95 and max of latencies in seconds as milliseconds."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return {
+        "p50": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95": round(ordered[int(len(ordered) * 0.95)] * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+    }
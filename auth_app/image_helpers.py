@@ -1,9 +1,11 @@
-import os
-
-from django.utils.text import slugify
+from core.storage import content_hash_path
 
 
 def profile_image_upload_path(instance, filename):
-    ext = os.path.splitext(filename)[1]
-    username = slugify(instance.user.username)
-    return f"profile_images/{username}_picture{ext}"
+    """
+    Return the content-addressed storage name of a profile picture.
+
+    Equal pictures share one file and a replaced picture gets a new URL
+    (see core.storage).
+    """
+    return content_hash_path("profile_images", instance.file, filename)
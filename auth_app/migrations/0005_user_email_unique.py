@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-17 14:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0004_userprofile_userprofile_type_idx'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE UNIQUE INDEX "auth_user_email_uniq" '
+                'ON "auth_user" ("email") WHERE "email" <> \'\''
+            ),
+            reverse_sql='DROP INDEX "auth_user_email_uniq"',
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0005_user_email_unique'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='userprofile',
+            name='userprofile_type_idx',
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['type', 'user'], name='userprofile_type_user_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-17 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0006_userprofile_type_user_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenRevocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.BigIntegerField(unique=True)),
+                ('revoked_before', models.BigIntegerField()),
+                ('expires_at', models.BigIntegerField(db_index=True)),
+            ],
+        ),
+    ]
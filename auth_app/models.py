@@ -21,6 +21,7 @@ class UserProfile(models.Model):
         file (FileField): Profile picture or business logo.
         working_hours (str): Business working hours (for business accounts).
         created_at (datetime): Timestamp when the profile was created.
+        updated_at (datetime): Timestamp when the profile was last updated.
     """
 
     class Type(models.TextChoices):
@@ -44,6 +45,41 @@ class UserProfile(models.Model):
     )
     working_hours = models.CharField(max_length=20, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Profile lists and counts are always filtered by type; lists
+            # page through a type by user id.
+            models.Index(
+                fields=["type", "user"], name="userprofile_type_user_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username}"
+
+
+class TokenRevocation(models.Model):
+    """
+    Revocation of the signed tokens a user was issued until a moment.
+
+    Signed tokens (see auth_app.api.signed_tokens) are verified without
+    the user's row, so revocations have to outlive the user and are
+    keyed by the plain user id instead of a foreign key. A row is only
+    needed until the revoked tokens expire.
+
+    Attributes:
+        user_id (int): Id of the user whose tokens are revoked.
+        revoked_before (int): Tokens issued up to this time are revoked,
+            in milliseconds since the epoch.
+        expires_at (int): Time the last revoked token expires, in
+            milliseconds since the epoch.
+    """
+
+    user_id = models.BigIntegerField(unique=True)
+    revoked_before = models.BigIntegerField()
+    expires_at = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"Tokens of user {self.user_id}"
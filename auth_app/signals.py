@@ -0,0 +1,88 @@
+from auth_app.api.authentication import token_cache
+from auth_app.api.signed_tokens import revoke_signed_tokens_of_user
+
+
+def invalidate_token_cache_on_token_change(sender, instance, **kwargs):
+    """Drop the cached lookup of a token that was saved or deleted."""
+    token_cache.delete(instance.key)
+
+
+def invalidate_token_cache_on_user_change(sender, instance, **kwargs):
+    """
+    Drop the cached lookups of a user's tokens when the user changes.
+
+    Authenticated requests carry the cached user, so any change, e.g.
+    deactivation or a new username, has to reach the next request.
+    """
+    token_cache.delete_user(instance.pk)
+
+
+def invalidate_token_cache_on_profile_change(sender, instance, **kwargs):
+    """
+    Drop the cached lookups of a user's tokens when the profile changes.
+
+    Cached users carry their profile, whose type decides the role
+    permissions.
+    """
+    token_cache.delete_user(instance.user_id)
+
+
+def revoke_signed_tokens_on_user_change(sender, instance, **kwargs):
+    """Revoke the signed tokens of a deactivated user."""
+    if not instance.is_active:
+        revoke_signed_tokens_of_user(instance.pk)
+
+
+def revoke_signed_tokens_on_user_delete(sender, instance, **kwargs):
+    """Revoke the signed tokens of a deleted user."""
+    revoke_signed_tokens_of_user(instance.pk)
+
+
+def revoke_signed_tokens_on_staff_change(
+    sender, instance, update_fields=None, **kwargs
+):
+    """
+    Revoke a user's signed tokens before the staff flags change.
+
+    Signed tokens carry is_staff and is_superuser, which the admin
+    permissions check, so tokens with the former flags must not be
+    accepted anymore.
+    """
+    if instance.pk is None:
+        return
+    if update_fields is not None and not {"is_staff", "is_superuser"} & set(
+        update_fields
+    ):
+        return
+    previous_flags = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("is_staff", "is_superuser")
+        .first()
+    )
+    if previous_flags is not None and previous_flags != (
+        instance.is_staff,
+        instance.is_superuser,
+    ):
+        revoke_signed_tokens_of_user(instance.pk)
+
+
+def revoke_signed_tokens_on_type_change(
+    sender, instance, update_fields=None, **kwargs
+):
+    """
+    Revoke a user's signed tokens before the profile type changes.
+
+    Signed tokens carry the profile type the role permissions check, so
+    tokens with the former type must not be accepted anymore.
+    """
+    if instance.pk is None:
+        return
+    if update_fields is not None and "type" not in update_fields:
+        return
+    previous_type = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("type", flat=True)
+        .first()
+    )
+    if previous_type is not None and previous_type != instance.type:
+        revoke_signed_tokens_of_user(instance.user_id)
@@ -1,4 +1,6 @@
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.authtoken.models import Token
@@ -70,6 +72,50 @@ class RegistrationTest(APITestCase):
         self.assertEqual(User.objects.count(), 1)
         self.assertEqual(UserProfile.objects.count(), 1)
 
+    def test_registration_duplicate_username_message(self):
+        url = reverse("registration")
+        self.client.post(url, self.user_data, format="json")
+        user_data = self.user_data.copy()
+        user_data["email"] = "other@mail.de"
+
+        response = self.client.post(url, user_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), {"username": ["Username already exists"]}
+        )
+        self.assertEqual(Token.objects.count(), 1)
+
+    def test_registration_duplicate_email(self):
+        url = reverse("registration")
+        self.client.post(url, self.user_data, format="json")
+        user_data = self.user_data.copy()
+        user_data["username"] = "otherUsername"
+
+        response = self.client.post(url, user_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"email": ["Email already exists"]})
+        self.assertEqual(User.objects.count(), 1)
+        self.assertEqual(UserProfile.objects.count(), 1)
+        self.assertEqual(Token.objects.count(), 1)
+
+    def test_registration_inserts_without_lookups(self):
+        url = reverse("registration")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, self.user_data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        statements = [
+            query["sql"].split()[0].upper()
+            for query in queries.captured_queries
+        ]
+        self.assertEqual(statements.count("INSERT"), 3)
+        self.assertNotIn("SELECT", statements)
+        self.assertEqual(
+            response.json()["token"],
+            Token.objects.get(user__username="exampleUsername").key,
+        )
+
     def test_registration_invalid_email(self):
         url = reverse("registration")
         user_data = self.user_data.copy()
@@ -0,0 +1,186 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APITestCase
+
+from auth_app.api.authentication import (
+    CachedTokenAuthentication,
+    token_cache,
+)
+from auth_app.api.helpers import get_user_profile
+from auth_app.api.permissions import IsBusinessUser, IsCustomerUser
+from auth_app.models import UserProfile
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(
+            username="john_doe", password="testpass123"
+        )
+        self.profile = UserProfile.objects.create(
+            user=self.user, type="customer"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse("profile-detail", kwargs={"id": self.user.id})
+
+    def get_profile(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        token_queries = [
+            query
+            for query in queries.captured_queries
+            if "authtoken_token" in query["sql"]
+        ]
+        return response, len(token_queries)
+
+    def test_repeated_token_skips_lookup(self):
+        response, token_queries = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(token_queries, 1)
+
+        response, token_queries = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(token_queries, 0)
+        self.assertEqual(
+            token_cache.get_stats(),
+            {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1},
+        )
+
+    def test_deleted_token_is_rejected(self):
+        self.get_profile()
+
+        self.token.delete()
+
+        response, _ = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.get_profile()
+
+        self.user.is_active = False
+        self.user.save()
+
+        response, _ = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_changed_user_is_reloaded(self):
+        self.get_profile()
+
+        self.user.username = "jane_doe"
+        self.user.save()
+
+        response, token_queries = self.get_profile()
+        self.assertEqual(token_queries, 1)
+        self.assertEqual(response.json()["username"], "jane_doe")
+
+    def test_unknown_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token unknown")
+
+        response, _ = self.get_profile()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(token_cache.get_stats()["size"], 0)
+
+    @override_settings(TOKEN_AUTH_CACHE_SIZE=1)
+    def test_least_recently_used_token_is_evicted(self):
+        other_user = User.objects.create_user(username="jane_doe")
+        other_token = Token.objects.create(user=other_user)
+        authentication = CachedTokenAuthentication()
+
+        authentication.authenticate_credentials(self.token.key)
+        authentication.authenticate_credentials(other_token.key)
+
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertIsNotNone(token_cache.get(other_token.key))
+
+    def test_expired_token_is_reloaded(self):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+
+        with mock.patch(
+            "auth_app.api.authentication.time.monotonic",
+            return_value=10**9,
+        ):
+            self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_invalidation_during_lookup_is_not_cached(self):
+        generation = token_cache.generation
+        token_cache.delete_user(self.user.id)
+
+        token_cache.set(self.token.key, self.token, generation)
+
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_requests_get_their_own_user(self):
+        authentication = CachedTokenAuthentication()
+        user, token = authentication.authenticate_credentials(self.token.key)
+        user.username = "changed"
+
+        cached_user, cached_token = authentication.authenticate_credentials(
+            self.token.key
+        )
+
+        self.assertEqual(cached_user.username, "john_doe")
+        self.assertIs(cached_token.user, cached_user)
+        self.assertIsNot(cached_user, user)
+
+    def test_inactive_user_is_rejected_from_cache(self):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+        token_cache.get(self.token.key).user.is_active = False
+
+        with self.assertRaises(AuthenticationFailed):
+            authentication.authenticate_credentials(self.token.key)
+
+    def test_runtime_stats_report_token_cache(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.get(reverse("runtime-stats"))
+
+        response = self.client.get(reverse("runtime-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.json()["token_auth_cache"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_role_permissions_use_cached_profile(self):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            user, _ = authentication.authenticate_credentials(self.token.key)
+            request = SimpleNamespace(user=user)
+            self.assertTrue(IsCustomerUser().has_permission(request, None))
+            self.assertFalse(IsBusinessUser().has_permission(request, None))
+
+    def test_changed_profile_is_reloaded(self):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+
+        self.profile.type = "business"
+        self.profile.save()
+
+        user, _ = authentication.authenticate_credentials(self.token.key)
+        request = SimpleNamespace(user=user)
+        self.assertTrue(IsBusinessUser().has_permission(request, None))
+
+    def test_user_without_profile_has_no_role(self):
+        self.profile.delete()
+        authentication = CachedTokenAuthentication()
+
+        user, _ = authentication.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_user_profile(user))
+            request = SimpleNamespace(user=user)
+            self.assertFalse(IsCustomerUser().has_permission(request, None))
@@ -0,0 +1,125 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from auth_app.hashing import (
+    HashingUnavailable,
+    get_hashing_stats,
+    hashing_stats,
+    run_password_hashing,
+)
+from auth_app.models import UserProfile
+
+
+class PasswordHashingTest(APITestCase):
+    def setUp(self):
+        hashing_stats.clear()
+        self.user_data = {
+            "username": "exampleUsername",
+            "password": "examplePassword",
+        }
+        self.user = User.objects.create_user(**self.user_data)
+        UserProfile.objects.create(user=self.user, type="customer")
+
+    def login(self, **data):
+        return self.client.post(
+            reverse("login"), {**self.user_data, **data}, format="json"
+        )
+
+    def test_login_reports_hashing_latency(self):
+        response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = get_hashing_stats()
+        self.assertEqual(stats["completed"], 1)
+        self.assertGreater(stats["hashing_ms"]["max"], 0)
+        self.assertIsNotNone(stats["queue_wait_ms"]["p95"])
+
+    def test_unknown_username_is_hashed_too(self):
+        response = self.login(username="unknown")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_hashing_stats()["completed"], 1)
+
+    def test_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_outdated_hash_is_upgraded(self):
+        self.user.password = PBKDF2PasswordHasher().encode(
+            self.user_data["password"], "salt", iterations=1000
+        )
+        self.user.save()
+
+        response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertNotIn("$1000$", self.user.password)
+        self.assertTrue(self.user.check_password("examplePassword"))
+
+    def test_registration_hashes_password(self):
+        response = self.client.post(
+            reverse("registration"),
+            {
+                "username": "newUser",
+                "email": "new@example.com",
+                "password": "newPassword",
+                "repeated_password": "newPassword",
+                "type": "business",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username="newUser")
+        self.assertTrue(user.check_password("newPassword"))
+        self.assertEqual(get_hashing_stats()["completed"], 1)
+
+    def test_saturated_pool_rejects_fast(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        with mock.patch(
+            "auth_app.hashing.get_executor",
+            return_value=(executor, threading.BoundedSemaphore(1)),
+        ) as get_executor:
+            get_executor.return_value[1].acquire()
+            response = self.login()
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(get_hashing_stats()["rejected"], 1)
+
+    @override_settings(PASSWORD_HASHING_TIMEOUT=0.01)
+    def test_slow_hashing_times_out_and_frees_its_slot(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        slots = threading.BoundedSemaphore(1)
+        release = threading.Event()
+        with mock.patch(
+            "auth_app.hashing.get_executor", return_value=(executor, slots)
+        ):
+            with self.assertRaises(HashingUnavailable):
+                run_password_hashing(release.wait)
+            with self.assertRaises(HashingUnavailable):
+                run_password_hashing(time.sleep, 0)
+            release.set()
+            executor.shutdown(wait=True)
+
+        self.assertTrue(slots.acquire(blocking=False))
+        self.assertEqual(get_hashing_stats()["timed_out"], 1)
+        self.assertEqual(get_hashing_stats()["rejected"], 1)
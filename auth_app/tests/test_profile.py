@@ -1,10 +1,16 @@
+import hashlib
+import json
+from unittest import mock
+
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from auth_app.api.views import BusinessProfilesView, CustomerProfilesView
 from auth_app.models import UserProfile
 from core.test_factory.authenticate import TestDataFactory
+from core.test_factory.media import TemporaryMediaMixin, create_image_file
 
 
 class RetrieveProfileTest(APITestCase):
@@ -56,6 +62,20 @@ class RetrieveProfileTest(APITestCase):
         self.assertEqual(data["email"], "john@example.com")
         self.assertIsNotNone(data["created_at"])
 
+    def test_retrieve_profile_conditional(self):
+        url = reverse("profile-detail", None, kwargs={"id": 1})
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.user.first_name = "Johnny"
+        self.user.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["first_name"], "Johnny")
+        self.assertNotEqual(response["ETag"], etag)
+
     def test_retrieve_profile_not_authenticated(self):
         self.client.force_authenticate(user=None)  # type: ignore
         url = reverse("profile-detail", None, kwargs={"id": 1})
@@ -140,6 +160,43 @@ class RetrieveProfileTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+class ProfilePictureUploadTest(TemporaryMediaMixin, APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.client, self.user = TestDataFactory.create_authenticated_client(
+            username="john_doe",
+            email="john@example.com",
+        )
+        UserProfile.objects.create(user=self.user, type="business")
+        self.url = reverse("profile-detail", kwargs={"id": self.user.id})
+
+    def upload(self, color):
+        image = create_image_file(color=color, name="Me.JPG")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.url, {"file": image}, format="multipart"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return UserProfile.objects.get(user=self.user).file.name
+
+    def test_picture_stored_under_content_hash(self):
+        content = create_image_file(color="red").read()
+
+        name = self.upload("red")
+
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(name, f"profile_images/{digest}.jpg")
+
+    def test_replaced_picture_gets_new_name(self):
+        first = self.upload("red")
+        second = self.upload("blue")
+
+        self.assertNotEqual(first, second)
+        storage = UserProfile._meta.get_field("file").storage
+        self.assertFalse(storage.exists(first))
+        self.assertTrue(storage.exists(second))
+
+
 class RetrieveBusinessProfilesTest(APITestCase):
     def setUp(self) -> None:
         self.client, self.user = TestDataFactory.create_authenticated_client(
@@ -191,6 +248,15 @@ class RetrieveBusinessProfilesTest(APITestCase):
         for profile in data:
             self.assertEqual(profile["type"], "business")
 
+    def test_business_projection_matches_serializer(self):
+        url = reverse("profile-business-list")
+        response = self.client.get(url)
+        with mock.patch.object(BusinessProfilesView, "projection_classes", {}):
+            expected = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+
 
 class RetrieveCustomerProfilesTest(APITestCase):
     def setUp(self) -> None:
@@ -233,3 +299,75 @@ class RetrieveCustomerProfilesTest(APITestCase):
 
         for profile in data:
             self.assertEqual(profile["type"], "customer")
+
+    def test_customer_projection_matches_serializer(self):
+        url = reverse("profile-customer-list")
+        response = self.client.get(url)
+        with mock.patch.object(CustomerProfilesView, "projection_classes", {}):
+            expected = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+
+
+class ProfileListPaginationTest(APITestCase):
+    def setUp(self) -> None:
+        self.client, self.user = TestDataFactory.create_authenticated_client()
+        UserProfile.objects.create(user=self.user, type="customer")
+        self.business_ids = []
+        for index in range(5):
+            user = User.objects.create_user(username=f"business_{index}")
+            UserProfile.objects.create(user=user, type="business")
+            self.business_ids.append(user.id)
+        self.url = reverse("profile-business-list")
+
+    def get_stream(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        content = b"".join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            [profile["user"] for profile in response.json()],
+            self.business_ids,
+        )
+
+    def test_cursor_pages_walk_all_profiles(self):
+        url = f"{self.url}?pagination=cursor&page_size=2"
+        user_ids = []
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            user_ids += [profile["user"] for profile in data["results"]]
+            url = data["next"]
+
+        self.assertEqual(user_ids, self.business_ids)
+
+    def test_serializer_fallback_loads_users_with_profiles(self):
+        with mock.patch.object(BusinessProfilesView, "projection_classes", {}):
+            with self.assertNumQueries(1):
+                response = self.client.get(self.url)
+
+        self.assertEqual(len(response.json()), 5)
+
+    def test_stream_returns_all_profiles_in_batches(self):
+        with mock.patch.object(BusinessProfilesView, "stream_batch_size", 2):
+            with self.assertNumQueries(4):
+                profiles = self.get_stream(f"{self.url}?stream=ndjson")
+
+        self.assertEqual(profiles, self.client.get(self.url).json())
+
+    def test_stream_projection_matches_serializer(self):
+        url = f"{reverse('profile-customer-list')}?stream=ndjson"
+        profiles = self.get_stream(url)
+        with mock.patch.object(CustomerProfilesView, "projection_classes", {}):
+            expected = self.get_stream(url)
+
+        self.assertEqual(profiles, expected)
+        self.assertEqual(profiles[0]["user"], self.user.id)
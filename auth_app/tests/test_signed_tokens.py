@@ -0,0 +1,257 @@
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from auth_app.api.authentication import (
+    CachedTokenAuthentication,
+    token_cache,
+)
+from auth_app.api.permissions import IsBusinessUser, IsCustomerUser
+from auth_app.api.signed_tokens import (
+    SIGNED_TOKEN_REVOCATION_INTERVAL,
+    InvalidSignedToken,
+    issue_signed_token,
+    revocation_cache,
+    revoke_signed_tokens_of_user,
+    verify_signed_token,
+)
+from auth_app.models import TokenRevocation, UserProfile
+
+
+@override_settings(SIGNED_TOKENS=True)
+class SignedTokenTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        revocation_cache.clear()
+        self.user_data = {
+            "username": "john_doe",
+            "password": "testpass123",
+        }
+        self.user = User.objects.create_user(**self.user_data)
+        self.profile = UserProfile.objects.create(
+            user=self.user, type="customer"
+        )
+        self.url = reverse("profile-detail", kwargs={"id": self.user.id})
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    def get_profile(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        token_queries = [
+            query
+            for query in queries.captured_queries
+            if "authtoken_token" in query["sql"]
+        ]
+        return response, len(token_queries)
+
+    def test_login_issues_signed_token(self):
+        response = self.client.post(
+            reverse("login"), self.user_data, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        token = response.json()["token"]
+        self.assertEqual(verify_signed_token(token)["uid"], self.user.id)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+
+    def test_registration_issues_signed_token(self):
+        response = self.client.post(
+            reverse("registration"),
+            {
+                "username": "newUser",
+                "email": "new@example.com",
+                "password": "newPassword",
+                "repeated_password": "newPassword",
+                "type": "business",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        payload = verify_signed_token(response.json()["token"])
+        self.assertEqual(payload["type"], "business")
+        self.assertFalse(Token.objects.exists())
+
+    def test_signed_token_is_verified_without_queries(self):
+        self.authenticate(issue_signed_token(self.user))
+
+        response, token_queries = self.get_profile()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(token_queries, 0)
+
+    def test_role_permissions_use_token_claims(self):
+        authentication = CachedTokenAuthentication()
+        key = issue_signed_token(self.user)
+        verify_signed_token(key)
+
+        with self.assertNumQueries(0):
+            user, _ = authentication.authenticate_credentials(key)
+            request = SimpleNamespace(user=user)
+            self.assertTrue(IsCustomerUser().has_permission(request, None))
+            self.assertFalse(IsBusinessUser().has_permission(request, None))
+
+    def test_forged_token_is_rejected(self):
+        key = issue_signed_token(self.user)
+        value, signature = key.rsplit(":", 1)
+        self.authenticate(f"{value}:{signature[::-1]}")
+
+        response, _ = self.get_profile()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(SIGNED_TOKEN_TTL=60)
+    def test_expired_token_is_rejected(self):
+        self.authenticate(issue_signed_token(self.user))
+
+        with mock.patch(
+            "auth_app.api.signed_tokens.time.time",
+            return_value=10**10,
+        ):
+            response, _ = self.get_profile()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_token_is_rejected(self):
+        key = issue_signed_token(self.user)
+
+        revoke_signed_tokens_of_user(self.user.id)
+
+        with self.assertRaises(InvalidSignedToken):
+            verify_signed_token(key)
+        with mock.patch(
+            "auth_app.api.signed_tokens.time.time",
+            return_value=time.time() + 1,
+        ):
+            other_key = issue_signed_token(self.user)
+            payload = verify_signed_token(other_key)
+        self.assertEqual(payload["uid"], self.user.id)
+
+    def test_revocation_outlives_the_cache(self):
+        key = issue_signed_token(self.user)
+        revoke_signed_tokens_of_user(self.user.id)
+
+        cache.clear()
+        revocation_cache.clear()
+
+        with self.assertRaises(InvalidSignedToken):
+            verify_signed_token(key)
+        self.assertTrue(
+            TokenRevocation.objects.filter(user_id=self.user.id).exists()
+        )
+
+    def test_revocation_of_other_process_applies_after_interval(self):
+        key = issue_signed_token(self.user)
+        verify_signed_token(key)
+
+        # A row written without this process' snapshot being dropped.
+        TokenRevocation.objects.create(
+            user_id=self.user.id,
+            revoked_before=int(time.time() * 1000),
+            expires_at=int(time.time() * 1000) + 60_000,
+        )
+
+        self.assertEqual(verify_signed_token(key)["uid"], self.user.id)
+        with mock.patch(
+            "auth_app.api.signed_tokens.time.monotonic",
+            return_value=time.monotonic() + SIGNED_TOKEN_REVOCATION_INTERVAL,
+        ):
+            with self.assertRaises(InvalidSignedToken):
+                verify_signed_token(key)
+
+    @override_settings(SIGNED_TOKEN_TTL=60)
+    def test_expired_revocations_are_deleted(self):
+        other_user = User.objects.create_user(username="jane_doe")
+        revoke_signed_tokens_of_user(other_user.id)
+
+        with mock.patch(
+            "auth_app.api.signed_tokens.time.time",
+            return_value=time.time() + 61,
+        ):
+            revoke_signed_tokens_of_user(self.user.id)
+
+        self.assertEqual(
+            list(TokenRevocation.objects.values_list("user_id", flat=True)),
+            [self.user.id],
+        )
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate(issue_signed_token(self.user))
+
+        self.user.is_active = False
+        self.user.save()
+
+        response, _ = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_changed_staff_flags_revoke_tokens(self):
+        self.user.is_staff = True
+        self.user.save()
+        key = issue_signed_token(self.user)
+        self.authenticate(key)
+
+        self.user.is_staff = False
+        self.user.save()
+
+        with self.assertRaises(InvalidSignedToken):
+            verify_signed_token(key)
+        response, _ = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unchanged_staff_flags_keep_tokens(self):
+        key = issue_signed_token(self.user)
+
+        self.user.first_name = "John"
+        self.user.save()
+        self.user.is_superuser = True
+        self.user.save(update_fields=["first_name"])
+
+        self.assertEqual(verify_signed_token(key)["uid"], self.user.id)
+
+    def test_changed_profile_type_revokes_tokens(self):
+        key = issue_signed_token(self.user)
+
+        self.profile.type = "business"
+        self.profile.save()
+
+        with self.assertRaises(InvalidSignedToken):
+            verify_signed_token(key)
+
+    def test_unchanged_profile_type_keeps_tokens(self):
+        key = issue_signed_token(self.user)
+
+        self.profile.location = "Berlin"
+        self.profile.save()
+
+        self.assertEqual(verify_signed_token(key)["type"], "customer")
+
+    def test_tokens_of_rotated_key_are_accepted(self):
+        with override_settings(SIGNED_TOKEN_KEYS=["old-key"]):
+            key = issue_signed_token(self.user)
+
+        with override_settings(SIGNED_TOKEN_KEYS=["new-key", "old-key"]):
+            self.assertEqual(verify_signed_token(key)["uid"], self.user.id)
+        with override_settings(SIGNED_TOKEN_KEYS=["new-key"]):
+            with self.assertRaises(InvalidSignedToken):
+                verify_signed_token(key)
+
+    def test_opaque_tokens_keep_working(self):
+        token = Token.objects.create(user=self.user)
+        self.authenticate(token.key)
+
+        response, _ = self.get_profile()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
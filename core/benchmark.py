@@ -0,0 +1,188 @@
+"""
+Helpers shared by the benchmark management commands.
+
+Benchmarks fill the database with generated rows inside a transaction
+that is always rolled back, time a set of queries and print the median
+timings as a plain-text table.
+"""
+
+import statistics
+import time
+from contextlib import contextmanager
+from itertools import islice, product
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from auth_app.models import UserProfile
+from offers_app.models import Offer, OfferPackage
+from orders_app.models import Order
+from reviews_app.models import Review
+
+BATCH_SIZE = 5000
+OFFER_TYPES = ["basic", "standard", "premium"]
+ORDER_STATUSES = ["in_progress", "completed", "cancelled"]
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is rolled back afterwards."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def generate_marketplace(rows, batch_size=BATCH_SIZE):
+    """
+    Bulk insert a marketplace of roughly the given size.
+
+    Creates one business and one customer user per 1000 rows (at least
+    one each) with profiles, rows // 3 offer packages with three offers
+    each, rows orders spread over all users and statuses, and up to rows
+    reviews. bulk_create sends no signals, so caches and stored min
+    values are not maintained; min values are written directly.
+
+    Args:
+        rows (int): Number of offers and orders to create.
+        batch_size (int): Rows per INSERT statement.
+
+    Returns:
+        dict: The created business and customer users and packages.
+    """
+    user_count = max(rows // 1000, 1)
+    businesses = _create_users("business", user_count, batch_size)
+    customers = _create_users("customer", user_count, batch_size)
+
+    packages = OfferPackage.objects.bulk_create(
+        (
+            OfferPackage(
+                user=businesses[index % user_count],
+                title=f"Benchmark package {index}",
+                description=f"Generated package number {index}",
+                min_price=float(10 + index % 500),
+                min_delivery_time=1 + index % 30,
+            )
+            for index in range(max(rows // 3, 1))
+        ),
+        batch_size=batch_size,
+    )
+    Offer.objects.bulk_create(
+        (
+            Offer(
+                package=package,
+                title=f"{offer_type} offer",
+                delivery_time_in_days=package.min_delivery_time + tier,
+                price=package.min_price * (tier + 1),
+                offer_type=offer_type,
+            )
+            for package in packages
+            for tier, offer_type in enumerate(OFFER_TYPES)
+        ),
+        batch_size=batch_size,
+    )
+    Order.objects.bulk_create(
+        (
+            Order(
+                business_user=businesses[index % user_count],
+                customer_user=customers[index // user_count % user_count],
+                title=f"Benchmark order {index}",
+                delivery_time_in_days=1 + index % 30,
+                price=float(10 + index % 500),
+                offer_type=OFFER_TYPES[index % 3],
+                status=ORDER_STATUSES[index // 3 % 3],
+            )
+            for index in range(rows)
+        ),
+        batch_size=batch_size,
+    )
+    Review.objects.bulk_create(
+        (
+            Review(
+                business_user=business,
+                reviewer=customer,
+                rating=1 + (business.id + customer.id) % 5,
+                description="Generated review",
+            )
+            for business, customer in islice(
+                product(businesses, customers), rows
+            )
+        ),
+        batch_size=batch_size,
+    )
+    return {
+        "businesses": businesses,
+        "customers": customers,
+        "packages": packages,
+    }
+
+
+def measure(func, repeat=5):
+    """
+    Return the median duration of func in milliseconds.
+
+    Args:
+        func (callable): The code to time. Called once as a warm-up
+            before the measured runs.
+        repeat (int): Number of measured runs.
+
+    Returns:
+        float: Median duration of the measured runs in milliseconds.
+    """
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def format_table(headers, rows):
+    """
+    Format rows as a left-aligned plain-text table.
+
+    Args:
+        headers (list): Column titles.
+        rows (list): Rows with one value per column. Floats are shown
+            with two decimals.
+
+    Returns:
+        str: The table, one line per row, headers first.
+    """
+    cells = [
+        [
+            f"{value:.2f}" if isinstance(value, float) else str(value)
+            for value in row
+        ]
+        for row in [headers, *rows]
+    ]
+    widths = [
+        max(len(row[index]) for row in cells) for index in range(len(headers))
+    ]
+    lines = [
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths))
+        for row in cells
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def _create_users(profile_type, count, batch_size):
+    """Bulk create users of one profile type together with profiles."""
+    users = User.objects.bulk_create(
+        (
+            User(
+                username=f"benchmark_{profile_type}_{index}",
+                email=f"benchmark_{profile_type}_{index}@example.com",
+                first_name="Benchmark",
+                last_name=f"{profile_type.title()} {index}",
+            )
+            for index in range(count)
+        ),
+        batch_size=batch_size,
+    )
+    UserProfile.objects.bulk_create(
+        (UserProfile(user=user, type=profile_type) for user in users),
+        batch_size=batch_size,
+    )
+    return users
@@ -0,0 +1,121 @@
+"""
+Helpers for conditional GET requests.
+
+Views compute an ETag and a Last-Modified timestamp from a cheap metadata
+query, answer matching If-None-Match / If-Modified-Since headers with
+304 Not Modified before any serializer runs, and attach both validators
+to full responses. Cached responses may instead use a digest of their
+data as ETag (see make_data_digest).
+"""
+
+import hashlib
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(request, *parts):
+    """
+    Build a strong ETag from the given parts.
+
+    The origin and the negotiated renderer are part of the tag, because
+    both change the bytes of the response (absolute URLs, browsable API).
+
+    Args:
+        request: The DRF request the response belongs to.
+        *parts: Values identifying the state of the represented data.
+
+    Returns:
+        str: Quoted ETag value.
+    """
+    renderer = getattr(request, "accepted_renderer", None)
+    values = [
+        request.build_absolute_uri("/"),
+        getattr(renderer, "format", ""),
+        *parts,
+    ]
+    digest = hashlib.sha256(
+        "|".join(str(value) for value in values).encode()
+    ).hexdigest()
+    return f'"{digest[:40]}"'
+
+
+def make_data_digest(data):
+    """
+    Return a digest of response data for use as an ETag part.
+
+    Args:
+        data: JSON-serializable response data.
+
+    Returns:
+        str: Hex digest that changes with any value of the data.
+    """
+    normalized = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def get_lookup_value(view, queryset):
+    """
+    Return the metadata of the object a detail view is about to retrieve.
+
+    Args:
+        view: The generic view handling the request.
+        queryset: values() or values_list() queryset selecting the
+            metadata of the view's model.
+
+    Returns:
+        The first row matching the view's lookup, or None if there is
+            none or the lookup value is malformed. The view then takes its
+            regular path, which answers with 404.
+    """
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    lookup = {view.lookup_field: view.kwargs[lookup_url_kwarg]}
+    try:
+        return queryset.filter(**lookup).first()
+    except (TypeError, ValueError, ValidationError):
+        return None
+
+
+def get_not_modified_response(request, etag, last_modified=None):
+    """
+    Answer a conditional request without building the response body.
+
+    Args:
+        request: The DRF request.
+        etag (str): Quoted ETag of the current representation.
+        last_modified (datetime, optional): Last modification time of the
+            represented data.
+
+    Returns:
+        HttpResponse or None: A 304 (or 412) response carrying the
+            validators if the request's preconditions allow it, otherwise
+            None so the view builds the full response.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=_timestamp(last_modified),
+    )
+    if response is not None:
+        set_validator_headers(response, etag, last_modified)
+    return response
+
+
+def set_validator_headers(response, etag, last_modified=None):
+    """Set the ETag and Last-Modified headers on a response."""
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(_timestamp(last_modified))
+    return response
+
+
+def _timestamp(value):
+    """Return a datetime as whole epoch seconds, or None."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
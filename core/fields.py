@@ -0,0 +1,18 @@
+"""Serializer fields shared by the apps and the projection engine."""
+
+from rest_framework import serializers
+
+
+class PriceField(serializers.DecimalField):
+    """
+    Custom decimal field for price representation.
+
+    Converts decimal prices to integers when the value is a whole number,
+    otherwise returns as float.
+    """
+
+    def to_representation(self, value):
+        value = super().to_representation(value)
+        if value is not None and float(value) == int(float(value)):
+            return int(float(value))
+        return float(value)
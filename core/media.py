@@ -0,0 +1,222 @@
+"""
+Serving of uploaded media.
+
+Content-addressed files (see core.storage) never change under their
+name, so they are served as immutable for a year. Other files, e.g.
+uploads stored before content addressing, have to be revalidated.
+
+MEDIA_SERVE_MODE selects who sends the bytes:
+
+- 'django' streams the file from the worker with FileResponse. Single
+  byte ranges are answered with 206, and WSGI servers with a file
+  wrapper (e.g. gunicorn) send the file with zero-copy sendfile.
+- 'x-accel' hands the file to nginx with X-Accel-Redirect, pointing at
+  the internal location MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT.
+- 'x-sendfile' hands the file to Apache (mod_xsendfile) or lighttpd
+  with X-Sendfile and its absolute path.
+
+In every mode the worker only checks the file and If-Modified-Since,
+the front server takes care of ranges in the hand-off modes.
+"""
+
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import (
+    ImproperlyConfigured,
+    SuspiciousFileOperation,
+)
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+)
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.static import was_modified_since
+
+from core.storage import is_content_addressed
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MEDIA_SERVE_MODES = ("django", "x-accel", "x-sendfile")
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def serve_media(request, path):
+    """
+    Serve a file from MEDIA_ROOT with caching headers.
+
+    Args:
+        request: The HTTP request.
+        path (str): Storage name of the requested file.
+
+    Returns:
+        HttpResponse: The file (or the hand-off to the front server), a
+            206 partial response, 304 if the client's copy is current,
+            or 416 for a range outside the file. Missing files, hidden
+            files and directories raise Http404.
+    """
+    fullpath = get_media_path(path)
+    stat = fullpath.stat()
+
+    if not was_modified_since(
+        request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime
+    ):
+        response = HttpResponseNotModified()
+    else:
+        mode = getattr(settings, "MEDIA_SERVE_MODE", "django")
+        if mode == "x-accel":
+            response = HttpResponse()
+            response["X-Accel-Redirect"] = quote(
+                getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/")
+                + posixpath.normpath(path).lstrip("/")
+            )
+        elif mode == "x-sendfile":
+            response = HttpResponse()
+            response["X-Sendfile"] = str(fullpath)
+        elif mode == "django":
+            response = stream_file(request, fullpath, stat)
+        else:
+            raise ImproperlyConfigured(
+                f"MEDIA_SERVE_MODE must be one of {MEDIA_SERVE_MODES}."
+            )
+        if response.status_code == 416:
+            return response
+        content_type, encoding = mimetypes.guess_type(str(fullpath))
+        response["Content-Type"] = content_type or "application/octet-stream"
+        if encoding:
+            response["Content-Encoding"] = encoding
+        response["Last-Modified"] = http_date(stat.st_mtime)
+
+    if is_content_addressed(path):
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+def get_media_path(path):
+    """
+    Return the absolute path of a media file.
+
+    Raises:
+        Http404: If the path leaves MEDIA_ROOT, points at a hidden file
+            (e.g. a temporary upload) or is not a regular file.
+    """
+    path = posixpath.normpath(path).lstrip("/")
+    if any(part.startswith(".") for part in path.split("/")):
+        raise Http404("Media file not found.")
+    try:
+        fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404("Media file not found.")
+    if not fullpath.is_file():
+        raise Http404("Media file not found.")
+    return fullpath
+
+
+def parse_range(header, size):
+    """
+    Parse a Range header holding a single byte range.
+
+    Args:
+        header (str): Value of the Range header, or None.
+        size (int): Size of the file in bytes.
+
+    Returns:
+        tuple or None: (first, last) byte positions, None to send the
+            whole file (no header, several ranges or another unit).
+
+    Raises:
+        ValueError: If the range cannot be satisfied.
+    """
+    match = RANGE_HEADER.match(header or "")
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last n bytes.
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range.")
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first > last:
+        raise ValueError("Range outside the file.")
+    return first, last
+
+
+def stream_file(request, fullpath, stat):
+    """
+    Return a FileResponse for the file or the requested byte range.
+
+    Ranges are ignored if If-Range names an older modification time.
+    Ranges that run to the end of the file are sent from the seeked
+    file itself, so the WSGI server can still use sendfile.
+    """
+    size = stat.st_size
+    range_header = request.META.get("HTTP_RANGE")
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range is not None and parse_http_date_safe(if_range) != int(
+        stat.st_mtime
+    ):
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    file = fullpath.open("rb")
+    if byte_range is None:
+        response = FileResponse(file)
+    else:
+        first, last = byte_range
+        file.seek(first)
+        length = last - first + 1
+        if last < size - 1:
+            file = RangeFile(file, length)
+        response = FileResponse(file, status=206)
+        response["Content-Range"] = f"bytes {first}-{last}/{size}"
+        response["Content-Length"] = str(length)
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+class RangeFile:
+    """
+    Read-only view of a file limited to a number of bytes.
+
+    Args:
+        file: Binary file positioned at the first byte of the range.
+        length (int): Number of bytes to read.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        """Read up to size bytes without passing the end of the range."""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        """Close the underlying file."""
+        self.file.close()
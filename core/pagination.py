@@ -0,0 +1,26 @@
+"""Opt-in keyset pagination shared by the list endpoints."""
+
+
+class CursorOptInMixin:
+    """
+    Let clients opt in to keyset pagination per request.
+
+    Views set cursor_pagination_class, which is used when the request
+    has 'pagination=cursor'. Otherwise the view's pagination_class
+    applies as usual, which leaves the list unpaginated if it has none.
+
+    Attributes:
+        cursor_pagination_class: Paginator for 'pagination=cursor'.
+    """
+
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        """Return the paginator for the current request."""
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
@@ -0,0 +1,357 @@
+"""
+Read-only projection engine for list and detail endpoints.
+
+A Projection renders rows of a values() queryset into the same data a
+ModelSerializer produces for model instances, without instantiating
+models, serializers or fields per item. Every declared field is compiled
+once per request into a plain getter, so rendering an item is a single
+dict comprehension. Nested lists of related rows are loaded with one
+extra query per relation.
+
+Views opt in through ProjectionMixin. The parity tests of each app
+compare the rendered JSON with the serializer output byte for byte, so
+a projection must declare its fields in the serializer's order and
+mirror its formatting.
+"""
+
+from operator import itemgetter
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from core.fields import PriceField
+
+URL_SENTINEL = 987654321
+
+
+class Field:
+    """
+    A projected value read from one values() column.
+
+    Args:
+        source (str, optional): values() lookup of the column. Defaults
+            to the field name.
+    """
+
+    def __init__(self, source=None):
+        self.source = source
+
+    def get_columns(self, name):
+        """Return the values() lookups this field reads."""
+        return [self.source or name]
+
+    def get_converter(self, context):
+        """
+        Return a function converting a non-null column value.
+
+        Returns None if the value is used as is.
+        """
+        return None
+
+    def compile(self, name, context):
+        """
+        Return a getter producing the field's value from a row.
+
+        None passes through unconverted, like in DRF serializers.
+        """
+        column = self.source or name
+        convert = self.get_converter(context)
+        if convert is None:
+            return itemgetter(column)
+
+        def get(row):
+            value = row[column]
+            return None if value is None else convert(value)
+
+        return get
+
+
+class DateTimeField(Field):
+    """Datetime rendered in ISO 8601 in the current time zone."""
+
+    def get_converter(self, context):
+        current_timezone = timezone.get_current_timezone()
+
+        def convert(value):
+            value = value.astimezone(current_timezone).isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+
+        return convert
+
+
+class PriceDecimalField(Field):
+    """
+    Price formatted like PriceField.
+
+    Whole amounts, the common case, are returned as int directly. Other
+    values go through PriceField for identical rounding.
+    """
+
+    price_field = PriceField(max_digits=10, decimal_places=2)
+
+    def get_converter(self, context):
+        to_representation = self.price_field.to_representation
+
+        def convert(value):
+            if value == int(value) and abs(value) < 10**8:
+                return int(value)
+            return to_representation(value)
+
+        return convert
+
+
+class FileField(Field):
+    """
+    URL of a stored file, absolute if the context has a request.
+
+    Args:
+        model: Model declaring the file field.
+        source (str, optional): Name of the file field.
+    """
+
+    def __init__(self, model, source=None):
+        super().__init__(source)
+        self.model = model
+
+    def compile(self, name, context):
+        storage = self.model._meta.get_field(self.source or name).storage
+        request = context.get("request")
+        column = self.source or name
+
+        def get(row):
+            file_name = row[column]
+            if not file_name:
+                return None
+            url = storage.url(file_name)
+            if request is not None:
+                return request.build_absolute_uri(url)
+            return url
+
+        return get
+
+
+class URLField(Field):
+    """
+    URL of a detail route, built from the primary key.
+
+    The route is reversed once per request with a sentinel key and the
+    key of each row is inserted into the result.
+
+    Args:
+        view_name (str): Name of the detail route.
+        absolute (bool): Build absolute URLs from the request, like
+            HyperlinkedIdentityField.
+        remove_prefix (str): Prefix removed from the path.
+        source (str): values() lookup of the primary key.
+    """
+
+    def __init__(
+        self, view_name, absolute=False, remove_prefix="", source="id"
+    ):
+        super().__init__(source)
+        self.view_name = view_name
+        self.absolute = absolute
+        self.remove_prefix = remove_prefix
+
+    def get_converter(self, context):
+        url = reverse(self.view_name, kwargs={"pk": URL_SENTINEL})
+        url = url.removeprefix(self.remove_prefix)
+        request = context.get("request")
+        if self.absolute and request is not None:
+            url = request.build_absolute_uri(url)
+        prefix, suffix = url.split(str(URL_SENTINEL))
+
+        def convert(value):
+            return f"{prefix}{value}{suffix}"
+
+        return convert
+
+
+class NestedField(Field):
+    """
+    Dict of several columns, e.g. fields of a related object.
+
+    Args:
+        **fields: Output names mapped to fields.
+    """
+
+    def __init__(self, **fields):
+        super().__init__()
+        self.fields = fields
+
+    def get_columns(self, name):
+        return [
+            column
+            for field_name, field in self.fields.items()
+            for column in field.get_columns(field_name)
+        ]
+
+    def compile(self, name, context):
+        getters = [
+            (field_name, field.compile(field_name, context))
+            for field_name, field in self.fields.items()
+        ]
+
+        def get(row):
+            return {field_name: getter(row) for field_name, getter in getters}
+
+        return get
+
+
+class ManyField(Field):
+    """
+    List of related rows rendered by another projection.
+
+    The rows of all rendered parents are loaded with one query, ordered
+    by primary key.
+
+    Args:
+        projection_class: Projection rendering the related rows.
+        related_field (str): Foreign key of the related model pointing
+            to the parent.
+    """
+
+    def __init__(self, projection_class, related_field):
+        super().__init__()
+        self.projection_class = projection_class
+        self.related_field = related_field
+
+    def get_columns(self, name):
+        return ["id"]
+
+    def compile(self, name, context):
+        return itemgetter(name)
+
+    def load(self, name, rows, context):
+        """Attach the rendered related rows to every parent row."""
+        projection = self.projection_class(context)
+        key = f"{self.related_field}_id"
+        related_rows = list(
+            projection.model._default_manager.filter(
+                **{f"{key}__in": [row["id"] for row in rows]}
+            )
+            .order_by(key, "id")
+            .values(key, *projection.get_columns())
+        )
+
+        children = {}
+        for related_row, data in zip(
+            related_rows, projection.render(related_rows)
+        ):
+            children.setdefault(related_row[key], []).append(data)
+        for row in rows:
+            row[name] = children.get(row["id"], [])
+
+
+class Projection:
+    """
+    values()-based, read-only replacement for a ModelSerializer.
+
+    Subclasses set model and declare fields in output order.
+
+    Attributes:
+        model: The projected model.
+        fields (dict): Output names mapped to Field instances.
+    """
+
+    model = None
+    fields = {}
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.getters = [
+            (name, field.compile(name, self.context))
+            for name, field in self.fields.items()
+        ]
+        self.many_fields = [
+            (name, field)
+            for name, field in self.fields.items()
+            if isinstance(field, ManyField)
+        ]
+
+    def get_columns(self):
+        """Return the distinct values() lookups of all fields."""
+        columns = []
+        for name, field in self.fields.items():
+            for column in field.get_columns(name):
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+    def get_queryset(self, queryset):
+        """
+        Turn a view's queryset into a values() queryset for rendering.
+
+        Prefetches are dropped (related rows come from ManyField) and
+        extra() selections are kept, so orderings on them still work.
+        """
+        extra = list(queryset.query.extra)
+        return queryset.prefetch_related(None).values(
+            *self.get_columns(), *extra
+        )
+
+    def render(self, rows):
+        """Render values() rows into a list of dicts."""
+        rows = list(rows)
+        if rows:
+            for name, field in self.many_fields:
+                field.load(name, rows, self.context)
+        getters = self.getters
+        return [{name: get(row) for name, get in getters} for row in rows]
+
+
+class ProjectionMixin:
+    """
+    Serve read actions of a generic view from projections.
+
+    projection_classes maps 'list' and 'retrieve' to a Projection.
+    Actions without an entry keep using the serializer, and an entry can
+    be switched off per view (e.g. as_view(projection_classes={})).
+
+    On retrieve, object permissions receive the values() row instead of
+    a model instance, so only project views whose object permissions do
+    not inspect the object.
+    """
+
+    projection_classes = {}
+
+    def get_projection(self, action):
+        """Return the projection for the action, or None."""
+        projection_class = self.projection_classes.get(action)
+        if projection_class is None:
+            return None
+        return projection_class(self.get_serializer_context())
+
+    def list(self, request, *args, **kwargs):
+        """List the queryset through the list projection."""
+        projection = self.get_projection("list")
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = projection.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(projection.render(page))
+        return Response(projection.render(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve one object through the retrieve projection."""
+        projection = self.get_projection("retrieve")
+        if projection is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        queryset = projection.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(request, row)
+        return Response(projection.render([row])[0])
@@ -116,6 +116,66 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# The local-memory cache is per process. Deployments with several worker
+# processes should point this at a shared backend (Redis, Memcached) so
+# list cache invalidations reach every worker.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "coderr",
+    }
+}
+
+# Uploads are stored under content hashes and deduplicated (see
+# core.storage).
+
+STORAGES = {
+    "default": {
+        "BACKEND": "core.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Who sends media files: "django" streams them from the worker,
+# "x-accel" hands them to nginx (internal location MEDIA_ACCEL_PREFIX
+# aliased to MEDIA_ROOT) and "x-sendfile" to Apache or lighttpd (see
+# core.media).
+
+MEDIA_SERVE_MODE = os.getenv("MEDIA_SERVE_MODE", "django")
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+
+# Threads resizing uploaded offer images into WebP/AVIF variants in the
+# background (see offers_app.image_variants).
+
+IMAGE_VARIANT_WORKERS = 2
+
+# Per-process cache of token lookups (see auth_app.api.authentication).
+# Changes made in another process are picked up after the TTL in seconds.
+
+TOKEN_AUTH_CACHE_SIZE = 1024
+TOKEN_AUTH_CACHE_TTL = 60
+
+# Password hashing pool of login and registration (see auth_app.hashing).
+# Calls beyond the workers and the queue are rejected with 503.
+
+PASSWORD_HASHING_WORKERS = 2
+PASSWORD_HASHING_QUEUE = 8
+PASSWORD_HASHING_TIMEOUT = 10
+
+# Issue HMAC-signed auth tokens verified without a database query (see
+# auth_app.api.signed_tokens). Opaque tokens keep working either way.
+# SIGNED_TOKEN_KEYS (newest first) defaults to SECRET_KEY and
+# SECRET_KEY_FALLBACKS.
+
+SIGNED_TOKENS = os.getenv("SIGNED_TOKENS", "false").lower() == "true"
+SIGNED_TOKEN_TTL = 24 * 60 * 60
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -158,7 +218,7 @@ else:
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "auth_app.api.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
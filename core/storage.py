@@ -0,0 +1,128 @@
+"""
+Content-addressed storage for uploaded media.
+
+Uploads are stored under the SHA-256 digest of their content (see
+content_hash_path), so a replaced image always gets a new URL and media
+can be cached forever. Identical uploads share one file: saving a name
+that already exists keeps the stored file instead of writing a copy.
+
+Because a file can be shared, deleting it (e.g. by django_cleanup when
+a model's file changes) only removes it once no model references it
+anymore. The cleanup_media command reclaims files that are left over.
+"""
+
+import hashlib
+import os
+import re
+import uuid
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import models
+
+HASH_CHUNK_SIZE = 64 * 1024
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}")
+
+
+def hash_file(file):
+    """
+    Return the SHA-256 hex digest of a file's content.
+
+    The file is read in chunks and rewound afterwards, so it can still be
+    saved.
+    """
+    digest = hashlib.sha256()
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def content_hash_path(directory, field_file, filename):
+    """
+    Return the content-addressed storage name of an upload.
+
+    Args:
+        directory (str): Directory of the upload.
+        field_file (FieldFile): The model's file holding the upload.
+        filename (str): Name of the uploaded file, used for its extension.
+
+    Returns:
+        str: '<directory>/<sha256 of the content><extension>'.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    return f"{directory}/{hash_file(field_file.file)}{ext}"
+
+
+def is_content_addressed(name):
+    """Return True if a storage name starts with a content digest."""
+    return bool(CONTENT_ADDRESSED_NAME.match(os.path.basename(name)))
+
+
+def iter_file_references():
+    """
+    Yield (model, field name) of every FileField on the default storage.
+    """
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if (
+                isinstance(field, models.FileField)
+                and field.storage is default_storage
+            ):
+                yield model, field.name
+
+
+def is_referenced(name):
+    """Return True if any model's FileField points at the stored name."""
+    return any(
+        model._default_manager.filter(**{field_name: name}).exists()
+        for model, field_name in iter_file_references()
+    )
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage deduplicating content-addressed files.
+
+    Names not starting with a content digest behave as in
+    FileSystemStorage.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """Keep content-addressed names, the file's content is the same."""
+        if is_content_addressed(name):
+            return name
+        return super().get_available_name(name, max_length)
+
+    def _save(self, name, content):
+        """
+        Store a content-addressed file once.
+
+        A file that already exists has the same content and is kept. New
+        files are written under a temporary name and moved into place, so
+        concurrent uploads of the same content never expose a partially
+        written file.
+        """
+        if not is_content_addressed(name):
+            return super()._save(name, content)
+        if self.exists(name):
+            return name
+
+        directory, basename = os.path.split(name)
+        temporary_name = super()._save(
+            os.path.join(directory, f".{basename}.{uuid.uuid4().hex}.tmp"),
+            content,
+        )
+        os.replace(self.path(temporary_name), self.path(name))
+        return name
+
+    def delete(self, name):
+        """
+        Delete a file unless it is content-addressed and still in use.
+
+        Shared files are kept until the last model referencing them lets
+        go of them.
+        """
+        if name and is_content_addressed(name) and is_referenced(name):
+            return
+        super().delete(name)
@@ -7,10 +7,13 @@ Django REST Framework applications.
 """
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APITestCase
 
+from auth_app.api.authentication import token_cache
 from auth_app.models import UserProfile
 from offers_app.models import Offer, OfferPackage
+from offers_app.suggest import clear_suggest_index
 from orders_app.models import Order
 from reviews_app.models import Review
 
@@ -113,6 +116,7 @@ class APITestCaseWithSetup(APITestCase):
             features=["WebDev", "Responsive", "SEO", "Analytics"],
             package=cls.offer_package_1,
         )
+        cls.offer_package_1.update_min_values()
 
         cls.business_user_2 = User.objects.create_user(
             username="sarah_miller",
@@ -160,6 +164,7 @@ class APITestCaseWithSetup(APITestCase):
             features=["Logo", "Business Card", "Letterhead", "Flyer"],
             package=cls.offer_package_2,
         )
+        cls.offer_package_2.update_min_values()
 
         cls.customer_user_1 = User.objects.create_user(
             username="alice_customer",
@@ -259,3 +264,16 @@ class APITestCaseWithSetup(APITestCase):
             rating=3,
             description="Average experience, took longer than expected.",
         )
+
+    def setUp(self):
+        """
+        Clear the caches before every test.
+
+        Database changes are rolled back between tests, cache entries and
+        in-process indexes are not, so cached responses would otherwise
+        leak into later tests.
+        """
+        super().setUp()
+        cache.clear()
+        token_cache.clear()
+        clear_suggest_index()
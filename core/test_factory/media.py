@@ -0,0 +1,44 @@
+"""
+Test helpers for uploaded media.
+"""
+
+import tempfile
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from PIL import Image
+
+
+class TemporaryMediaMixin:
+    """
+    Store the uploads of every test in a temporary MEDIA_ROOT.
+
+    The directory is removed after the test. Mix in before the test case
+    class.
+    """
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+
+def create_image_file(size=(1600, 1200), color="teal", name="image.png"):
+    """
+    Return an in-memory PNG image.
+
+    Args:
+        size (tuple): Width and height in pixels.
+        color (str): Fill color; different colors give different content.
+        name (str): File name of the upload.
+
+    Returns:
+        ContentFile: The encoded image.
+    """
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return ContentFile(buffer.getvalue(), name=name)
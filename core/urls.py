@@ -1,7 +1,10 @@
+import re
+
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from core.media import serve_media
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -12,5 +15,10 @@ urlpatterns = [
     path("api/", include("information_app.api.urls")),
 ]
 
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += [
+    re_path(
+        rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.*)$",
+        serve_media,
+        name="media",
+    ),
+]
@@ -1,6 +1,12 @@
 from django.db.models import Avg
 
+from auth_app.api.authentication import get_token_cache_stats
+from auth_app.hashing import get_hashing_stats
 from auth_app.models import UserProfile
+from offers_app.api.cache import (
+    get_facets_cache_stats,
+    get_list_cache_stats,
+)
 from offers_app.models import OfferPackage
 from reviews_app.models import Review
 
@@ -26,3 +32,13 @@ def get_business_profile_count():
 def get_offer_count():
     """Return the total number of offer packages."""
     return OfferPackage.objects.all().count()
+
+
+def get_runtime_stats():
+    """Return runtime counters of the caches used by the API."""
+    return {
+        "offer_list_cache": get_list_cache_stats(),
+        "offer_facets_cache": get_facets_cache_stats(),
+        "token_auth_cache": get_token_cache_stats(),
+        "password_hashing": get_hashing_stats(),
+    }
@@ -1,5 +1,12 @@
 from django.urls import path
 
-from information_app.api.views import BaseInfoAPIView
+from information_app.api.views import BaseInfoAPIView, RuntimeStatsAPIView
 
-urlpatterns = [path("base-info/", BaseInfoAPIView.as_view(), name="base-info")]
+urlpatterns = [
+    path("base-info/", BaseInfoAPIView.as_view(), name="base-info"),
+    path(
+        "runtime-stats/",
+        RuntimeStatsAPIView.as_view(),
+        name="runtime-stats",
+    ),
+]
@@ -1,13 +1,15 @@
 from rest_framework import status
 from rest_framework.generics import RetrieveAPIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from auth_app.api.permissions import IsAdminOrStaff
 from information_app.api.helpers import (
     get_average_rating,
     get_business_profile_count,
     get_offer_count,
     get_review_count,
+    get_runtime_stats,
 )
 
 
@@ -28,3 +30,13 @@ class BaseInfoAPIView(RetrieveAPIView):
             "offer_count": get_offer_count(),
         }
         return Response(data, status=status.HTTP_200_OK)
+
+
+class RuntimeStatsAPIView(RetrieveAPIView):
+    """API view that returns runtime statistics for staff users."""
+
+    permission_classes = [IsAuthenticated, IsAdminOrStaff]
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return cache hit and miss counters."""
+        return Response(get_runtime_stats(), status=status.HTTP_200_OK)
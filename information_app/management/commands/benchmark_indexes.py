@@ -0,0 +1,161 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Min
+
+from core.benchmark import (
+    format_table,
+    generate_marketplace,
+    measure,
+    rolled_back,
+)
+from information_app.api.helpers import (
+    get_average_rating,
+    get_business_profile_count,
+    get_offer_count,
+    get_review_count,
+)
+from offers_app.api.query import filter_min_price
+from offers_app.models import Offer, OfferPackage
+from orders_app.models import Order
+from reviews_app.models import Review
+
+
+class Command(BaseCommand):
+    """
+    Time the hot API queries with and without the Meta.indexes.
+
+    Generates a marketplace of the requested size inside a transaction,
+    drops every index declared in Meta.indexes of the project's models,
+    times each query, recreates the indexes and times them again. The
+    transaction is rolled back, so the database is left unchanged.
+    """
+
+    help = "Compare query timings without and with the declared indexes."
+    app_labels = ["auth_app", "offers_app", "orders_app", "reviews_app"]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1_000_000,
+            help="Number of generated offers and orders.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Measured runs per query.",
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.stdout.write(f"Generating {options['rows']} rows...")
+            data = generate_marketplace(options["rows"])
+            queries = self.get_queries(data)
+
+            self.drop_indexes()
+            before = self.run_queries(queries, options["repeat"])
+            self.create_indexes()
+            after = self.run_queries(queries, options["repeat"])
+
+        rows = [
+            [
+                name,
+                before[name],
+                after[name],
+                f"{before[name] / after[name]:.1f}x",
+            ]
+            for name in queries
+        ]
+        self.stdout.write(
+            format_table(
+                [
+                    "query",
+                    "without indexes (ms)",
+                    "with indexes (ms)",
+                    "speedup",
+                ],
+                rows,
+            )
+        )
+
+    def get_queries(self, data):
+        """Return the benchmarked queries keyed by a readable name."""
+        business = data["businesses"][-1]
+        customer = data["customers"][-1]
+        package = data["packages"][len(data["packages"]) // 2]
+        packages = OfferPackage.objects.all()
+
+        return {
+            "offers: list page": lambda: list(
+                packages.order_by("-created_at", "-id")[:6]
+            ),
+            "offers: by creator": lambda: list(
+                packages.filter(user=business).order_by("-created_at")[:6]
+            ),
+            "offers: min_price filter": lambda: list(
+                filter_min_price(packages.order_by("-created_at"), 400)[:6]
+            ),
+            "offers: by -updated_at": lambda: list(
+                packages.order_by("-updated_at", "-id")[:6]
+            ),
+            "offers: package min values": lambda: Offer.objects.filter(
+                package=package
+            ).aggregate(Min("price"), Min("delivery_time_in_days")),
+            "orders: in progress count": lambda: Order.objects.filter(
+                business_user=business, status="in_progress"
+            ).count(),
+            "orders: completed count": lambda: Order.objects.filter(
+                business_user=business, status="completed"
+            ).count(),
+            "reviews: by business and reviewer": lambda: Review.objects.filter(
+                business_user=business, reviewer=customer
+            ).exists(),
+            "base-info: review count": get_review_count,
+            "base-info: average rating": get_average_rating,
+            "base-info: business profiles": get_business_profile_count,
+            "base-info: offer count": get_offer_count,
+        }
+
+    def run_queries(self, queries, repeat):
+        """Return the median duration of every query in milliseconds."""
+        return {
+            name: measure(query, repeat) for name, query in queries.items()
+        }
+
+    def declared_indexes(self):
+        """Yield (model, index) for every index in Meta.indexes."""
+        for app_label in self.app_labels:
+            for model in apps.get_app_config(app_label).get_models():
+                for index in model._meta.indexes:
+                    yield model, index
+
+    def drop_indexes(self):
+        """Drop the declared indexes inside the running transaction."""
+        self.execute_index_sql(
+            lambda model, index, editor: (
+                f"DROP INDEX {editor.quote_name(index.name)}"
+            )
+        )
+
+    def create_indexes(self):
+        """Recreate the declared indexes inside the running transaction."""
+        self.execute_index_sql(
+            lambda model, index, editor: index.create_sql(model, editor)
+        )
+
+    def execute_index_sql(self, build_statement):
+        """
+        Execute one statement per declared index.
+
+        The statements are executed directly because SQLite's schema
+        editor refuses to run inside an atomic block. ANALYZE refreshes
+        the planner statistics for the new set of indexes.
+        """
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model, index in self.declared_indexes():
+                cursor.execute(str(build_statement(model, index, editor)))
+            if connection.vendor == "sqlite":
+                cursor.execute("ANALYZE")
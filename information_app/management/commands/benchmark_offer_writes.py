@@ -0,0 +1,178 @@
+import copy
+import itertools
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.benchmark import (
+    OFFER_TYPES,
+    format_table,
+    generate_marketplace,
+    measure,
+    rolled_back,
+)
+from offers_app.api.serializers import (
+    CreateOfferPackageSerializer,
+    UpdateOfferPackageSerializer,
+)
+from offers_app.models import Offer, OfferPackage
+
+
+class Command(BaseCommand):
+    """
+    Compare row-by-row and batched writes of offer packages.
+
+    Generates a small marketplace inside a transaction that is rolled
+    back afterwards and times creating and updating a package with its
+    three offers, once with one statement per offer and once through the
+    serializers' batched write path. Validation is done once up front,
+    so only the writes are timed. On SQLite every write holds the
+    database-wide write lock, so shorter writes also mean shorter waits
+    for concurrent writers.
+    """
+
+    help = "Compare offer package write timings of row-by-row and batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Measured runs per write.",
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            data = generate_marketplace(300)
+            request = Request(APIRequestFactory().post("/"))
+            request.user = data["businesses"][0]
+            context = {"request": request}
+            package = data["packages"][0]
+
+            create_data = self.get_validated_data(
+                CreateOfferPackageSerializer(
+                    data=self.get_payload(), context=context
+                )
+            )
+            # Updates alternate between two payloads, so every run
+            # really changes the offers.
+            update_data = itertools.cycle(
+                [
+                    self.get_validated_data(
+                        UpdateOfferPackageSerializer(
+                            package,
+                            data=self.get_payload(scale),
+                            partial=True,
+                            context=context,
+                        )
+                    )
+                    for scale in [1, 2]
+                ]
+            )
+            create_serializer = CreateOfferPackageSerializer(context=context)
+            update_serializer = UpdateOfferPackageSerializer(context=context)
+
+            writes = {
+                "create package": (
+                    lambda: self.create_row_by_row(copy.deepcopy(create_data)),
+                    lambda: create_serializer.create(
+                        copy.deepcopy(create_data)
+                    ),
+                ),
+                "update package": (
+                    lambda: self.update_row_by_row(
+                        package, copy.deepcopy(next(update_data))
+                    ),
+                    lambda: update_serializer.update(
+                        package, copy.deepcopy(next(update_data))
+                    ),
+                ),
+            }
+
+            rows = []
+            for name, (row_by_row, batched) in writes.items():
+                row_by_row_ms = measure(row_by_row, options["repeat"])
+                batched_ms = measure(batched, options["repeat"])
+                rows.append(
+                    [
+                        name,
+                        row_by_row_ms,
+                        self.count_queries(row_by_row),
+                        batched_ms,
+                        self.count_queries(batched),
+                        f"{row_by_row_ms / batched_ms:.1f}x",
+                    ]
+                )
+
+        self.stdout.write(
+            format_table(
+                [
+                    "write",
+                    "row-by-row (ms)",
+                    "queries",
+                    "batched (ms)",
+                    "queries",
+                    "speedup",
+                ],
+                rows,
+            )
+        )
+
+    def get_payload(self, scale=1):
+        """Return request data of a package with all three offers."""
+        return {
+            "title": "Benchmark write",
+            "description": "Package written by the benchmark",
+            "details": [
+                {
+                    "title": f"{offer_type} offer",
+                    "revisions": tier + 1,
+                    "delivery_time_in_days": (3 + tier) * scale,
+                    "price": 100 * (tier + 1) * scale,
+                    "features": ["Benchmark"],
+                    "offer_type": offer_type,
+                }
+                for tier, offer_type in enumerate(OFFER_TYPES)
+            ],
+        }
+
+    def get_validated_data(self, serializer):
+        """Validate the serializer and return its validated data."""
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def count_queries(self, write):
+        """Return the number of statements one write executes."""
+        with CaptureQueriesContext(connection) as queries:
+            write()
+        return len(queries)
+
+    def create_row_by_row(self, validated_data):
+        """Create a package with one INSERT per offer and an aggregate."""
+        offers_data = validated_data.pop("offers")
+        with transaction.atomic():
+            offer_package = OfferPackage.objects.create(**validated_data)
+            for offer_data in offers_data:
+                Offer.objects.create(package=offer_package, **offer_data)
+            offer_package.update_min_values()
+        return offer_package
+
+    def update_row_by_row(self, instance, validated_data):
+        """Update a package, reading and saving every offer on its own."""
+        offers_data = validated_data.pop("offers")
+        with transaction.atomic():
+            for updated_offer in offers_data:
+                for offer in instance.offers.all():
+                    if offer.offer_type == updated_offer["offer_type"]:
+                        for key, value in updated_offer.items():
+                            setattr(offer, key, value)
+                        offer.save()
+                        break
+            instance.update_min_values()
+            for key, value in validated_data.items():
+                setattr(instance, key, value)
+            instance.save()
+        return instance
@@ -0,0 +1,133 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from auth_app.api.views import BusinessProfilesView, CustomerProfilesView
+from core.benchmark import (
+    format_table,
+    generate_marketplace,
+    measure,
+    rolled_back,
+)
+from offers_app.api.cache import bump_list_cache_version
+from offers_app.api.views import OffersViewSet
+from orders_app.api.views import OrdersViewSet
+from reviews_app.api.views import ReviewsViewSet
+
+
+class Command(BaseCommand):
+    """
+    Compare the read endpoints rendered by serializers and projections.
+
+    Generates a marketplace of the requested size inside a transaction
+    that is rolled back afterwards and times every endpoint, including
+    JSON rendering, once with its DRF serializer and once with its
+    projection. The offer list cache is bypassed.
+    """
+
+    help = "Compare read endpoint timings of serializers and projections."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=3000,
+            help="Number of generated offers and orders.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Measured runs per endpoint.",
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            data = generate_marketplace(options["rows"])
+            user = data["businesses"][0]
+            package = data["packages"][0]
+            endpoints = {
+                "offers list (page_size=10)": (
+                    OffersViewSet,
+                    {"get": "list"},
+                    "/api/offers/?page_size=10",
+                    {},
+                ),
+                "offer package retrieve": (
+                    OffersViewSet,
+                    {"get": "retrieve"},
+                    f"/api/offers/{package.pk}/",
+                    {"pk": package.pk},
+                ),
+                "orders list": (OrdersViewSet, {"get": "list"}, "/", {}),
+                "reviews list": (ReviewsViewSet, {"get": "list"}, "/", {}),
+                "business profiles": (BusinessProfilesView, None, "/", {}),
+                "customer profiles": (CustomerProfilesView, None, "/", {}),
+            }
+
+            rows = []
+            for name, (view_class, actions, path, kwargs) in endpoints.items():
+                serializer_ms = measure(
+                    self.get_call(
+                        view_class,
+                        actions,
+                        path,
+                        kwargs,
+                        user,
+                        projection_classes={},
+                    ),
+                    options["repeat"],
+                )
+                projection_ms = measure(
+                    self.get_call(view_class, actions, path, kwargs, user),
+                    options["repeat"],
+                )
+                rows.append(
+                    [
+                        name,
+                        serializer_ms,
+                        projection_ms,
+                        f"{serializer_ms / projection_ms:.1f}x",
+                    ]
+                )
+
+        self.stdout.write(
+            format_table(
+                ["endpoint", "serializer (ms)", "projection (ms)", "speedup"],
+                rows,
+            )
+        )
+
+    def get_call(
+        self, view_class, actions, path, kwargs, user, projection_classes=None
+    ):
+        """
+        Return a function requesting and rendering the endpoint once.
+
+        An empty projection_classes dict switches the projections off.
+        """
+        initkwargs = {}
+        if projection_classes is not None:
+            initkwargs["projection_classes"] = projection_classes
+        if actions is None:
+            view = view_class.as_view(**initkwargs)
+        else:
+            view = view_class.as_view(actions, **initkwargs)
+        factory = APIRequestFactory()
+        host = next(
+            (host for host in settings.ALLOWED_HOSTS if "*" not in host),
+            "localhost",
+        )
+
+        def call():
+            bump_list_cache_version()
+            request = factory.get(path, HTTP_HOST=host.lstrip("."))
+            force_authenticate(request, user=user)
+            response = view(request, **kwargs)
+            response.render()
+            if response.status_code != 200:
+                raise CommandError(
+                    f"{path} answered with {response.status_code}."
+                )
+
+        return call
@@ -0,0 +1,182 @@
+import statistics
+import threading
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from auth_app.api.serializers import RegistrationSerializer
+from auth_app.models import UserProfile
+from core.benchmark import format_table
+
+
+class Command(BaseCommand):
+    """
+    Compare sign-up throughput of the former and the atomic registration.
+
+    Registers --users users per variant from --threads threads, each with
+    its own database connection, and reports registrations per second,
+    the median latency and the statements of one registration. The
+    former registration checks username and email with two queries and
+    commits user, profile and token separately; the atomic one is
+    RegistrationSerializer. Passwords are hashed with a fast hasher, so
+    the database work is what is compared.
+
+    Unlike the other benchmarks the registrations are committed, so
+    concurrent connections see each other's writes and compete for
+    locks; the generated users are deleted afterwards. Run it against a
+    development database.
+    """
+
+    help = "Benchmark concurrent registrations, former and atomic."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=200,
+            help="Registrations per variant.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Concurrent registering threads.",
+        )
+
+    def handle(self, *args, **options):
+        prefix = f"benchmark-{uuid.uuid4().hex[:8]}"
+        variants = {
+            "former": self.register_former,
+            "atomic": self.register_atomic,
+        }
+        rows = []
+        try:
+            with override_settings(
+                PASSWORD_HASHERS=[
+                    "django.contrib.auth.hashers.MD5PasswordHasher"
+                ]
+            ):
+                for name, register in variants.items():
+                    statements = self.count_queries(
+                        register, f"{prefix}-{name}-probe"
+                    )
+                    seconds, latencies, errors = self.run_concurrently(
+                        register,
+                        [
+                            f"{prefix}-{name}-{index}"
+                            for index in range(options["users"])
+                        ],
+                        options["threads"],
+                    )
+                    rows.append(
+                        [
+                            name,
+                            statements,
+                            options["users"] / seconds,
+                            statistics.median(latencies) if latencies else 0,
+                            errors,
+                        ]
+                    )
+        finally:
+            User.objects.filter(username__startswith=prefix).delete()
+
+        self.stdout.write(
+            format_table(
+                [
+                    "registration",
+                    "statements",
+                    "per second",
+                    "median (ms)",
+                    "errors",
+                ],
+                rows,
+            )
+        )
+
+    def run_concurrently(self, register, usernames, threads):
+        """
+        Register the users from several threads.
+
+        Returns:
+            tuple: Elapsed seconds, latencies in milliseconds and the
+                number of registrations that failed, e.g. with a locked
+                database.
+        """
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker(chunk):
+            try:
+                for username in chunk:
+                    start = time.perf_counter()
+                    try:
+                        register(username)
+                    except DatabaseError:
+                        with lock:
+                            errors.append(username)
+                        continue
+                    with lock:
+                        latencies.append((time.perf_counter() - start) * 1000)
+            finally:
+                if threading.current_thread() is not main_thread:
+                    connections.close_all()
+
+        main_thread = threading.current_thread()
+        chunks = [usernames[index::threads] for index in range(threads)]
+        start = time.perf_counter()
+        if threads <= 1:
+            worker(usernames)
+        else:
+            workers = [
+                threading.Thread(target=worker, args=[chunk])
+                for chunk in chunks
+            ]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+        return time.perf_counter() - start, latencies, len(errors)
+
+    def count_queries(self, register, username):
+        """Return the number of statements one registration executes."""
+        with CaptureQueriesContext(connection) as queries:
+            register(username)
+        return len(queries)
+
+    def get_payload(self, username):
+        """Return the registration request data of a user."""
+        return {
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "benchmarkPassword",
+            "repeated_password": "benchmarkPassword",
+            "type": "customer",
+        }
+
+    def register_former(self, username):
+        """Register like before: lookups, then three autocommits."""
+        data = self.get_payload(username)
+        if User.objects.filter(email=data["email"]).exists():
+            raise DatabaseError("Email already exists")
+        if User.objects.filter(username=username).exists():
+            raise DatabaseError("Username already exists")
+        user = User.objects.create_user(
+            username=username, email=data["email"], password=data["password"]
+        )
+        UserProfile.objects.create(user=user, type=data["type"])
+        token, _ = Token.objects.get_or_create(user=user)
+        return token.key
+
+    def register_atomic(self, username):
+        """Register through RegistrationSerializer."""
+        serializer = RegistrationSerializer(data=self.get_payload(username))
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return serializer.data["token"]
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.storage import iter_file_references
+from offers_app.models import OfferPackage
+
+
+class Command(BaseCommand):
+    """
+    Delete uploaded files no model references anymore.
+
+    Scans the upload directories and deletes every file that is neither
+    referenced by a FileField nor an image variant of an offer package.
+    Files younger than --min-age hours are kept, so uploads and variants
+    whose rows are not committed yet are never removed. Leftovers
+    usually come from uploads replaced before content addressing, from
+    interrupted writes, or from requests racing a delete of a shared
+    file.
+    """
+
+    help = "Delete unreferenced files from the upload directories."
+    directories = ["offer_images", "profile_images"]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the files that would be deleted.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=float,
+            default=24,
+            help="Minimum age in hours of deleted files.",
+        )
+
+    def handle(self, *args, **options):
+        referenced = self.get_referenced_names()
+        cutoff = timezone.now() - timedelta(hours=options["min_age"])
+
+        stale = [
+            name
+            for name in self.iter_stored_names()
+            if name not in referenced
+            and default_storage.get_modified_time(name) < cutoff
+        ]
+        for name in stale:
+            if options["dry_run"]:
+                self.stdout.write(name)
+            else:
+                default_storage.delete(name)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{len(stale)} file(s) would be deleted.")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"{len(stale)} file(s) deleted.")
+            )
+
+    def get_referenced_names(self):
+        """Return the names of all files models still point at."""
+        referenced = set()
+        for model, field_name in iter_file_references():
+            referenced.update(
+                model._default_manager.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .values_list(field_name, flat=True)
+            )
+        for variants in OfferPackage.objects.filter(
+            image_variants__isnull=False
+        ).values_list("image_variants", flat=True):
+            referenced.update(variants["files"].values())
+        return referenced
+
+    def iter_stored_names(self):
+        """Yield the names of all files in the upload directories."""
+        pending = list(self.directories)
+        while pending:
+            directory = pending.pop()
+            if not default_storage.exists(directory):
+                continue
+            subdirectories, files = default_storage.listdir(directory)
+            pending.extend(
+                f"{directory}/{subdirectory}"
+                for subdirectory in subdirectories
+            )
+            for file_name in files:
+                yield f"{directory}/{file_name}"
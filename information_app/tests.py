@@ -1,7 +1,16 @@
+from io import StringIO
+import os
+import time
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 
 from core.test_factory.data import APITestCaseWithSetup
+from core.test_factory.media import TemporaryMediaMixin, create_image_file
 from information_app.api.helpers import (
     get_average_rating,
     get_business_profile_count,
@@ -42,3 +51,173 @@ class TestOfferPackageViewSet(APITestCaseWithSetup):
         url = reverse("base-info")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_runtime_stats_staff_only(self):
+        url = reverse("runtime-stats")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(user=self.business_user_1)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_benchmark_indexes_leaves_database_unchanged(self):
+        offer_count = get_offer_count()
+        out = StringIO()
+
+        call_command("benchmark_indexes", rows=30, repeat=1, stdout=out)
+
+        self.assertIn("orders: completed count", out.getvalue())
+        self.assertEqual(get_offer_count(), offer_count)
+
+    def test_benchmark_projections_runs(self):
+        out = StringIO()
+
+        call_command("benchmark_projections", rows=30, repeat=1, stdout=out)
+
+        self.assertIn("offers list (page_size=10)", out.getvalue())
+
+    def test_benchmark_offer_writes_leaves_database_unchanged(self):
+        offer_count = get_offer_count()
+        out = StringIO()
+
+        call_command("benchmark_offer_writes", repeat=1, stdout=out)
+
+        self.assertIn("update package", out.getvalue())
+        self.assertEqual(get_offer_count(), offer_count)
+
+    def test_benchmark_registration_deletes_its_users(self):
+        user_count = User.objects.count()
+        out = StringIO()
+
+        call_command("benchmark_registration", users=3, threads=1, stdout=out)
+
+        self.assertIn("atomic", out.getvalue())
+        self.assertEqual(User.objects.count(), user_count)
+
+
+class TestMedia(TemporaryMediaMixin, APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.offer_package_1.image = create_image_file()
+        self.offer_package_1.save()
+
+    def get_media(self, name, **headers):
+        return self.client.get(
+            reverse("media", kwargs={"path": name}), **headers
+        )
+
+    def age(self, name, hours):
+        modified = time.time() - hours * 60 * 60
+        os.utime(default_storage.path(name), (modified, modified))
+
+    def test_content_addressed_media_immutable(self):
+        response = self.get_media(self.offer_package_1.image.name)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Cache-Control"],
+            "public, max-age=31536000, immutable",
+        )
+
+    def test_other_media_revalidated(self):
+        name = default_storage.save(
+            "offer_images/legacy.png", ContentFile(b"x")
+        )
+
+        response = self.get_media(name)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+        response = self.get_media(
+            name, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_missing_media_not_found(self):
+        hidden = default_storage.save(
+            "offer_images/.upload.tmp", ContentFile(b"x")
+        )
+        for name in ["offer_images/missing.png", hidden, "../settings.py"]:
+            with self.subTest(name=name):
+                response = self.get_media(name)
+                self.assertEqual(
+                    response.status_code, status.HTTP_404_NOT_FOUND
+                )
+
+    def test_media_byte_ranges(self):
+        name = default_storage.save(
+            "offer_images/range.bin", ContentFile(bytes(range(100)))
+        )
+        for range_header, content_range, content in [
+            ("bytes=10-19", "bytes 10-19/100", bytes(range(10, 20))),
+            ("bytes=90-", "bytes 90-99/100", bytes(range(90, 100))),
+            ("bytes=-5", "bytes 95-99/100", bytes(range(95, 100))),
+            ("bytes=95-500", "bytes 95-99/100", bytes(range(95, 100))),
+        ]:
+            with self.subTest(range=range_header):
+                response = self.get_media(name, HTTP_RANGE=range_header)
+                self.assertEqual(
+                    response.status_code, status.HTTP_206_PARTIAL_CONTENT
+                )
+                self.assertEqual(response["Content-Range"], content_range)
+                self.assertEqual(response["Content-Length"], str(len(content)))
+                self.assertEqual(b"".join(response.streaming_content), content)
+
+    def test_media_range_fallbacks(self):
+        name = default_storage.save(
+            "offer_images/range.bin", ContentFile(bytes(range(100)))
+        )
+
+        response = self.get_media(name, HTTP_RANGE="bytes=200-")
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        )
+        self.assertEqual(response["Content-Range"], "bytes */100")
+
+        response = self.get_media(
+            name,
+            HTTP_RANGE="bytes=0-9",
+            HTTP_IF_RANGE="Mon, 01 Jan 2001 00:00:00 GMT",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(len(b"".join(response.streaming_content)), 100)
+
+    def test_media_handed_off_to_front_server(self):
+        name = self.offer_package_1.image.name
+
+        with self.settings(MEDIA_SERVE_MODE="x-accel"):
+            response = self.get_media(name)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{name}"
+        )
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response.content, b"")
+
+        with self.settings(MEDIA_SERVE_MODE="x-sendfile"):
+            response = self.get_media(name)
+        self.assertEqual(response["X-Sendfile"], default_storage.path(name))
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_cleanup_media_deletes_old_unreferenced_files(self):
+        stale = default_storage.save(
+            "offer_images/offer_1_picture.png", ContentFile(b"old")
+        )
+        fresh = default_storage.save(
+            "offer_images/offer_2_picture.png", ContentFile(b"new")
+        )
+        referenced = self.offer_package_1.image.name
+        self.age(stale, 48)
+        self.age(referenced, 48)
+        out = StringIO()
+
+        call_command("cleanup_media", "--dry-run", stdout=out)
+        self.assertIn("1 file(s) would be deleted.", out.getvalue())
+        self.assertTrue(default_storage.exists(stale))
+
+        call_command("cleanup_media", stdout=out)
+        self.assertFalse(default_storage.exists(stale))
+        self.assertTrue(default_storage.exists(fresh))
+        self.assertTrue(default_storage.exists(referenced))
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db import transaction
 
 from offers_app.models import Offer, OfferPackage
 
@@ -61,6 +62,16 @@ class OfferPackageAdmin(admin.ModelAdmin):
     list_per_page = 25
     ordering = ["-created_at"]
 
+    def save_related(self, request, form, formsets, change):
+        """
+        Save the inline offers and refresh the package's min values.
+
+        The admin change view already runs inside a transaction, so the
+        recalculation commits together with the edited offers.
+        """
+        super().save_related(request, form, formsets, change)
+        form.instance.update_min_values()
+
     def get_min_price(self, obj):
         """
         Get the minimum price from associated offers.
@@ -71,11 +82,10 @@ class OfferPackageAdmin(admin.ModelAdmin):
         Returns:
             float or str: Minimum price or 'N/A' if no offers exist.
         """
-        prices = [offer.price for offer in obj.offers.all() if offer.price]
-        return min(prices) if prices else "N/A"
+        return obj.min_price if obj.min_price is not None else "N/A"
 
     get_min_price.short_description = "Min Price"
-    get_min_price.admin_order_field = "offers__price"
+    get_min_price.admin_order_field = "min_price"
 
     def get_min_delivery_time(self, obj):
         """
@@ -87,10 +97,12 @@ class OfferPackageAdmin(admin.ModelAdmin):
         Returns:
             int or str: Minimum delivery time in days or 'N/A' if no offers exist.
         """
-        times = [offer.delivery_time_in_days for offer in obj.offers.all()]
-        return min(times) if times else "N/A"
+        if obj.min_delivery_time is None:
+            return "N/A"
+        return obj.min_delivery_time
 
     get_min_delivery_time.short_description = "Min Delivery (days)"
+    get_min_delivery_time.admin_order_field = "min_delivery_time"
 
 
 @admin.register(Offer)
@@ -125,3 +137,38 @@ class OfferAdmin(admin.ModelAdmin):
 
     list_per_page = 25
     ordering = ["package", "offer_type"]
+
+    def save_model(self, request, obj, form, change):
+        """
+        Save the offer and refresh the min values of affected packages.
+
+        When the offer was moved to another package, the package it was
+        taken from is recalculated as well.
+        """
+        super().save_model(request, obj, form, change)
+        obj.package.update_min_values()
+
+        previous_package_id = form.initial.get("package")
+        if change and previous_package_id not in (None, obj.package_id):
+            previous_package = OfferPackage.objects.filter(
+                pk=previous_package_id
+            ).first()
+            if previous_package:
+                previous_package.update_min_values()
+
+    def delete_model(self, request, obj):
+        """Delete the offer and refresh the min values of its package."""
+        package = obj.package
+        super().delete_model(request, obj)
+        package.update_min_values()
+
+    def delete_queryset(self, request, queryset):
+        """
+        Delete the selected offers and refresh the min values of every
+        package that lost an offer.
+        """
+        with transaction.atomic():
+            package_ids = set(queryset.values_list("package_id", flat=True))
+            super().delete_queryset(request, queryset)
+            for package in OfferPackage.objects.filter(id__in=package_ids):
+                package.update_min_values()
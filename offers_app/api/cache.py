@@ -0,0 +1,170 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+LIST_CACHE_TIMEOUT = 300
+LIST_CACHE_VERSION_KEY = "offers:list:version"
+LIST_CACHE_HITS_KEY = "offers:list:hits"
+LIST_CACHE_MISSES_KEY = "offers:list:misses"
+LIST_CACHE_REQUEST_PARAMS = ["page", "page_size", "pagination", "cursor"]
+FACETS_CACHE_HITS_KEY = "offers:facets:hits"
+FACETS_CACHE_MISSES_KEY = "offers:facets:misses"
+
+
+def get_list_cache_version():
+    """
+    Return the current version of the cached offer lists.
+
+    The version is a nanosecond timestamp taken when the cached lists
+    were last invalidated. It is part of every list cache key, so bumping
+    it makes all cached lists unreachable at once.
+    """
+    version = cache.get(LIST_CACHE_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(LIST_CACHE_VERSION_KEY, version, timeout=None):
+            version = cache.get(LIST_CACHE_VERSION_KEY, version)
+    return version
+
+
+def bump_list_cache_version():
+    """Move the cached offer lists to a new version."""
+    version = max(time.time_ns(), get_list_cache_version() + 1)
+    cache.set(LIST_CACHE_VERSION_KEY, version, timeout=None)
+
+
+def invalidate_offer_list_cache():
+    """
+    Invalidate all cached offer lists.
+
+    The version is bumped immediately and once more when the surrounding
+    transaction commits. The second bump drops lists that concurrent
+    requests cached from data read before the commit.
+    """
+    bump_list_cache_version()
+    transaction.on_commit(bump_list_cache_version)
+
+
+def build_list_cache_key(request, query_param_values, version=None):
+    """
+    Build the cache key of an offer list response.
+
+    Args:
+        request: The request for the list.
+        query_param_values (dict): Filter parameters after
+            validate_and_cast_query_params, so equivalent spellings of
+            a value share one key.
+        version (int, optional): List cache version to build the key
+            for. Defaults to the current version.
+
+    Returns:
+        str: Cache key containing the current list cache version.
+    """
+    params = dict(query_param_values)
+    for param in LIST_CACHE_REQUEST_PARAMS:
+        params[param] = request.query_params.get(param)
+    # Pagination links are absolute, so the origin is part of the key.
+    params["origin"] = request.build_absolute_uri("/")
+
+    if version is None:
+        version = get_list_cache_version()
+    normalized = json.dumps(params, sort_keys=True, default=str)
+    digest = hashlib.sha256(normalized.encode()).hexdigest()
+    return f"offers:list:{version}:{digest}"
+
+
+def build_facets_cache_key(query_param_values, version=None):
+    """
+    Build the cache key of an offer facets response.
+
+    Facets share the version of the list cache and are invalidated
+    together with the lists.
+
+    Args:
+        query_param_values (dict): Filter parameters after
+            validate_and_cast_query_params.
+        version (int, optional): List cache version to build the key
+            for. Defaults to the current version.
+
+    Returns:
+        str: Cache key containing the current list cache version.
+    """
+    params = dict(query_param_values)
+    # The ordering does not change any count.
+    params.pop("ordering", None)
+
+    if version is None:
+        version = get_list_cache_version()
+    normalized = json.dumps(params, sort_keys=True, default=str)
+    digest = hashlib.sha256(normalized.encode()).hexdigest()
+    return f"offers:facets:{version}:{digest}"
+
+
+def get_cached_list(key):
+    """Return the cached list data for the key and count a hit or miss."""
+    return _get_counted(key, LIST_CACHE_HITS_KEY, LIST_CACHE_MISSES_KEY)
+
+
+def set_cached_list(key, data):
+    """Store list data under the key."""
+    cache.set(key, data, timeout=LIST_CACHE_TIMEOUT)
+
+
+def get_cached_facets(key):
+    """Return the cached facets for the key and count a hit or miss."""
+    return _get_counted(key, FACETS_CACHE_HITS_KEY, FACETS_CACHE_MISSES_KEY)
+
+
+def set_cached_facets(key, data):
+    """Store facets under the key."""
+    cache.set(key, data, timeout=LIST_CACHE_TIMEOUT)
+
+
+def get_list_cache_stats():
+    """
+    Return hit and miss counters of the offer list cache.
+
+    Returns:
+        dict: Number of hits and misses and the resulting hit rate, or
+            None for the hit rate while no request has been counted.
+    """
+    return _get_stats(LIST_CACHE_HITS_KEY, LIST_CACHE_MISSES_KEY)
+
+
+def get_facets_cache_stats():
+    """Return hit and miss counters of the offer facets cache."""
+    return _get_stats(FACETS_CACHE_HITS_KEY, FACETS_CACHE_MISSES_KEY)
+
+
+def _get_counted(key, hits_key, misses_key):
+    """Return the cached value for the key and count a hit or miss."""
+    data = cache.get(key)
+    if data is None:
+        _increment(misses_key)
+    else:
+        _increment(hits_key)
+    return data
+
+
+def _get_stats(hits_key, misses_key):
+    """Return the hit and miss counters stored under the given keys."""
+    hits = cache.get(hits_key, 0)
+    misses = cache.get(misses_key, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else None,
+    }
+
+
+def _increment(key):
+    """Increment a counter in the cache, creating it if needed."""
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
@@ -0,0 +1,83 @@
+from django.db.models import Count, Q
+
+PRICE_BANDS = [(0, 50), (50, 100), (100, 250), (250, 500), (500, None)]
+DELIVERY_TIME_LIMITS = [1, 3, 7, 14, 30]
+CREATOR_FACET_LIMIT = 20
+
+
+def get_price_band_condition(low, high):
+    """Return the condition of a price band, including low, excluding high."""
+    condition = Q(min_price__gte=low)
+    if high is not None:
+        condition &= Q(min_price__lt=high)
+    return condition
+
+
+def compute_facets(queryset):
+    """
+    Count the packages of a filtered queryset per facet bucket.
+
+    Everything is computed with one grouped query: the packages are
+    grouped by creator and every bucket is a conditional count per group.
+    The price and delivery time buckets are the sums over all creators.
+
+    Price bands are disjoint ranges of min_price. Delivery time buckets
+    are cumulative and count the packages matching max_delivery_time set
+    to the bucket's limit. Packages without offers have no min values
+    and fall into no band.
+
+    Args:
+        queryset: OfferPackage queryset with the list filters applied.
+
+    Returns:
+        dict: The total count, the price and delivery time buckets and
+            the creators with the most packages, at most
+            CREATOR_FACET_LIMIT, ordered by count.
+    """
+    annotations = {
+        f"price_{index}": Count(
+            "id", filter=get_price_band_condition(low, high)
+        )
+        for index, (low, high) in enumerate(PRICE_BANDS)
+    }
+    annotations.update(
+        {
+            f"delivery_{days}": Count(
+                "id", filter=Q(min_delivery_time__lte=days)
+            )
+            for days in DELIVERY_TIME_LIMITS
+        }
+    )
+    rows = list(
+        queryset.order_by()
+        .values("user_id", "user__username")
+        .annotate(package_count=Count("id"), **annotations)
+        .order_by("-package_count", "user_id")
+    )
+
+    return {
+        "count": sum(row["package_count"] for row in rows),
+        "price": [
+            {
+                "min": low,
+                "max": high,
+                "count": sum(row[f"price_{index}"] for row in rows),
+            }
+            for index, (low, high) in enumerate(PRICE_BANDS)
+        ],
+        "delivery_time": [
+            {
+                "max": days,
+                "count": sum(row[f"delivery_{days}"] for row in rows),
+            }
+            for days in DELIVERY_TIME_LIMITS
+        ],
+        "creators": [
+            {
+                "creator_id": row["user_id"],
+                "username": row["user__username"],
+                "count": row["package_count"],
+            }
+            for row in rows[:CREATOR_FACET_LIMIT]
+        ],
+    }
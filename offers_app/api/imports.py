@@ -0,0 +1,182 @@
+import json
+from itertools import islice
+
+from django.db import DatabaseError, transaction
+from rest_framework.exceptions import APIException
+
+from offers_app.api.cache import invalidate_offer_list_cache
+from offers_app.api.serializers import CreateOfferPackageSerializer
+from offers_app.models import Offer, OfferPackage
+from offers_app.suggest import mark_suggest_index_stale
+
+IMPORT_CHUNK_SIZE = 100
+IMPORT_MAX_LINE_SIZE = 64 * 1024
+
+
+class LengthRequired(APIException):
+    """Raised for uploads whose body cannot be read to its end."""
+
+    status_code = 411
+    default_detail = "Content-Length is required for this upload."
+    default_code = "length_required"
+
+
+def get_upload_stream(request):
+    """
+    Return the binary stream of a request body for line-wise reading.
+
+    DRF's request.stream is None whenever Content-Length is missing,
+    which a chunked upload would silently turn into an empty body. Such
+    bodies are read from the WSGI input if the server marks it as
+    terminated (e.g. gunicorn after decoding the chunks) and rejected
+    otherwise.
+
+    Args:
+        request: The DRF request of the upload.
+
+    Returns:
+        File-like object with readline.
+
+    Raises:
+        LengthRequired: If the body has no length and the server does
+            not terminate the input.
+    """
+    django_request = request._request
+    if django_request.META.get("CONTENT_LENGTH"):
+        return django_request
+    if django_request.META.get("wsgi.input_terminated"):
+        return django_request.META["wsgi.input"]
+    raise LengthRequired()
+
+
+def iter_ndjson_records(stream, max_line_size=IMPORT_MAX_LINE_SIZE):
+    """
+    Read NDJSON records from a binary stream one line at a time.
+
+    At most max_line_size bytes of a line are held in memory; longer
+    lines are skipped up to their end and reported as invalid. Blank
+    lines are ignored but counted, so line numbers match the upload.
+
+    Args:
+        stream: File-like object with readline, e.g. the one returned by
+            get_upload_stream, or None for an empty body.
+        max_line_size (int): Maximum size of one record in bytes.
+
+    Yields:
+        tuple: The line number and either the decoded record or None,
+            and an error message or None.
+    """
+    if stream is None:
+        return
+
+    line_number = 0
+    while True:
+        line = stream.readline(max_line_size + 1)
+        if not line:
+            return
+        line_number += 1
+
+        if len(line) > max_line_size and not line.endswith(b"\n"):
+            while line and not line.endswith(b"\n"):
+                line = stream.readline(max_line_size + 1)
+            yield line_number, None, "Record is too large."
+            continue
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, "Invalid JSON."
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Record must be a JSON object."
+            continue
+        yield line_number, record, None
+
+
+def import_offer_packages(records, context, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Validate and create offer packages chunk by chunk.
+
+    Every record is validated by CreateOfferPackageSerializer. The valid
+    records of a chunk are written in one transaction with one bulk
+    INSERT for the packages and one for their offers; invalid records
+    are reported and skipped. Only one chunk is held in memory at a time.
+
+    Args:
+        records: Iterable of (line number, record, error) tuples as
+            yielded by iter_ndjson_records.
+        context (dict): Serializer context including the request.
+        chunk_size (int): Records validated and committed together.
+
+    Yields:
+        dict: One result per record with its line number, the status
+            'created', 'invalid' or 'failed', and the id of the created
+            package or the errors.
+    """
+    records = iter(records)
+    while chunk := list(islice(records, chunk_size)):
+        results = []
+        valid = []
+        for line_number, record, error in chunk:
+            if error is not None:
+                results.append(_invalid(line_number, [error]))
+                continue
+            serializer = CreateOfferPackageSerializer(
+                data=record, context=context
+            )
+            if serializer.is_valid():
+                valid.append((line_number, serializer))
+                results.append(None)
+            else:
+                results.append(_invalid(line_number, serializer.errors))
+
+        created = _create_chunk(valid)
+        for result in results:
+            yield result if result is not None else next(created)
+
+
+def _create_chunk(valid):
+    """
+    Write the validated records of one chunk in one transaction.
+
+    Returns:
+        iterator: One result per record, in the order of valid.
+    """
+    if not valid:
+        return iter(())
+
+    packages = []
+    offers = []
+    for _, serializer in valid:
+        package, package_offers = serializer.build(serializer.validated_data)
+        packages.append(package)
+        offers.extend(package_offers)
+
+    try:
+        with transaction.atomic():
+            OfferPackage.objects.bulk_create(packages)
+            Offer.objects.bulk_create(offers)
+            # Bulk inserts send no post_save signals.
+            invalidate_offer_list_cache()
+            mark_suggest_index_stale()
+    except DatabaseError:
+        return iter(
+            {
+                "line": line_number,
+                "status": "failed",
+                "errors": ["The record could not be saved."],
+            }
+            for line_number, _ in valid
+        )
+
+    return iter(
+        {"line": line_number, "status": "created", "id": package.pk}
+        for (line_number, _), package in zip(valid, packages)
+    )
+
+
+def _invalid(line_number, errors):
+    """Return the result of a record that failed validation."""
+    return {"line": line_number, "status": "invalid", "errors": errors}
@@ -1,4 +1,10 @@
-from rest_framework.pagination import PageNumberPagination
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    PageNumberPagination,
+)
 
 
 class OfferPackageSetPagination(PageNumberPagination):
@@ -18,3 +24,188 @@ class OfferPackageSetPagination(PageNumberPagination):
     page_size = 6
     page_size_query_param = "page_size"
     max_page_size = 10
+
+
+class OfferPackageCursorPagination(CursorPagination):
+    """
+    Keyset pagination class for offer package listings.
+
+    Opt-in alternative to OfferPackageSetPagination, selected with the
+    'pagination=cursor' query parameter. Pages are located by the
+    (ordering value, id) pair of the last item instead of an OFFSET, so
+    deep pages cost the same as the first one and no COUNT query runs.
+
+    The 'ordering' query parameter accepts the same values as
+    order_queryset. Every ordering is completed with id as a unique
+    tie-breaker, which keeps pages stable when ordering values repeat.
+
+    Attributes:
+        page_size (int): Default number of items per page (6).
+        page_size_query_param (str): Query parameter name for custom page size.
+        max_page_size (int): Maximum allowed items per page (10).
+        ordering (tuple): Default ordering (newest packages first).
+        orderings (dict): Supported 'ordering' values mapped to their
+            keyset ordering.
+    """
+
+    page_size = 6
+    page_size_query_param = "page_size"
+    max_page_size = 10
+    ordering = ("-created_at", "-id")
+    orderings = {
+        "min_price": ("min_price", "id"),
+        "-min_price": ("-min_price", "-id"),
+        "updated_at": ("updated_at", "id"),
+        "-updated_at": ("-updated_at", "-id"),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        """Return the keyset ordering for the requested 'ordering' value."""
+        term = request.query_params.get("ordering")
+        return self.orderings.get(term, self.ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return one page of the queryset located by the request's cursor.
+
+        Mirrors CursorPagination.paginate_queryset, but filters on the
+        full (value, id) key. Because the key is unique, cursor offsets
+        are never needed.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            reverse, current_position = (
+                self.cursor.reverse,
+                self.cursor.position,
+            )
+
+        descending = self.ordering[0].startswith("-") != reverse
+        queryset = queryset.order_by(*self._order_expressions(descending))
+
+        if current_position is not None:
+            queryset = queryset.filter(
+                self._after_position(current_position, descending)
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        """Return the link to the page after the last item of this page."""
+        if not self.has_next:
+            return None
+        position = self.next_position
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+        cursor = Cursor(offset=0, reverse=False, position=position)
+        return self.encode_cursor(cursor)
+
+    def get_previous_link(self):
+        """Return the link to the page before the first item of this page."""
+        if not self.has_previous:
+            return None
+        position = self.previous_position
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+        cursor = Cursor(offset=0, reverse=True, position=position)
+        return self.encode_cursor(cursor)
+
+    def decode_cursor(self, request):
+        """Decode the cursor and reject positions without a valid id."""
+        cursor = super().decode_cursor(request)
+        if cursor is not None and cursor.position is not None:
+            _, separator, pk = cursor.position.rpartition("|")
+            if not separator or not pk.isdigit():
+                raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def _get_position_from_instance(self, instance, ordering):
+        """Encode the (ordering value, id) key of an item as a string."""
+        field_name = ordering[0].lstrip("-")
+        if isinstance(instance, dict):
+            value, pk = instance[field_name], instance["id"]
+        else:
+            value, pk = getattr(instance, field_name), instance.pk
+        return f"{'' if value is None else value}|{pk}"
+
+    def _order_expressions(self, descending):
+        """
+        Build the ORDER BY expressions for the current ordering.
+
+        NULL values sort first in ascending and last in descending
+        order, which is what SQLite does by default and keeps reversed
+        pages symmetric on other backends.
+        """
+        field_name = self.ordering[0].lstrip("-")
+        if descending:
+            return (F(field_name).desc(nulls_last=True), F("id").desc())
+        return (F(field_name).asc(nulls_first=True), F("id").asc())
+
+    def _after_position(self, position, descending):
+        """
+        Return the condition selecting all rows after the given position
+        in the current ordering direction.
+        """
+        field_name = self.ordering[0].lstrip("-")
+        value, _, pk = position.rpartition("|")
+        is_null = {f"{field_name}__isnull": True}
+        not_null = {f"{field_name}__isnull": False}
+
+        if descending:
+            if value == "":
+                return Q(**is_null, id__lt=pk)
+            return (
+                Q(**{f"{field_name}__lt": value})
+                | Q(**{field_name: value}, id__lt=pk)
+                | Q(**is_null)
+            )
+
+        if value == "":
+            return Q(**is_null, id__gt=pk) | Q(**not_null)
+        return Q(**{f"{field_name}__gt": value}) | Q(
+            **{field_name: value}, id__gt=pk
+        )
@@ -0,0 +1,84 @@
+from core.projection import (
+    DateTimeField,
+    Field,
+    FileField,
+    ManyField,
+    NestedField,
+    PriceDecimalField,
+    Projection,
+    URLField,
+)
+from offers_app.image_variants import get_image_variant_urls
+from offers_app.models import Offer, OfferPackage
+
+
+class ImageVariantsField(Field):
+    """URLs of the image variants, like get_image_variants."""
+
+    def compile(self, name, context):
+        column = self.source or name
+        request = context.get("request")
+
+        def get(row):
+            return get_image_variant_urls(row[column], request)
+
+        return get
+
+
+class OfferShortURLProjection(Projection):
+    """Projection of BaseOfferSerializerShortURL."""
+
+    model = Offer
+    fields = {
+        "id": Field(),
+        "url": URLField("offer-detail", remove_prefix="/api"),
+    }
+
+
+class OfferURLProjection(Projection):
+    """Projection of BaseOfferSerializer."""
+
+    model = Offer
+    fields = {
+        "id": Field(),
+        "url": URLField("offer-detail", absolute=True),
+    }
+
+
+BASE_OFFER_PACKAGE_FIELDS = {
+    "id": Field(),
+    "user": Field(),
+    "title": Field(),
+    "image": FileField(OfferPackage),
+    "description": Field(),
+    "created_at": DateTimeField(),
+    "updated_at": DateTimeField(),
+    "min_price": PriceDecimalField(),
+    "min_delivery_time": Field(),
+}
+
+
+class ListOfferPackageProjection(Projection):
+    """Projection of ListOfferPackageSerializer."""
+
+    model = OfferPackage
+    fields = {
+        **BASE_OFFER_PACKAGE_FIELDS,
+        "details": ManyField(OfferShortURLProjection, "package"),
+        "user_details": NestedField(
+            first_name=Field("user__first_name"),
+            last_name=Field("user__last_name"),
+            username=Field("user__username"),
+        ),
+        "image_variants": ImageVariantsField(),
+    }
+
+
+class RetrieveOfferPackageProjection(Projection):
+    """Projection of RetrieveOfferPackageSerializer."""
+
+    model = OfferPackage
+    fields = {
+        **BASE_OFFER_PACKAGE_FIELDS,
+        "details": ManyField(OfferURLProjection, "package"),
+    }
@@ -1,6 +1,14 @@
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from rest_framework.exceptions import ValidationError
 
+from offers_app.models import Offer
+from offers_app.search import (
+    PACKAGE_TABLE,
+    SEARCH_TABLE,
+    build_match_expression,
+    search_index_available,
+)
+
 QUERY_PARAM_TYPES = {
     "creator_id": int,
     "min_price": float,
@@ -8,6 +16,8 @@ QUERY_PARAM_TYPES = {
     "ordering": str,
     "search": str,
     "page_size": int,
+    "q": str,
+    "limit": int,
 }
 
 
@@ -94,17 +104,26 @@ def filter_min_price(queryset, min_price):
     """
     Filter queryset by minimum price.
 
+    Keeps packages with at least one offer priced at or above the
+    threshold. The condition is a correlated EXISTS subquery on the
+    offers' package index rather than a join, so every package appears
+    at most once without DISTINCT and the outer query stays free to use
+    its own indexes for ordering.
+
     Args:
         queryset: The Django queryset to filter.
         min_price: The minimum price threshold. If None, no filtering is applied.
 
     Returns:
         QuerySet: Filtered queryset containing only items with offers priced
-            at or above the minimum price, with duplicates removed, or the
-            original queryset if min_price is None.
+            at or above the minimum price, or the original queryset if
+            min_price is None.
     """
     if min_price is not None:
-        queryset = queryset.filter(offers__price__gte=min_price).distinct()
+        offers = Offer.objects.filter(
+            package=OuterRef("pk"), price__gte=min_price
+        )
+        queryset = queryset.filter(Exists(offers))
     return queryset
 
 
@@ -131,7 +150,12 @@ def filter_search(queryset, term):
     """
     Filter queryset by search term in description or title.
 
-    Performs case-insensitive search across description and title fields.
+    Uses the SQLite FTS5 index from offers_app.search when it is
+    available: every word of the term is matched as a prefix and the
+    results are ordered by relevance (bm25), newest first on ties. An
+    explicit ordering applied afterwards by order_queryset takes
+    precedence. Falls back to a case-insensitive substring search when
+    the index is missing or the term contains no searchable words.
 
     Args:
         queryset: The Django queryset to filter.
@@ -143,11 +167,24 @@ def filter_search(queryset, term):
             term appears in description or title, or the original queryset
             if term is None.
     """
-    if term is not None:
-        queryset = queryset.filter(
+    if term is None:
+        return queryset
+
+    match = build_match_expression(term)
+    if match is None or not search_index_available():
+        return queryset.filter(
             Q(description__icontains=term) | Q(title__icontains=term)
         )
-    return queryset
+
+    return queryset.extra(
+        select={"search_rank": f"{SEARCH_TABLE}.rank"},
+        tables=[SEARCH_TABLE],
+        where=[
+            f"{SEARCH_TABLE}.rowid = {PACKAGE_TABLE}.id",
+            f"{SEARCH_TABLE} MATCH %s",
+        ],
+        params=[match],
+    ).order_by("search_rank", "-created_at")
 
 
 def order_queryset(queryset, term):
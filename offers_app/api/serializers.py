@@ -1,27 +1,16 @@
+from django.db import transaction
 from django.urls import reverse
 from rest_framework import serializers
 from rest_framework.fields import CurrentUserDefault
 
 from auth_app.api.serializers import UserDetailsSerializer
+from core.fields import PriceField
+from offers_app.api.cache import invalidate_offer_list_cache
 from offers_app.api.helpers import validate_offer_type
+from offers_app.image_variants import get_image_variant_urls
 from offers_app.models import Offer, OfferPackage
 
 
-class PriceField(serializers.DecimalField):
-    """
-    Custom decimal field for price representation.
-
-    Converts decimal prices to integers when the value is a whole number,
-    otherwise returns as float.
-    """
-
-    def to_representation(self, value):
-        value = super().to_representation(value)
-        if value is not None and float(value) == int(float(value)):
-            return int(float(value))
-        return float(value)
-
-
 class BaseOfferSerializer(serializers.ModelSerializer):
     """
     Base serializer for offer objects.
@@ -162,21 +151,39 @@ class ListOfferPackageSerializer(BaseOfferPackageSerializer):
     """
     Serializer for listing offer packages.
 
-    Extends BaseOfferPackageSerializer with nested offer details and
-    user information for list views.
+    Extends BaseOfferPackageSerializer with nested offer details, user
+    information and the URLs of the resized image variants for list
+    views.
     """
 
     details = BaseOfferSerializerShortURL(
         many=True, source="offers", read_only=True
     )
     user_details = UserDetailsSerializer(source="user", read_only=True)
+    image_variants = serializers.SerializerMethodField()
 
     class Meta(BaseOfferPackageSerializer.Meta):
         fields = BaseOfferPackageSerializer.Meta.fields + [
             "details",
             "user_details",
+            "image_variants",
         ]
 
+    def get_image_variants(self, obj):
+        """
+        Return the URLs of the resized image variants.
+
+        Args:
+            obj (OfferPackage): The offer package instance.
+
+        Returns:
+            dict or None: Variant names mapped to URLs, or None while
+                the variants are not generated yet.
+        """
+        return get_image_variant_urls(
+            obj.image_variants, self.context.get("request")
+        )
+
 
 class RetrieveOfferPackageSerializer(BaseOfferPackageSerializer):
     """
@@ -264,16 +271,44 @@ class CreateOfferPackageSerializer(BaseCreateOrUpdateOfferPackageSerialier):
         return data
 
     def create(self, validated_data):
-        """Create an OfferPackage along with its associated Offer instances."""
-        offers_data = validated_data.pop("offers", None)
+        """
+        Create an OfferPackage along with its associated Offer instances.
 
-        offer_package = OfferPackage.objects.create(**validated_data)
+        The min values are computed from the submitted offers, so the
+        package is written with one INSERT and its offers with one bulk
+        INSERT, both in one transaction.
+        """
+        offer_package, offers = self.build(validated_data)
 
-        for offer_data in offers_data:
-            Offer.objects.create(package=offer_package, **offer_data)
+        with transaction.atomic():
+            offer_package.save()
+            Offer.objects.bulk_create(offers)
+            # bulk_create sends no post_save signals for the offers.
+            invalidate_offer_list_cache()
 
         return offer_package
 
+    def build(self, validated_data):
+        """
+        Build an unsaved OfferPackage and its offers from validated data.
+
+        The package's min values are set from the offers, so package and
+        offers can be written without further queries (see create and
+        offers_app.api.imports).
+
+        Returns:
+            tuple: The unsaved package and the list of its unsaved offers.
+        """
+        validated_data = dict(validated_data)
+        offers_data = validated_data.pop("offers", None) or []
+        offer_package = OfferPackage(**validated_data)
+        offers = [
+            Offer(package=offer_package, **offer_data)
+            for offer_data in offers_data
+        ]
+        offer_package.set_min_values(offers)
+        return offer_package, offers
+
 
 class UpdateOfferPackageSerializer(BaseCreateOrUpdateOfferPackageSerialier):
     """
@@ -291,19 +326,44 @@ class UpdateOfferPackageSerializer(BaseCreateOrUpdateOfferPackageSerialier):
         """
         Update the OfferPackage and its matching
         Offer instances by offer_type.
+
+        The existing offers are loaded once and only the values that
+        actually changed are written, with one bulk UPDATE. The package's
+        min values are recalculated from the offers in memory and saved
+        with the package itself, all in one transaction.
         """
         offer_data = validated_data.pop("offers", None)
 
-        if offer_data:
-            for updated_offer in offer_data:
-                offer_type = updated_offer.get("offer_type")
-                validate_offer_type(offer_type)
-
-                for offer in instance.offers.all():
-                    if offer.offer_type == offer_type:
-                        for key, value in updated_offer.items():
+        with transaction.atomic():
+            if offer_data:
+                offers = list(instance.offers.all())
+                offers_by_type = {offer.offer_type: offer for offer in offers}
+                changed_offers = []
+                changed_fields = set()
+
+                for updated_offer in offer_data:
+                    offer_type = updated_offer.get("offer_type")
+                    validate_offer_type(offer_type)
+
+                    offer = offers_by_type.get(offer_type)
+                    if offer is None:
+                        continue
+                    for key, value in updated_offer.items():
+                        # Compare as the model field's type, e.g. the
+                        # Decimal price against the stored float.
+                        value = Offer._meta.get_field(key).to_python(value)
+                        if getattr(offer, key) != value:
                             setattr(offer, key, value)
-                        offer.save()
-                        break
-
-        return super().update(instance, validated_data)
+                            changed_fields.add(key)
+                            if offer not in changed_offers:
+                                changed_offers.append(offer)
+
+                if changed_offers:
+                    Offer.objects.bulk_update(
+                        changed_offers, sorted(changed_fields)
+                    )
+                    # bulk_update sends no post_save signals.
+                    invalidate_offer_list_cache()
+                instance.set_min_values(offers)
+
+            return super().update(instance, validated_data)
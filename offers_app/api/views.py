@@ -1,15 +1,50 @@
-from django.db.models import Min
+import json
+
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import RetrieveAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
 from auth_app.api.permissions import (
     IsBusinessUser,
 )
+from core.conditional import (
+    get_lookup_value,
+    get_not_modified_response,
+    make_data_digest,
+    make_etag,
+    set_validator_headers,
+)
+from core.pagination import CursorOptInMixin
+from core.projection import ProjectionMixin
+from offers_app.api.cache import (
+    build_facets_cache_key,
+    build_list_cache_key,
+    get_cached_facets,
+    get_cached_list,
+    set_cached_facets,
+    set_cached_list,
+)
+from offers_app.api.facets import compute_facets
+from offers_app.api.imports import (
+    get_upload_stream,
+    import_offer_packages,
+    iter_ndjson_records,
+)
 from offers_app.api.pagination import (
+    OfferPackageCursorPagination,
     OfferPackageSetPagination,
 )
 from offers_app.api.permissions import IsOfferOwner
+from offers_app.api.projections import (
+    ListOfferPackageProjection,
+    RetrieveOfferPackageProjection,
+)
 from offers_app.api.query import (
     filter_creator,
     filter_max_delivery_time,
@@ -27,6 +62,12 @@ from offers_app.api.serializers import (
     UpdateOfferPackageSerializer,
 )
 from offers_app.models import Offer, OfferPackage
+from offers_app.suggest import (
+    SUGGEST_LIMIT,
+    SUGGEST_MAX_LIMIT,
+    SUGGEST_MAX_QUERY_LENGTH,
+    get_suggest_index,
+)
 
 
 class OfferDetailView(RetrieveAPIView):
@@ -41,8 +82,30 @@ class OfferDetailView(RetrieveAPIView):
     queryset = Offer.objects.all()
     serializer_class = RetrieveOfferSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return the offer, or 304 if the client's copy is still current.
 
-class OffersViewSet(ModelViewSet):
+        Offers have no timestamp of their own. Every write path of an
+        offer (API and admin) recalculates the min values of its package
+        and thereby updates the package's updated_at, which therefore
+        serves as the offer's modification time.
+        """
+        updated_at = get_lookup_value(
+            self, Offer.objects.values_list("package__updated_at", flat=True)
+        )
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = make_etag(request, "offer", self.kwargs["pk"], updated_at)
+        response = get_not_modified_response(request, etag, updated_at)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+            set_validator_headers(response, etag, updated_at)
+        return response
+
+
+class OffersViewSet(CursorOptInMixin, ProjectionMixin, ModelViewSet):
     """
     ViewSet for managing offer packages.
 
@@ -56,30 +119,59 @@ class OffersViewSet(ModelViewSet):
         - search: Search in title and description fields.
         - ordering: Order by 'min_price' or 'updated_at'.
         - page_size: Amount of items per page.
+        - pagination: 'cursor' switches the list to keyset pagination.
+
+    List and retrieve are rendered by projections (see core.projection),
+    which produce the serializers' output without model instances. The
+    facets action counts the filtered packages per price band, delivery
+    time and creator, and the import action creates packages in bulk.
     """
 
     pagination_class = OfferPackageSetPagination
+    cursor_pagination_class = OfferPackageCursorPagination
+    projection_classes = {
+        "list": ListOfferPackageProjection,
+        "retrieve": RetrieveOfferPackageProjection,
+    }
+
+    def get_filter_values(self):
+        """
+        Return the validated filter values of the current request.
+
+        The values are parsed once per request and shared by
+        get_queryset and the list cache key.
+        """
+        if not hasattr(self, "_filter_values"):
+            query_params = [
+                "creator_id",
+                "min_price",
+                "max_delivery_time",
+                "search",
+                "ordering",
+            ]
+            query_param_values = get_query_param_values(
+                self.request, query_params
+            )
+            self._filter_values = validate_and_cast_query_params(
+                query_param_values
+            )
+        return self._filter_values
 
     def get_queryset(self):
         """
-        Return filtered, annotated, and ordered queryset based on
-        query parameters.
+        Return filtered and ordered queryset based on query parameters.
+
+        min_price and min_delivery_time are stored on OfferPackage, so
+        filtering and ordering by them needs no aggregation. Read actions
+        load the owning user and the offers (ordered by id) up front,
+        which keeps the number of queries independent of the page size.
         """
         queryset = OfferPackage.objects.all().order_by("-created_at")
-        queryset = queryset.annotate(
-            min_delivery_time=Min("offers__delivery_time_in_days"),
-            min_price=Min("offers__price"),
-        )
-        queryset = queryset.annotate(min_price=Min("offers__price"))
-        query_params = [
-            "creator_id",
-            "min_price",
-            "max_delivery_time",
-            "search",
-            "ordering",
-        ]
-        query_param_values = get_query_param_values(self.request, query_params)
-        query_param_values = validate_and_cast_query_params(query_param_values)
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.select_related("user").prefetch_related(
+                Prefetch("offers", queryset=Offer.objects.order_by("id"))
+            )
+        query_param_values = self.get_filter_values()
         queryset = filter_creator(queryset, query_param_values["creator_id"])
         queryset = filter_min_price(queryset, query_param_values["min_price"])
         queryset = filter_max_delivery_time(
@@ -89,14 +181,150 @@ class OffersViewSet(ModelViewSet):
         queryset = order_queryset(queryset, query_param_values["ordering"])
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        """
+        Return the offer list, served from the list cache when possible.
+
+        The list is the same for every user, so responses are cached
+        under the normalized filter and pagination parameters. Writes to
+        packages, offers and their owners invalidate the cache (see
+        offers_app.signals). The X-Cache header reports HIT or MISS.
+
+        The ETag is a digest of the list data, cached together with it,
+        so a tag always stands for one body, even when worker processes
+        with separate caches serve different versions. Conditional
+        requests for a cached list are answered with 304 without reading
+        the database.
+        """
+        key = build_list_cache_key(request, self.get_filter_values())
+        cached = get_cached_list(key)
+        if cached is not None:
+            etag = make_etag(request, cached["digest"])
+            response = get_not_modified_response(request, etag)
+            if response is None:
+                response = Response(cached["data"])
+            response["X-Cache"] = "HIT"
+            return set_validator_headers(response, etag)
+
+        response = super().list(request, *args, **kwargs)
+        response["X-Cache"] = "MISS"
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        digest = make_data_digest(response.data)
+        set_cached_list(key, {"data": response.data, "digest": digest})
+        etag = make_etag(request, digest)
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified is not None:
+            not_modified["X-Cache"] = "MISS"
+            return not_modified
+        return set_validator_headers(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return the package, or 304 if the client's copy is still current.
+
+        Offer writes update the package's updated_at (see
+        OfferPackage.update_min_values), so it covers the nested offers.
+        """
+        updated_at = get_lookup_value(
+            self, OfferPackage.objects.values_list("updated_at", flat=True)
+        )
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = make_etag(request, "package", self.kwargs["pk"], updated_at)
+        response = get_not_modified_response(request, etag, updated_at)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+            set_validator_headers(response, etag, updated_at)
+        return response
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request, *args, **kwargs):
+        """
+        Return bucketed counts of the packages matching the filters.
+
+        Accepts the list filters and counts the matching packages in one
+        aggregate query (see offers_app.api.facets). Results are cached
+        under the list cache version, so they are invalidated together
+        with the offer lists. The X-Cache header reports HIT or MISS.
+        """
+        key = build_facets_cache_key(self.get_filter_values())
+        data = get_cached_facets(key)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        data = compute_facets(self.get_queryset())
+        set_cached_facets(key, data)
+        response = Response(data)
+        response["X-Cache"] = "MISS"
+        return response
+
+    @action(detail=False, methods=["get"])
+    def suggest(self, request, *args, **kwargs):
+        """
+        Return autocomplete suggestions for the search box.
+
+        Matches 'q' against the prefixes of package titles and offer
+        features in the in-memory index of offers_app.suggest, tolerating
+        one typo. Warm requests answer without a database query; the
+        index is rebuilt in the background after packages or offers
+        changed. 'limit' caps the number of suggestions.
+
+        Raises:
+            ValidationError: If 'q' is longer than
+                SUGGEST_MAX_QUERY_LENGTH characters.
+        """
+        values = validate_and_cast_query_params(
+            get_query_param_values(request, ["q", "limit"])
+        )
+        limit = values["limit"] or SUGGEST_LIMIT
+        limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+        query = values["q"] or ""
+        if len(query) > SUGGEST_MAX_QUERY_LENGTH:
+            raise ValidationError(
+                {
+                    "q": (
+                        f"At most {SUGGEST_MAX_QUERY_LENGTH} characters "
+                        "are allowed."
+                    )
+                }
+            )
+        suggestions = get_suggest_index().search(query, limit)
+        return Response({"q": query, "suggestions": suggestions})
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_packages(self, request, *args, **kwargs):
+        """
+        Create offer packages from an NDJSON upload.
+
+        The body holds one package per line in the format of the create
+        endpoint. Records are read from the request body (see
+        offers_app.api.imports.get_upload_stream) and validated
+        and committed in chunks while the response is streamed, so memory
+        stays bounded regardless of the upload size. The response is
+        NDJSON with one result per record (see
+        offers_app.api.imports.import_offer_packages).
+        """
+        results = import_offer_packages(
+            iter_ndjson_records(get_upload_stream(request)),
+            self.get_serializer_context(),
+        )
+        return StreamingHttpResponse(
+            (json.dumps(result) + "\n" for result in results),
+            content_type="application/x-ndjson",
+        )
+
     def get_permissions(self):
         """Return permissions based on the current action."""
         if self.action == "retrieve":
             return [IsAuthenticated()]
-        if self.action == "list":
+        if self.action in ("list", "facets", "suggest"):
             return [AllowAny()]
 
-        if self.action == "create":
+        if self.action in ("create", "import_packages"):
             return [IsAuthenticated(), IsBusinessUser()]
 
         if self.action == "partial_update":
@@ -1,5 +1,40 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
 
 
 class OffersAppConfig(AppConfig):
     name = "offers_app"
+
+    def ready(self):
+        """Connect the signal handlers of the offers app."""
+        from django.contrib.auth.models import User
+
+        from offers_app.models import Offer, OfferPackage
+        from offers_app.signals import (
+            delete_image_variants_of_package,
+            ensure_search_index,
+            invalidate_list_cache_on_offer_change,
+            invalidate_list_cache_on_user_change,
+            mark_suggest_index_stale_on_offer_change,
+            refresh_image_variants,
+        )
+
+        post_migrate.connect(ensure_search_index, sender=self)
+        for model in (OfferPackage, Offer):
+            post_save.connect(
+                invalidate_list_cache_on_offer_change, sender=model
+            )
+            post_delete.connect(
+                invalidate_list_cache_on_offer_change, sender=model
+            )
+            post_save.connect(
+                mark_suggest_index_stale_on_offer_change, sender=model
+            )
+            post_delete.connect(
+                mark_suggest_index_stale_on_offer_change, sender=model
+            )
+        post_save.connect(invalidate_list_cache_on_user_change, sender=User)
+        post_save.connect(refresh_image_variants, sender=OfferPackage)
+        post_delete.connect(
+            delete_image_variants_of_package, sender=OfferPackage
+        )
@@ -1,9 +1,11 @@
-import os
-
-from django.utils.text import slugify
+from core.storage import content_hash_path
 
 
 def offers_image_upload_path(instance, filename):
-    ext = os.path.splitext(filename)[1]
-    id = slugify(instance.id)
-    return f"offer_images/offer_{id}_picture{ext}"
+    """
+    Return the content-addressed storage name of an offer image.
+
+    Equal images share one file and a replaced image gets a new URL (see
+    core.storage).
+    """
+    return content_hash_path("offer_images", instance.image, filename)
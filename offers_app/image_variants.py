@@ -0,0 +1,200 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps, features
+
+from core.storage import is_content_addressed
+from offers_app.api.cache import invalidate_offer_list_cache
+from offers_app.models import OfferPackage
+
+IMAGE_VARIANT_SIZES = {
+    "thumbnail": (320, 320),
+    "card": (800, 800),
+}
+IMAGE_VARIANT_FORMATS = {
+    "webp": {"format": "WEBP", "quality": 80},
+    "avif": {"format": "AVIF", "quality": 60},
+}
+IMAGE_VARIANT_DIRECTORY = "offer_images/variants"
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Return the worker pool generating image variants.
+
+    The pool is created on first use with IMAGE_VARIANT_WORKERS threads.
+    Pillow releases the GIL while resizing and encoding, so the threads
+    run in parallel to the request threads.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "IMAGE_VARIANT_WORKERS", 2),
+                thread_name_prefix="image-variants",
+            )
+    return _executor
+
+
+def get_available_formats():
+    """Return the variant formats supported by the installed Pillow."""
+    return {
+        name: options
+        for name, options in IMAGE_VARIANT_FORMATS.items()
+        if features.check(name)
+    }
+
+
+def schedule_image_variants(package):
+    """
+    Generate the image variants of a package once the transaction commits.
+
+    Args:
+        package (OfferPackage): Package whose current image is resized.
+    """
+    image_name = package.image.name
+    transaction.on_commit(
+        lambda: get_executor().submit(_run_in_worker, package.pk, image_name)
+    )
+
+
+def generate_image_variants(package_id, image_name):
+    """
+    Write resized WebP/AVIF variants of a package image.
+
+    Every size of IMAGE_VARIANT_SIZES is stored in every available
+    format of IMAGE_VARIANT_FORMATS, keeping the aspect ratio. Variants
+    are named after the image, so packages sharing a content-addressed
+    image (see core.storage) share its variants, and variants that
+    already exist are not encoded again. The variant paths are saved on
+    the package only if its image is still the one that was resized, so
+    a newer upload is never overwritten with variants of an older one.
+
+    Args:
+        package_id (int): Primary key of the package.
+        image_name (str): Storage name of the image to resize.
+
+    Returns:
+        dict or None: The saved variants, or None if the image changed
+            in the meantime.
+    """
+    storage = OfferPackage._meta.get_field("image").storage
+    stem = os.path.splitext(os.path.basename(image_name))[0]
+    image = None
+
+    files = {}
+    for size_name, size in IMAGE_VARIANT_SIZES.items():
+        resized = None
+        for format_name, options in get_available_formats().items():
+            name = (
+                f"{IMAGE_VARIANT_DIRECTORY}/{stem}_{size_name}.{format_name}"
+            )
+            if is_content_addressed(name) and storage.exists(name):
+                files[f"{size_name}_{format_name}"] = name
+                continue
+            if image is None:
+                image = _open_image(storage, image_name)
+            if resized is None:
+                resized = _resize(image, size)
+            buffer = io.BytesIO()
+            resized.save(buffer, **options)
+            files[f"{size_name}_{format_name}"] = storage.save(
+                name, ContentFile(buffer.getvalue())
+            )
+
+    variants = {"source": image_name, "files": files}
+    packages = OfferPackage.objects.filter(pk=package_id, image=image_name)
+    previous = packages.values_list("image_variants", flat=True).first()
+    if not packages.update(image_variants=variants):
+        delete_image_variants(variants)
+        return None
+    delete_image_variants(previous)
+    # update() sends no post_save signal.
+    invalidate_offer_list_cache()
+    return variants
+
+
+def get_image_variant_urls(variants, request=None):
+    """
+    Return the URLs of stored image variants.
+
+    Args:
+        variants (dict): The image_variants of a package, or None.
+        request (optional): Request used to build absolute URLs, like
+            DRF's FileField does.
+
+    Returns:
+        dict or None: Variant names (e.g. 'thumbnail_webp') mapped to
+            URLs, or None while no variants exist.
+    """
+    if not variants:
+        return None
+    storage = OfferPackage._meta.get_field("image").storage
+    urls = {}
+    for name, file_name in variants["files"].items():
+        url = storage.url(file_name)
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        urls[name] = url
+    return urls
+
+
+def delete_image_variants(variants):
+    """
+    Delete the files of stored image variants, if there are any.
+
+    Variants are kept while any package still has their source image,
+    because packages with the same image share them.
+    """
+    if not variants:
+        return
+    if OfferPackage.objects.filter(image=variants["source"]).exists():
+        return
+    storage = OfferPackage._meta.get_field("image").storage
+    for name in variants.get("files", {}).values():
+        storage.delete(name)
+
+
+def _open_image(storage, image_name):
+    """Load an image from the storage, rotated by its EXIF orientation."""
+    with storage.open(image_name, "rb") as image_file:
+        image = ImageOps.exif_transpose(Image.open(image_file))
+        image.load()
+    return image
+
+
+def _resize(image, size):
+    """Return a copy of the image fitted into size."""
+    resized = image.copy()
+    resized.thumbnail(size, Image.Resampling.LANCZOS)
+    if resized.mode not in ("RGB", "RGBA"):
+        resized = resized.convert("RGBA")
+    return resized
+
+
+def _run_in_worker(package_id, image_name):
+    """Generate variants in a pool thread with its own DB connection."""
+    try:
+        generate_image_variants(package_id, image_name)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        # Unreadable or oversized images keep their variants unset and
+        # are served in their original form.
+        logger.warning(
+            "Could not generate image variants of package %s from %s.",
+            package_id,
+            image_name,
+            exc_info=True,
+        )
+    finally:
+        connections.close_all()
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Min, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from offers_app.api.cache import invalidate_offer_list_cache
+from offers_app.models import Offer, OfferPackage
+
+
+class Command(BaseCommand):
+    """
+    Backfill or repair the denormalized min values of offer packages.
+
+    Compares OfferPackage.min_price and OfferPackage.min_delivery_time
+    with the aggregates of the package's offers and rewrites every row
+    that has drifted. Also used to backfill rows created before the
+    columns existed.
+    """
+
+    help = "Recalculate min_price and min_delivery_time of offer packages."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the number of drifted packages.",
+        )
+
+    def handle(self, *args, **options):
+        offers = (
+            Offer.objects.filter(package=OuterRef("pk"))
+            .order_by()
+            .values("package")
+        )
+        expected_price = Subquery(
+            offers.annotate(value=Min("price")).values("value")
+        )
+        expected_delivery_time = Subquery(
+            offers.annotate(value=Min("delivery_time_in_days")).values("value")
+        )
+
+        # NULL never compares equal, so both sides are coalesced to a
+        # sentinel that cannot occur in real data.
+        drifted = OfferPackage.objects.annotate(
+            stored_price=Coalesce("min_price", Value(-1.0)),
+            stored_delivery_time=Coalesce("min_delivery_time", Value(-1)),
+            expected_price=Coalesce(expected_price, Value(-1.0)),
+            expected_delivery_time=Coalesce(expected_delivery_time, Value(-1)),
+        ).exclude(
+            Q(stored_price=F("expected_price"))
+            & Q(stored_delivery_time=F("expected_delivery_time"))
+        )
+        drifted_ids = list(drifted.values_list("id", flat=True))
+
+        if options["dry_run"]:
+            self.stdout.write(f"{len(drifted_ids)} package(s) drifted.")
+            return
+
+        with transaction.atomic():
+            updated = OfferPackage.objects.filter(id__in=drifted_ids).update(
+                min_price=expected_price,
+                min_delivery_time=expected_delivery_time,
+            )
+            # update() sends no signals, so the lists are invalidated here.
+            if updated:
+                invalidate_offer_list_cache()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{updated} package(s) reconciled.")
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:59
+
+import offers_app.image_helpers
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+
+
+def backfill_min_values(apps, schema_editor):
+    OfferPackage = apps.get_model('offers_app', 'OfferPackage')
+    Offer = apps.get_model('offers_app', 'Offer')
+    offers = Offer.objects.filter(package=OuterRef('pk')).order_by().values('package')
+    OfferPackage.objects.update(
+        min_price=Subquery(offers.annotate(value=Min('price')).values('value')),
+        min_delivery_time=Subquery(offers.annotate(value=Min('delivery_time_in_days')).values('value')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offerpackage',
+            name='min_delivery_time',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offerpackage',
+            name='min_price',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='offerpackage',
+            name='image',
+            field=models.FileField(blank=True, null=True, upload_to=offers_app.image_helpers.offers_image_upload_path),
+        ),
+        migrations.RunPython(backfill_min_values, migrations.RunPython.noop),
+    ]
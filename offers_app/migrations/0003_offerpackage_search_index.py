@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-17 07:12
+
+from django.db import migrations
+
+from offers_app.search import install_search_index, uninstall_search_index
+
+
+def create_search_index(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0002_offerpackage_min_values'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-17 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_offerpackage_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['package', 'price', 'delivery_time_in_days'], name='offer_package_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerpackage',
+            index=models.Index(fields=['created_at', 'id'], name='offerpackage_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerpackage',
+            index=models.Index(fields=['updated_at', 'id'], name='offerpackage_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerpackage',
+            index=models.Index(fields=['user', 'created_at'], name='offerpackage_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0004_offer_offer_package_price_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offerpackage',
+            name='image_variants',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
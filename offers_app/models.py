@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Min
 from rest_framework.authtoken.admin import User
 
 from offers_app.image_helpers import offers_image_upload_path
@@ -60,6 +61,13 @@ class OfferPackage(models.Model):
         description (str): Description of the offer package.
         created_at (datetime): Timestamp when the package was created.
         updated_at (datetime): Timestamp when the package was last updated.
+        min_price (float): Lowest price of the package's offers. Stored
+            denormalized so listings can filter and order on an index.
+        min_delivery_time (int): Shortest delivery time in days of the
+            package's offers. Stored denormalized like min_price.
+        image_variants (dict): Resized WebP/AVIF copies of the image,
+            written in the background by offers_app.image_variants.
+            None until they are generated.
     """
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -70,6 +78,64 @@ class OfferPackage(models.Model):
     description = models.CharField(max_length=255, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    min_price = models.FloatField(blank=True, null=True, db_index=True)
+    min_delivery_time = models.IntegerField(
+        blank=True, null=True, db_index=True
+    )
+    image_variants = models.JSONField(blank=True, null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Default list ordering and its keyset tie-breaker.
+            models.Index(
+                fields=["created_at", "id"], name="offerpackage_created_idx"
+            ),
+            models.Index(
+                fields=["updated_at", "id"], name="offerpackage_updated_idx"
+            ),
+            # Packages of one creator in the default ordering.
+            models.Index(
+                fields=["user", "created_at"],
+                name="offerpackage_user_created_idx",
+            ),
+        ]
+
+    def update_min_values(self):
+        """
+        Recalculate and persist min_price and min_delivery_time.
+
+        Aggregates the current offers of this package and writes the
+        result together with updated_at, so the denormalized columns
+        never diverge from the offers they are derived from. Callers
+        should run this inside the transaction that changed the offers.
+        """
+        aggregates = self.offers.aggregate(
+            min_price=Min("price"),
+            min_delivery_time=Min("delivery_time_in_days"),
+        )
+        self.min_price = aggregates["min_price"]
+        self.min_delivery_time = aggregates["min_delivery_time"]
+        self.save(
+            update_fields=["min_price", "min_delivery_time", "updated_at"]
+        )
+
+    def set_min_values(self, offers):
+        """
+        Set min_price and min_delivery_time from offers held in memory.
+
+        Used by write paths that already have all offers of the package
+        loaded, so no aggregate query is needed. Nothing is saved; the
+        caller persists the values with its own save of the package.
+
+        Args:
+            offers (iterable): All offers of this package.
+        """
+        offers = list(offers)
+        prices = [offer.price for offer in offers if offer.price is not None]
+        self.min_price = float(min(prices)) if prices else None
+        self.min_delivery_time = min(
+            (offer.delivery_time_in_days for offer in offers), default=None
+        )
 
 
 class Offer(BaseOffer):
@@ -88,3 +154,13 @@ class Offer(BaseOffer):
     package = models.ForeignKey(
         OfferPackage, on_delete=models.CASCADE, related_name="offers"
     )
+
+    class Meta:
+        indexes = [
+            # Covers the min value aggregates and the min_price EXISTS
+            # filter without reading the offer rows.
+            models.Index(
+                fields=["package", "price", "delivery_time_in_days"],
+                name="offer_package_price_idx",
+            ),
+        ]
@@ -0,0 +1,148 @@
+import re
+
+from django.db import OperationalError, connection
+
+SEARCH_TABLE = "offers_app_offerpackage_fts"
+PACKAGE_TABLE = "offers_app_offerpackage"
+SEARCH_TRIGGERS = {
+    f"{SEARCH_TABLE}_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai
+        AFTER INSERT ON {PACKAGE_TABLE} BEGIN
+            INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """,
+    f"{SEARCH_TABLE}_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad
+        AFTER DELETE ON {PACKAGE_TABLE} BEGIN
+            INSERT INTO {SEARCH_TABLE}(
+                {SEARCH_TABLE}, rowid, title, description
+            )
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """,
+    f"{SEARCH_TABLE}_au": f"""
+        CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au
+        AFTER UPDATE OF title, description ON {PACKAGE_TABLE} BEGIN
+            INSERT INTO {SEARCH_TABLE}(
+                {SEARCH_TABLE}, rowid, title, description
+            )
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """,
+}
+
+_available_aliases = set()
+
+
+def install_search_index(using_connection):
+    """
+    Create the SQLite FTS5 index over offer package titles and descriptions.
+
+    The index is an external-content FTS5 table kept in sync by triggers
+    on the package table, so every write path (API, admin, shell) updates
+    it without application code. The function is idempotent: missing
+    pieces are recreated and the index is rebuilt from the package table
+    only when something had to be installed. SQLite drops triggers when
+    Django remakes a table during a migration, which is why this also
+    runs after every migrate.
+
+    Args:
+        using_connection: The database connection to install the index on.
+
+    Returns:
+        bool: True if the index is available on this connection, False if
+            the backend is not SQLite or lacks the FTS5 extension.
+    """
+    if using_connection.vendor != "sqlite":
+        return False
+
+    with using_connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)",
+            [SEARCH_TABLE, *SEARCH_TRIGGERS],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing == {SEARCH_TABLE, *SEARCH_TRIGGERS}:
+            return True
+
+        try:
+            cursor.execute(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE}
+                USING fts5(
+                    title,
+                    description,
+                    content='{PACKAGE_TABLE}',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """
+            )
+        except OperationalError:
+            return False
+
+        for statement in SEARCH_TRIGGERS.values():
+            cursor.execute(statement)
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+        )
+    return True
+
+
+def uninstall_search_index(using_connection):
+    """Drop the FTS5 index and its triggers if they exist."""
+    if using_connection.vendor != "sqlite":
+        return
+
+    with using_connection.cursor() as cursor:
+        for trigger in SEARCH_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def search_index_available():
+    """
+    Return True if the full-text index exists on the default connection.
+
+    Positive results are remembered per connection alias, so the check
+    costs one query only until the index has been seen once.
+    """
+    if connection.alias in _available_aliases:
+        return True
+    if connection.vendor != "sqlite":
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [SEARCH_TABLE],
+        )
+        if cursor.fetchone() is None:
+            return False
+
+    _available_aliases.add(connection.alias)
+    return True
+
+
+def build_match_expression(term):
+    """
+    Translate a user search term into an FTS5 MATCH expression.
+
+    Every word of the term becomes a quoted prefix query, and all words
+    must match. Quoting keeps FTS5 operators typed by users ('AND', '-',
+    '*', ...) from being interpreted.
+
+    Args:
+        term (str): The raw search term.
+
+    Returns:
+        str or None: The MATCH expression, or None if the term contains
+            no searchable words.
+    """
+    words = re.findall(r"\w+", term)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
@@ -0,0 +1,83 @@
+from django.db import connections, transaction
+
+from offers_app.api.cache import invalidate_offer_list_cache
+from offers_app.image_variants import (
+    delete_image_variants,
+    schedule_image_variants,
+)
+from offers_app.models import OfferPackage
+from offers_app.search import install_search_index
+from offers_app.suggest import mark_suggest_index_stale
+
+USER_DISPLAY_FIELDS = {"username", "first_name", "last_name"}
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """
+    Reinstall the offer package search index after migrations.
+
+    SQLite drops triggers when a migration remakes the package table, so
+    the index is checked and repaired on every migrate run.
+    """
+    install_search_index(connections[using])
+
+
+def invalidate_list_cache_on_offer_change(sender, **kwargs):
+    """Invalidate the cached offer lists when a package or offer changes."""
+    invalidate_offer_list_cache()
+
+
+def mark_suggest_index_stale_on_offer_change(sender, **kwargs):
+    """Have the next suggest request check for changed packages."""
+    mark_suggest_index_stale()
+
+
+def invalidate_list_cache_on_user_change(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    """
+    Invalidate the cached offer lists when an offer owner changes.
+
+    Lists embed the owner's username, first and last name. New users,
+    saves limited to other fields (e.g. last_login on every login) and
+    users without offer packages leave the cache untouched.
+    """
+    if created:
+        return
+    if update_fields is not None and not (
+        USER_DISPLAY_FIELDS & set(update_fields)
+    ):
+        return
+    if not OfferPackage.objects.filter(user=instance).exists():
+        return
+    invalidate_offer_list_cache()
+
+
+def refresh_image_variants(sender, instance, update_fields=None, **kwargs):
+    """
+    Regenerate the image variants when a package's image changes.
+
+    Variants are built in the background once the transaction commits
+    (see offers_app.image_variants). Removing the image unsets its
+    variants right away and deletes their files once the transaction
+    commits, so a rollback keeps the files the row still points to.
+    """
+    if update_fields is not None and "image" not in update_fields:
+        return
+    variants = instance.image_variants
+    if not instance.image:
+        if variants is not None:
+            OfferPackage.objects.filter(pk=instance.pk).update(
+                image_variants=None
+            )
+            instance.image_variants = None
+            transaction.on_commit(lambda: delete_image_variants(variants))
+        return
+    if (variants or {}).get("source") != instance.image.name:
+        schedule_image_variants(instance)
+
+
+def delete_image_variants_of_package(sender, instance, **kwargs):
+    """Delete the variant files of a package once its deletion commits."""
+    variants = instance.image_variants
+    transaction.on_commit(lambda: delete_image_variants(variants))
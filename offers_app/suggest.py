@@ -0,0 +1,265 @@
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.db.models import Count, Max
+
+from offers_app.models import Offer, OfferPackage
+
+SUGGEST_LIMIT = 8
+SUGGEST_MAX_LIMIT = 20
+SUGGEST_MIN_LENGTH = 2
+SUGGEST_TYPO_MIN_LENGTH = 4
+# Typo candidates grow with the query length times the alphabet.
+SUGGEST_TYPO_MAX_LENGTH = 20
+SUGGEST_MAX_QUERY_LENGTH = 64
+SUGGEST_SCAN_LIMIT = 500
+SUGGEST_CHECK_INTERVAL = 10
+
+_index = None
+_index_lock = threading.Lock()
+_rebuild_lock = threading.Lock()
+_checked_at = None
+_executor = None
+
+
+def normalize(text):
+    """Return text case-folded, without diacritics and extra whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join(
+        "".join(c for c in decomposed if not unicodedata.combining(c)).split()
+    )
+
+
+class SuggestIndex:
+    """
+    Sorted prefix index of package titles and offer features.
+
+    Every phrase is indexed once per word it contains, starting at that
+    word, so 'des' finds 'Graphic Design Package'. A query is answered
+    with binary searches on the sorted keys. Queries of at least
+    SUGGEST_TYPO_MIN_LENGTH characters that find too little are retried
+    with every variant one edit away (deletion, transposition,
+    substitution or insertion of a character that occurs in the index).
+
+    Args:
+        phrases: Iterable of (text, kind, weight) tuples, where kind is
+            'title' or 'feature' and weight the number of packages.
+        version: Change marker (see get_change_marker) of the data the
+            phrases were read from.
+    """
+
+    def __init__(self, phrases, version=None):
+        self.version = version
+        self.suggestions = []
+        entries = []
+        for text, kind, weight in phrases:
+            words = normalize(text).split()
+            if not words:
+                continue
+            suggestion_id = len(self.suggestions)
+            self.suggestions.append((text, kind, weight))
+            for position in range(len(words)):
+                key = " ".join(words[position:])
+                # Matches at the start of the phrase rank first.
+                entries.append((key, position > 0, suggestion_id))
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.entries = [entry[1:] for entry in entries]
+        self.alphabet = sorted({c for key in self.keys for c in key})
+
+    def search(self, query, limit=SUGGEST_LIMIT):
+        """
+        Return the best suggestions for a query.
+
+        Args:
+            query (str): The text typed so far.
+            limit (int): Maximum number of suggestions.
+
+        Returns:
+            list: Dicts with the suggested text and its type, exact
+                prefix matches first, then typo-tolerant ones for queries
+                of SUGGEST_TYPO_MIN_LENGTH to SUGGEST_TYPO_MAX_LENGTH
+                characters. Each group is ordered by phrase-start
+                matches, weight and text.
+        """
+        query = normalize(query)
+        if len(query) < SUGGEST_MIN_LENGTH:
+            return []
+
+        found = {}
+        self._collect(query, found, rank=0)
+        if (
+            len(found) < limit
+            and SUGGEST_TYPO_MIN_LENGTH
+            <= len(query)
+            <= SUGGEST_TYPO_MAX_LENGTH
+        ):
+            for variant in self._edits(query):
+                self._collect(variant, found, rank=1)
+
+        ordered = sorted(
+            found.items(),
+            key=lambda item: (
+                item[1],
+                -self.suggestions[item[0]][2],
+                self.suggestions[item[0]][0],
+            ),
+        )
+        return [
+            {
+                "text": self.suggestions[suggestion_id][0],
+                "type": self.suggestions[suggestion_id][1],
+            }
+            for suggestion_id, _ in ordered[:limit]
+        ]
+
+    def _collect(self, prefix, found, rank):
+        """Add the suggestions of keys starting with prefix to found."""
+        keys = self.keys
+        position = bisect_left(keys, prefix)
+        end = min(position + SUGGEST_SCAN_LIMIT, len(keys))
+        while position < end and keys[position].startswith(prefix):
+            inner, suggestion_id = self.entries[position]
+            entry_rank = (rank, inner)
+            if entry_rank < found.get(suggestion_id, (2, True)):
+                found[suggestion_id] = entry_rank
+            position += 1
+
+    def _edits(self, query):
+        """Yield the distinct strings one edit away from the query."""
+        seen = {query}
+        # Appending a character is covered by the prefix search itself.
+        for index in range(len(query)):
+            head, tail = query[:index], query[index:]
+            candidates = [head + tail[1:]]
+            if len(tail) > 1:
+                candidates.append(head + tail[1] + tail[0] + tail[2:])
+            for c in self.alphabet:
+                candidates.append(head + c + tail[1:])
+                candidates.append(head + c + tail)
+            for candidate in candidates:
+                if candidate not in seen:
+                    seen.add(candidate)
+                    yield candidate
+
+
+def build_suggest_index(version=None):
+    """
+    Build a SuggestIndex from the database with two queries.
+
+    Titles and features shared by several packages become one
+    suggestion weighted by the number of packages.
+    """
+    phrases = [
+        (row["title"], "title", row["weight"])
+        for row in OfferPackage.objects.values("title")
+        .annotate(weight=Count("id"))
+        .order_by()
+    ]
+    features = {}
+    for package_id, offer_features in Offer.objects.values_list(
+        "package_id", "features"
+    ).iterator():
+        for feature in offer_features or []:
+            if isinstance(feature, str):
+                features.setdefault(feature.strip(), set()).add(package_id)
+    phrases.extend(
+        (feature, "feature", len(package_ids))
+        for feature, package_ids in features.items()
+        if feature
+    )
+    return SuggestIndex(phrases, version)
+
+
+def get_change_marker():
+    """
+    Return a marker that changes with the indexed data, in one query.
+
+    Every write to a package or its offers updates the package's
+    updated_at (see OfferPackage.update_min_values), deletions lower the
+    count and insertions raise the highest id. Writes that do not touch
+    titles or features, like owner renames, leave the marker unchanged.
+    """
+    return tuple(
+        OfferPackage.objects.aggregate(
+            count=Count("id"),
+            last_id=Max("id"),
+            updated_at=Max("updated_at"),
+        ).values()
+    )
+
+
+def get_executor():
+    """Return the single worker thread rebuilding the suggest index."""
+    global _executor
+    with _index_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="suggest-index"
+            )
+    return _executor
+
+
+def get_suggest_index():
+    """
+    Return the process' suggest index, rebuilding it in the background.
+
+    Only the first request of a process builds the index itself. Later
+    ones compare the change marker of the database with the index's at
+    most every SUGGEST_CHECK_INTERVAL seconds, so writes in other
+    processes are picked up within that interval; writes in this process
+    (see offers_app.signals) trigger the check on the next request. A
+    changed marker schedules a rebuild on a worker thread, and requests
+    keep using the previous index until it is replaced.
+    """
+    global _index, _checked_at
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _checked_at = time.monotonic()
+                _index = build_suggest_index(get_change_marker())
+            return _index
+
+    now = time.monotonic()
+    if _checked_at is not None and now - _checked_at < SUGGEST_CHECK_INTERVAL:
+        return _index
+    _checked_at = now
+    if get_change_marker() != _index.version and _rebuild_lock.acquire(
+        blocking=False
+    ):
+        try:
+            get_executor().submit(_rebuild_in_worker)
+        except RuntimeError:
+            # The executor shuts down with the interpreter.
+            _rebuild_lock.release()
+    return _index
+
+
+def mark_suggest_index_stale():
+    """Compare the change marker on the next suggest request."""
+    global _checked_at
+    _checked_at = None
+
+
+def clear_suggest_index():
+    """Drop the index, so the next request builds it synchronously."""
+    global _index, _checked_at
+    _index = None
+    _checked_at = None
+
+
+def _rebuild_in_worker():
+    """Rebuild the index in the worker thread with its own connection."""
+    global _index
+    try:
+        # Read before the phrases, so writes made during the rebuild
+        # leave the index stale rather than unnoticed.
+        marker = get_change_marker()
+        _index = build_suggest_index(marker)
+    finally:
+        _rebuild_lock.release()
+        connections.close_all()
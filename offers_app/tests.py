@@ -1,15 +1,48 @@
+import hashlib
+import itertools
+import json
+import os
+import re
+import time
+from functools import partial
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
 from rest_framework import status
 from rest_framework.authtoken.admin import User
-from rest_framework.test import APITestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 
 from core.test_factory.authenticate import TestDataFactory
 from core.test_factory.data import APITestCaseWithSetup
+from core.test_factory.media import TemporaryMediaMixin, create_image_file
+from offers_app import suggest
+from offers_app.api.imports import (
+    import_offer_packages,
+    iter_ndjson_records,
+)
+from offers_app.api.pagination import OfferPackageCursorPagination
+from offers_app.api.views import OffersViewSet
 from offers_app.models import Offer, OfferPackage
+from offers_app.image_variants import (
+    IMAGE_VARIANT_SIZES,
+    _run_in_worker,
+    generate_image_variants,
+)
+from offers_app.search import search_index_available
+from offers_app.suggest import SUGGEST_CHECK_INTERVAL, SuggestIndex
 
 
 class TestOfferPackageViewSet(APITestCaseWithSetup):
     def setUp(self):
+        super().setUp()
         self.client = TestDataFactory.authenticate_user(self.business_user_1)
 
     def test_offer_retrieve_ok(self):
@@ -67,6 +100,7 @@ class TestOfferPackageViewSet(APITestCaseWithSetup):
             result_data.pop("description"), self.offer_package_2.description
         )
         self.assertEqual(result_data.pop("image"), self.offer_package_2.image)
+        self.assertIsNone(result_data.pop("image_variants"))
         self.assertEqual(result_data.pop("min_price"), 80)
         self.assertEqual(result_data.pop("min_delivery_time"), 3)
         self.assertEqual(
@@ -428,6 +462,1211 @@ class TestOfferPackageViewSet(APITestCaseWithSetup):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class TestOfferPackageQueryCount(APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.client = TestDataFactory.authenticate_user(self.business_user_1)
+
+    def create_packages(self, amount):
+        for index in range(amount):
+            package = OfferPackage.objects.create(
+                user=self.business_user_2, title=f"Package {index}"
+            )
+            for offer_type in ["basic", "standard", "premium"]:
+                Offer.objects.create(
+                    title=f"{offer_type} {index}",
+                    delivery_time_in_days=3,
+                    price=100,
+                    offer_type=offer_type,
+                    package=package,
+                )
+            package.update_min_values()
+
+    def test_offer_list_query_count_constant(self):
+        url = reverse("offerpackage-list") + "?page_size=10"
+
+        # COUNT, page SELECT joined with the user, offers prefetch
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        self.create_packages(8)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()["results"]), 10)
+
+    def test_offer_retrieve_query_count(self):
+        url = reverse(
+            "offerpackage-detail", kwargs={"pk": self.offer_package_1.pk}
+        )
+
+        # ETag metadata, package SELECT joined with the user, offers
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+    def get_offer_statements(self, queries, statement):
+        return [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith(statement)
+            and '"offers_app_offer"' in query["sql"]
+        ]
+
+    def test_offer_create_writes_offers_in_bulk(self):
+        details = [
+            {
+                "title": f"{offer_type} offer",
+                "delivery_time_in_days": 3 + index,
+                "price": 100 * (index + 1),
+                "offer_type": offer_type,
+            }
+            for index, offer_type in enumerate(
+                ["basic", "standard", "premium"]
+            )
+        ]
+        url = reverse("offerpackage-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                url, {"title": "Bulk", "details": details}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self.get_offer_statements(queries, "INSERT")), 1)
+        self.assertEqual(len(self.get_offer_statements(queries, "UPDATE")), 0)
+        package = OfferPackage.objects.get(pk=response.json()["id"])
+        self.assertEqual(package.offers.count(), 3)
+        self.assertEqual(package.min_price, 100)
+        self.assertEqual(package.min_delivery_time, 3)
+
+    def test_offer_update_loads_and_writes_offers_once(self):
+        url = reverse(
+            "offerpackage-detail", kwargs={"pk": self.offer_package_1.pk}
+        )
+        details = [
+            {"title": "Basic", "price": 90.5, "offer_type": "basic"},
+            {
+                "title": "Premium",
+                "delivery_time_in_days": 1,
+                "offer_type": "premium",
+            },
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                url, {"details": details}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # One SELECT of the existing offers, one for the response.
+        self.assertEqual(len(self.get_offer_statements(queries, "SELECT")), 2)
+        self.assertEqual(len(self.get_offer_statements(queries, "UPDATE")), 1)
+        self.basic_web_offer.refresh_from_db()
+        self.premium_web_offer.refresh_from_db()
+        self.assertEqual(self.basic_web_offer.price, 90.5)
+        self.assertEqual(self.premium_web_offer.delivery_time_in_days, 1)
+        self.offer_package_1.refresh_from_db()
+        self.assertEqual(self.offer_package_1.min_price, 90.5)
+        self.assertEqual(self.offer_package_1.min_delivery_time, 1)
+
+    def test_offer_update_skips_unchanged_offers(self):
+        url = reverse(
+            "offerpackage-detail", kwargs={"pk": self.offer_package_1.pk}
+        )
+        details = [
+            {
+                "title": self.basic_web_offer.title,
+                "price": self.basic_web_offer.price,
+                "offer_type": "basic",
+            }
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                url, {"details": details}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.get_offer_statements(queries, "UPDATE")), 0)
+
+
+class TestOfferPackageListCache(APITestCaseWithSetup):
+    def get_list(self, query=""):
+        url = reverse("offerpackage-list") + query
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def assertServedFromCache(self, query=""):
+        with self.assertNumQueries(0):
+            response = self.get_list(query)
+        self.assertEqual(response["X-Cache"], "HIT")
+        return response
+
+    def test_list_cached_after_first_request(self):
+        first = self.get_list()
+        second = self.assertServedFromCache()
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(first.json(), second.json())
+
+    def test_cache_key_uses_normalized_params(self):
+        self.get_list("?min_price=100&page_size=6")
+
+        self.assertServedFromCache("?page_size=6&min_price=100.0")
+        self.assertEqual(
+            self.get_list("?min_price=100&page_size=5")["X-Cache"], "MISS"
+        )
+
+    def test_package_change_invalidates_list(self):
+        self.get_list()
+        self.offer_package_1.title = "Renamed package"
+        self.offer_package_1.save()
+
+        response = self.get_list()
+        titles = [item["title"] for item in response.json()["results"]]
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn("Renamed package", titles)
+
+    def test_offer_change_invalidates_list(self):
+        self.get_list()
+        self.basic_web_offer.price = 1
+        self.basic_web_offer.save()
+        self.offer_package_1.update_min_values()
+
+        self.assertEqual(self.get_list()["X-Cache"], "MISS")
+
+    def test_owner_display_change_invalidates_list(self):
+        self.get_list()
+        self.business_user_1.first_name = "Johnny"
+        self.business_user_1.save()
+
+        response = self.get_list()
+        first_names = [
+            item["user_details"]["first_name"]
+            for item in response.json()["results"]
+        ]
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn("Johnny", first_names)
+
+    def test_unrelated_user_change_keeps_cache(self):
+        self.get_list()
+        self.business_user_1.save(update_fields=["last_login"])
+        self.customer_user_1.first_name = "Changed"
+        self.customer_user_1.save()
+
+        self.assertServedFromCache()
+
+    def test_cache_counters(self):
+        self.get_list()
+        self.get_list()
+        admin = User.objects.create_user(
+            username="admin", password="adminpass123", is_staff=True
+        )
+        self.client = TestDataFactory.authenticate_user(admin)
+
+        response = self.client.get(reverse("runtime-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["offer_list_cache"],
+            {"hits": 1, "misses": 1, "hit_rate": 0.5},
+        )
+
+
+class TestOfferPackageFacets(APITestCaseWithSetup):
+    def get_facets(self, query=""):
+        url = reverse("offerpackage-facets") + query
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def get_bucket_counts(self, buckets):
+        return [bucket["count"] for bucket in buckets]
+
+    def test_facets_count_all_packages(self):
+        data = self.get_facets().json()
+
+        self.assertEqual(data["count"], 2)
+        # Package 1 starts at 100.10 in 5 days, package 2 at 80 in 3 days.
+        self.assertEqual(
+            self.get_bucket_counts(data["price"]), [0, 1, 1, 0, 0]
+        )
+        self.assertEqual(data["price"][0], {"min": 0, "max": 50, "count": 0})
+        self.assertIsNone(data["price"][-1]["max"])
+        self.assertEqual(
+            self.get_bucket_counts(data["delivery_time"]), [0, 1, 2, 2, 2]
+        )
+        self.assertEqual(
+            sorted(
+                (creator["username"], creator["count"])
+                for creator in data["creators"]
+            ),
+            [("john_doe", 1), ("sarah_miller", 1)],
+        )
+
+    def test_facets_apply_list_filters(self):
+        data = self.get_facets(
+            f"?creator_id={self.business_user_1.id}&max_delivery_time=5"
+        ).json()
+
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(
+            self.get_bucket_counts(data["price"]), [0, 0, 1, 0, 0]
+        )
+        self.assertEqual(
+            data["creators"],
+            [
+                {
+                    "creator_id": self.business_user_1.id,
+                    "username": "john_doe",
+                    "count": 1,
+                }
+            ],
+        )
+
+    def test_facets_with_search(self):
+        data = self.get_facets("?search=design&ordering=min_price").json()
+
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(data["creators"][0]["username"], "sarah_miller")
+
+    def test_facets_use_one_query(self):
+        with self.assertNumQueries(1):
+            self.get_facets("?min_price=100&max_delivery_time=7")
+
+    def test_facets_rejects_invalid_filter(self):
+        response = self.client.get(
+            reverse("offerpackage-facets") + "?min_price=abc"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_facets_cached_until_invalidated(self):
+        self.assertEqual(self.get_facets()["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = self.get_facets("?ordering=min_price")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        self.basic_web_offer.price = 10
+        self.basic_web_offer.save()
+        self.offer_package_1.update_min_values()
+
+        response = self.get_facets()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["price"][0]["count"], 1)
+
+
+class TestOfferPackageSuggest(APITestCaseWithSetup):
+    def get_suggestions(self, query):
+        url = reverse("offerpackage-suggest") + query
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            (suggestion["text"], suggestion["type"])
+            for suggestion in response.json()["suggestions"]
+        ]
+
+    def test_suggest_title_and_feature_prefixes(self):
+        self.assertEqual(
+            self.get_suggestions("?q=Graph"),
+            [("Graphic Design Package", "title")],
+        )
+        self.assertEqual(
+            self.get_suggestions("?q=lett"), [("Letterhead", "feature")]
+        )
+
+    def test_suggest_matches_later_words(self):
+        self.assertEqual(
+            self.get_suggestions("?q=design"),
+            [("Graphic Design Package", "title")],
+        )
+        self.assertEqual(
+            self.get_suggestions("?q=card"), [("Business Card", "feature")]
+        )
+
+    def test_suggest_ranks_phrase_starts_and_weight_first(self):
+        suggestions = SuggestIndex(
+            [
+                ("Web Design", "title", 1),
+                ("Logo Design", "title", 5),
+                ("Design Review", "feature", 1),
+                ("Design Sprint", "feature", 3),
+            ]
+        ).search("design")
+
+        self.assertEqual(
+            [suggestion["text"] for suggestion in suggestions],
+            ["Design Sprint", "Design Review", "Logo Design", "Web Design"],
+        )
+
+    def test_suggest_tolerates_one_typo(self):
+        self.assertEqual(
+            self.get_suggestions("?q=Grpahic"),
+            [("Graphic Design Package", "title")],
+        )
+        self.assertEqual(
+            self.get_suggestions("?q=Analitics"), [("Analytics", "feature")]
+        )
+        self.assertEqual(self.get_suggestions("?q=Anxlitycs"), [])
+
+    def test_suggest_prefers_exact_prefixes_over_typos(self):
+        suggestions = SuggestIndex(
+            [("Logos", "feature", 1), ("Loges", "feature", 9)]
+        ).search("logo")
+
+        self.assertEqual(
+            [suggestion["text"] for suggestion in suggestions],
+            ["Logos", "Loges"],
+        )
+
+    def test_suggest_ignores_short_queries(self):
+        self.assertEqual(self.get_suggestions("?q=W"), [])
+        self.assertEqual(self.get_suggestions(""), [])
+
+    def test_suggest_rejects_long_queries(self):
+        url = reverse("offerpackage-suggest")
+
+        response = self.client.get(url, {"q": "a" * 65})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", response.json())
+        self.assertEqual(self.get_suggestions("?q=" + "a" * 64), [])
+
+    def test_suggest_skips_typos_of_long_queries(self):
+        index = SuggestIndex(
+            [("Graphic Design Package For Large Teams", "title", 1)]
+        )
+
+        with mock.patch.object(index, "_edits") as edits:
+            self.assertEqual(index.search("grpahic design package"), [])
+        edits.assert_not_called()
+        self.assertEqual(len(index.search("grpahic design")), 1)
+
+    def test_suggest_limit(self):
+        self.assertEqual(
+            self.get_suggestions("?q=web"),
+            [("Web Development Package", "title"), ("WebDev", "feature")],
+        )
+        self.assertEqual(len(self.get_suggestions("?q=web&limit=1")), 1)
+
+        response = self.client.get(
+            reverse("offerpackage-suggest") + "?q=web&limit=abc"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_suggest_warm_index_runs_no_queries(self):
+        self.get_suggestions("?q=web")
+
+        with self.assertNumQueries(0):
+            self.get_suggestions("?q=seo")
+
+    def rebuild_inline(self):
+        """Run scheduled rebuilds at once, on the test's connection."""
+        executor = mock.Mock()
+        executor.submit.side_effect = lambda function: function()
+        return mock.patch.multiple(
+            "offers_app.suggest",
+            get_executor=mock.Mock(return_value=executor),
+            connections=mock.DEFAULT,
+        )
+
+    def test_suggest_rebuilds_after_write(self):
+        self.assertEqual(self.get_suggestions("?q=mobile"), [])
+
+        self.offer_package_1.title = "Mobile App Package"
+        self.offer_package_1.save()
+
+        with self.rebuild_inline():
+            self.assertEqual(
+                self.get_suggestions("?q=mobile"),
+                [("Mobile App Package", "title")],
+            )
+        self.assertEqual(self.get_suggestions("?q=web development"), [])
+
+    def test_suggest_rebuilds_off_the_request(self):
+        self.get_suggestions("?q=web")
+        executor = mock.Mock()
+        self.offer_package_1.title = "Mobile App Package"
+        self.offer_package_1.save()
+
+        with mock.patch(
+            "offers_app.suggest.get_executor", return_value=executor
+        ):
+            with self.assertNumQueries(1):
+                suggestions = self.get_suggestions("?q=mobile")
+
+        self.assertEqual(suggestions, [])
+        executor.submit.assert_called_once_with(suggest._rebuild_in_worker)
+        self.addCleanup(suggest._rebuild_lock.release)
+
+    def test_suggest_picks_up_writes_of_other_processes(self):
+        self.get_suggestions("?q=web")
+        # update() sends no signal, like a write in another process.
+        OfferPackage.objects.filter(pk=self.offer_package_1.pk).update(
+            title="Mobile App Package", updated_at=timezone.now()
+        )
+
+        with self.rebuild_inline():
+            self.assertEqual(self.get_suggestions("?q=mobile"), [])
+            with mock.patch(
+                "offers_app.suggest.time.monotonic",
+                return_value=time.monotonic() + SUGGEST_CHECK_INTERVAL,
+            ):
+                self.assertEqual(
+                    self.get_suggestions("?q=mobile"),
+                    [("Mobile App Package", "title")],
+                )
+
+    def test_suggest_ignores_owner_renames(self):
+        self.get_suggestions("?q=web")
+        executor = mock.Mock()
+
+        self.business_user_1.username = "renamed"
+        self.business_user_1.save()
+        suggest.mark_suggest_index_stale()
+        with mock.patch(
+            "offers_app.suggest.get_executor", return_value=executor
+        ):
+            self.get_suggestions("?q=web")
+
+        executor.submit.assert_not_called()
+
+
+class TestOfferPackageImport(APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.client = TestDataFactory.authenticate_user(self.business_user_1)
+        self.url = reverse("offerpackage-import-packages")
+
+    def get_record(self, title):
+        return {
+            "title": title,
+            "description": "Imported package",
+            "details": [
+                {
+                    "title": f"{offer_type} offer",
+                    "delivery_time_in_days": 2 + index,
+                    "price": 50 * (index + 1),
+                    "offer_type": offer_type,
+                }
+                for index, offer_type in enumerate(
+                    ["basic", "standard", "premium"]
+                )
+            ],
+        }
+
+    def post_lines(self, lines):
+        response = self.client.post(
+            self.url,
+            "\n".join(lines),
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        content = b"".join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_import_creates_packages(self):
+        results = self.post_lines(
+            [json.dumps(self.get_record(f"Imported {i}")) for i in range(3)]
+        )
+
+        self.assertEqual(
+            [result["status"] for result in results], ["created"] * 3
+        )
+        package = OfferPackage.objects.get(pk=results[0]["id"])
+        self.assertEqual(package.user, self.business_user_1)
+        self.assertEqual(package.title, "Imported 0")
+        self.assertEqual(package.offers.count(), 3)
+        self.assertEqual(package.min_price, 50)
+        self.assertEqual(package.min_delivery_time, 2)
+
+    def test_import_reports_invalid_records(self):
+        invalid = self.get_record("Two offers")
+        invalid["details"] = invalid["details"][:2]
+
+        results = self.post_lines(
+            [
+                json.dumps(self.get_record("Valid")),
+                "",
+                "{not json",
+                json.dumps(invalid),
+                "[]",
+            ]
+        )
+
+        self.assertEqual(
+            [(result["line"], result["status"]) for result in results],
+            [
+                (1, "created"),
+                (3, "invalid"),
+                (4, "invalid"),
+                (5, "invalid"),
+            ],
+        )
+        self.assertIn("details", results[2]["errors"])
+        self.assertEqual(
+            OfferPackage.objects.filter(title="Two offers").count(), 0
+        )
+
+    def test_import_rejects_oversized_records(self):
+        small = json.dumps(self.get_record("Small"))
+        record = self.get_record("Huge")
+        record["description"] = "x" * 200
+        read_records = partial(iter_ndjson_records, max_line_size=len(small))
+
+        with mock.patch(
+            "offers_app.api.views.iter_ndjson_records", read_records
+        ):
+            results = self.post_lines([json.dumps(record), small])
+
+        self.assertEqual(
+            [result["status"] for result in results], ["invalid", "created"]
+        )
+        self.assertEqual(results[0]["errors"], ["Record is too large."])
+
+    def test_import_commits_in_chunks(self):
+        lines = [json.dumps(self.get_record(f"Chunk {i}")) for i in range(5)]
+        import_in_pairs = partial(import_offer_packages, chunk_size=2)
+
+        with mock.patch(
+            "offers_app.api.views.import_offer_packages", import_in_pairs
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                results = self.post_lines(lines)
+
+        self.assertEqual(len(results), 5)
+        package_inserts = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('INSERT INTO "offers_app_offerpackage"')
+        ]
+        self.assertEqual(len(package_inserts), 3)
+
+    def test_import_without_length_is_rejected(self):
+        response = self.client.post(
+            self.url,
+            json.dumps(self.get_record("Chunked")),
+            content_type="application/x-ndjson",
+            CONTENT_LENGTH="",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_411_LENGTH_REQUIRED)
+        self.assertFalse(OfferPackage.objects.filter(title="Chunked").exists())
+
+    def test_import_reads_terminated_input_without_length(self):
+        # As passed on by servers that decode chunked bodies themselves.
+        body = BytesIO(json.dumps(self.get_record("Chunked")).encode())
+
+        response = self.client.post(
+            self.url,
+            content_type="application/x-ndjson",
+            CONTENT_LENGTH="",
+            **{"wsgi.input": body, "wsgi.input_terminated": True},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(json.loads(content)["status"], "created")
+        self.assertTrue(OfferPackage.objects.filter(title="Chunked").exists())
+
+    def test_import_requires_business_user(self):
+        self.client = TestDataFactory.authenticate_user(self.customer_user_1)
+
+        response = self.client.post(
+            self.url, "{}", content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TestOfferConditionalRequests(APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.client = TestDataFactory.authenticate_user(self.business_user_1)
+
+    def assertRevalidates(self, url, change):
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def rename_package(self):
+        self.offer_package_1.title = "Renamed package"
+        self.offer_package_1.save()
+
+    def change_offer_price(self):
+        url = reverse(
+            "offerpackage-detail", kwargs={"pk": self.offer_package_1.pk}
+        )
+        patch_data = {"details": [{"offer_type": "basic", "price": 42}]}
+        response = self.client.patch(url, patch_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_offer_package_retrieve_conditional(self):
+        url = reverse(
+            "offerpackage-detail", kwargs={"pk": self.offer_package_1.pk}
+        )
+        self.assertRevalidates(url, self.rename_package)
+
+    def test_offer_detail_conditional(self):
+        url = reverse("offer-detail", kwargs={"pk": self.basic_web_offer.pk})
+        self.assertRevalidates(url, self.change_offer_price)
+
+    def test_offer_list_conditional_without_queries(self):
+        url = reverse("offerpackage-list") + "?min_price=50"
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.rename_package()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_offer_list_etag_follows_data(self):
+        url = reverse("offerpackage-list")
+        etag = self.client.get(url)["ETag"]
+
+        # Cache expired, data unchanged: the re-rendered list keeps its tag.
+        with mock.patch(
+            "offers_app.api.views.get_cached_list", return_value=None
+        ):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # A write another process did not announce to this one's cache.
+        OfferPackage.objects.filter(pk=self.offer_package_1.pk).update(
+            title="Changed elsewhere"
+        )
+        with mock.patch(
+            "offers_app.api.views.get_cached_list", return_value=None
+        ):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_if_modified_since(self):
+        url = reverse(
+            "offerpackage-detail", kwargs={"pk": self.offer_package_1.pk}
+        )
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_conditional_retrieve_not_found(self):
+        url = reverse("offerpackage-detail", kwargs={"pk": 999})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"abc"')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestOfferPackageQueryPlans(APITestCaseWithSetup):
+    params = {
+        "creator_id": "1",
+        "min_price": "85",
+        "max_delivery_time": "7",
+        "search": "design",
+    }
+    orderings = [None, "min_price", "-updated_at"]
+
+    def get_queryset(self, query):
+        request = Request(APIRequestFactory().get("/", query))
+        view = OffersViewSet(
+            request=request, action="list", format_kwarg=None, kwargs={}
+        )
+        return view.get_queryset()
+
+    def combinations(self):
+        for amount in range(len(self.params) + 1):
+            for names in itertools.combinations(self.params, amount):
+                for ordering in self.orderings:
+                    query = {name: self.params[name] for name in names}
+                    if ordering:
+                        query["ordering"] = ordering
+                    yield query
+
+    def test_sql_has_no_join_distinct_or_group_by(self):
+        for query in self.combinations():
+            sql = str(self.get_queryset(query).query).upper()
+            with self.subTest(query=query):
+                self.assertNotIn("DISTINCT", sql)
+                self.assertNotIn("GROUP BY", sql)
+                self.assertNotIn('JOIN "OFFERS_APP_OFFER"', sql)
+                if "min_price" in query:
+                    self.assertIn("EXISTS", sql)
+
+    def test_query_plans_are_index_backed(self):
+        for query in self.combinations():
+            plan = self.get_queryset(query).explain().splitlines()
+            with self.subTest(query=query):
+                for line in plan:
+                    self.assertNotRegex(line, r"SCAN (offers_app_offer|U0)\b")
+
+                full_scans = [
+                    line
+                    for line in plan
+                    if re.search(r"SCAN offers_app_offerpackage$", line)
+                ]
+                self.assertEqual(full_scans, [])
+
+    def test_default_ordering_needs_no_sort(self):
+        for query in [{}, {"creator_id": "1"}, {"ordering": "-updated_at"}]:
+            plan = self.get_queryset(query).explain()
+            with self.subTest(query=query):
+                self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_min_price_filter_returns_each_package_once(self):
+        ids = list(
+            self.get_queryset({"min_price": "1"}).values_list("id", flat=True)
+        )
+
+        self.assertEqual(
+            sorted(ids), [self.offer_package_1.id, self.offer_package_2.id]
+        )
+
+
+class TestOfferPackageProjections(APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.client = TestDataFactory.authenticate_user(self.business_user_1)
+        self.offer_package_1.image = "offers/web.png"
+        self.offer_package_1.save()
+        OfferPackage.objects.filter(pk=self.offer_package_1.pk).update(
+            image_variants={
+                "source": "offers/web.png",
+                "files": {"thumbnail_webp": "offer_images/variants/1.webp"},
+            }
+        )
+        self.premium_web_offer.price = 1234.567
+        self.premium_web_offer.save()
+        self.offer_package_1.update_min_values()
+
+    def assertSameAsSerializer(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        cache.clear()
+        with mock.patch.object(OffersViewSet, "projection_classes", {}):
+            expected = self.client.get(url)
+
+        self.assertEqual(response.content, expected.content)
+
+    def test_list_matches_serializer(self):
+        for query in [
+            "",
+            "?page_size=1&page=2",
+            "?search=design&min_price=50",
+            "?ordering=min_price&pagination=cursor",
+        ]:
+            with self.subTest(query=query):
+                self.assertSameAsSerializer(
+                    reverse("offerpackage-list") + query
+                )
+
+    def test_retrieve_matches_serializer(self):
+        for package in [self.offer_package_1, self.offer_package_2]:
+            with self.subTest(package=package.pk):
+                self.assertSameAsSerializer(
+                    reverse("offerpackage-detail", kwargs={"pk": package.pk})
+                )
+
+    def test_list_without_model_instances(self):
+        url = reverse("offerpackage-list")
+        with mock.patch.object(
+            OfferPackage, "__init__", side_effect=AssertionError
+        ):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TestOfferImageVariants(TemporaryMediaMixin, APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.storage = OfferPackage._meta.get_field("image").storage
+
+    def save_image(self):
+        return self.storage.save(
+            "offer_images/upload.png", create_image_file()
+        )
+
+    def test_image_change_schedules_variants_after_commit(self):
+        executor = mock.Mock()
+        self.offer_package_1.image = self.save_image()
+
+        with mock.patch(
+            "offers_app.image_variants.get_executor", return_value=executor
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.offer_package_1.save()
+            self.offer_package_1.update_min_values()
+
+        executor.submit.assert_called_once_with(
+            _run_in_worker,
+            self.offer_package_1.pk,
+            self.offer_package_1.image.name,
+        )
+
+    def test_generate_variants(self):
+        image_name = self.save_image()
+        OfferPackage.objects.filter(pk=self.offer_package_1.pk).update(
+            image=image_name
+        )
+
+        variants = generate_image_variants(self.offer_package_1.pk, image_name)
+
+        self.offer_package_1.refresh_from_db()
+        self.assertEqual(self.offer_package_1.image_variants, variants)
+        self.assertEqual(variants["source"], image_name)
+        for name, file_name in variants["files"].items():
+            size_name, format_name = name.split("_")
+            with self.storage.open(file_name) as variant_file:
+                variant = Image.open(variant_file)
+                self.assertEqual(variant.format.lower(), format_name)
+                max_size = IMAGE_VARIANT_SIZES[size_name]
+                self.assertLessEqual(variant.size[0], max_size[0])
+                self.assertLessEqual(variant.size[1], max_size[1])
+                # The aspect ratio of 4:3 is kept.
+                self.assertEqual(variant.size[0] * 3, variant.size[1] * 4)
+        self.assertIn("thumbnail_webp", variants["files"])
+
+    def test_generate_variants_of_replaced_image(self):
+        image_name = self.save_image()
+
+        variants = generate_image_variants(self.offer_package_1.pk, image_name)
+
+        self.assertIsNone(variants)
+        self.offer_package_1.refresh_from_db()
+        self.assertIsNone(self.offer_package_1.image_variants)
+        _, files = self.storage.listdir("offer_images/variants")
+        self.assertEqual(files, [])
+
+    def test_list_exposes_variant_urls(self):
+        image_name = self.save_image()
+        OfferPackage.objects.filter(pk=self.offer_package_2.pk).update(
+            image=image_name
+        )
+        variants = generate_image_variants(self.offer_package_2.pk, image_name)
+
+        response = self.client.get(reverse("offerpackage-list"))
+
+        urls = response.json()["results"][0]["image_variants"]
+        self.assertEqual(set(urls), set(variants["files"]))
+        self.assertEqual(
+            urls["thumbnail_webp"],
+            "http://testserver"
+            + self.storage.url(variants["files"]["thumbnail_webp"]),
+        )
+
+    def test_removing_image_deletes_variants(self):
+        image_name = self.save_image()
+        OfferPackage.objects.filter(pk=self.offer_package_1.pk).update(
+            image=image_name
+        )
+        variants = generate_image_variants(self.offer_package_1.pk, image_name)
+        self.offer_package_1.refresh_from_db()
+
+        self.offer_package_1.image = None
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer_package_1.save()
+
+        self.offer_package_1.refresh_from_db()
+        self.assertIsNone(self.offer_package_1.image_variants)
+        for file_name in variants["files"].values():
+            self.assertFalse(self.storage.exists(file_name))
+
+    def test_rolled_back_delete_keeps_variants(self):
+        image_name = self.save_image()
+        OfferPackage.objects.filter(pk=self.offer_package_1.pk).update(
+            image=image_name
+        )
+        variants = generate_image_variants(self.offer_package_1.pk, image_name)
+        package_id = self.offer_package_1.pk
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(DatabaseError):
+                with transaction.atomic():
+                    OfferPackage.objects.get(pk=package_id).delete()
+                    raise DatabaseError()
+
+        package = OfferPackage.objects.get(pk=package_id)
+        self.assertEqual(package.image_variants, variants)
+        for file_name in variants["files"].values():
+            self.assertTrue(self.storage.exists(file_name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            package.delete()
+
+        for file_name in variants["files"].values():
+            self.assertFalse(self.storage.exists(file_name))
+
+    def test_failed_variants_are_logged(self):
+        with mock.patch(
+            "offers_app.image_variants.generate_image_variants",
+            side_effect=OSError("cannot identify image file"),
+        ):
+            with mock.patch("offers_app.image_variants.connections"):
+                with self.assertLogs(
+                    "offers_app.image_variants", "WARNING"
+                ) as logs:
+                    _run_in_worker(self.offer_package_1.pk, "broken.png")
+
+        self.assertIn(str(self.offer_package_1.pk), logs.output[0])
+
+
+class TestOfferImageStorage(TemporaryMediaMixin, APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.storage = OfferPackage._meta.get_field("image").storage
+        # Variants are covered by TestOfferImageVariants.
+        executor = mock.patch("offers_app.image_variants.get_executor")
+        executor.start()
+        self.addCleanup(executor.stop)
+
+    def set_image(self, package, color):
+        with self.captureOnCommitCallbacks(execute=True):
+            package.image = create_image_file(color=color, name="Photo.PNG")
+            package.save()
+        return package.image.name
+
+    def test_upload_stored_under_content_hash(self):
+        content = create_image_file(color="red").read()
+
+        name = self.set_image(self.offer_package_1, "red")
+
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(name, f"offer_images/{digest}.png")
+        with self.storage.open(name) as stored:
+            self.assertEqual(stored.read(), content)
+
+    def test_equal_uploads_share_one_file(self):
+        first = self.set_image(self.offer_package_1, "red")
+        second = self.set_image(self.offer_package_2, "red")
+
+        self.assertEqual(first, second)
+        _, files = self.storage.listdir("offer_images")
+        self.assertEqual(files, [os.path.basename(first)])
+
+    def test_shared_file_deleted_with_last_reference(self):
+        shared = self.set_image(self.offer_package_1, "red")
+        self.set_image(self.offer_package_2, "red")
+
+        replaced = self.set_image(self.offer_package_1, "blue")
+        self.assertNotEqual(replaced, shared)
+        self.assertTrue(self.storage.exists(shared))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer_package_2.delete()
+        self.assertFalse(self.storage.exists(shared))
+        self.assertTrue(self.storage.exists(replaced))
+
+
+class TestOfferPackageSearch(APITestCaseWithSetup):
+    def search(self, term):
+        url = reverse("offerpackage-list") + f"?search={term}"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.json()["results"]]
+
+    def test_search_index_installed(self):
+        self.assertTrue(search_index_available())
+
+    def test_search_matches_word_prefix(self):
+        self.assertEqual(self.search("Graph"), [self.offer_package_2.id])
+        self.assertEqual(self.search("web devel"), [self.offer_package_1.id])
+
+    def test_search_ranks_by_relevance(self):
+        package = OfferPackage.objects.create(
+            user=self.business_user_1,
+            title="Web Shop with Design Consulting for Small Businesses",
+            description="Shop setup, hosting, design reviews and support.",
+        )
+
+        self.assertEqual(
+            self.search("design"), [self.offer_package_2.id, package.id]
+        )
+
+    def test_search_index_follows_writes(self):
+        self.offer_package_1.title = "Logo Studio"
+        self.offer_package_1.save()
+        self.offer_package_2.delete()
+
+        self.assertEqual(self.search("logo"), [self.offer_package_1.id])
+        self.assertEqual(self.search("web"), [])
+        self.assertEqual(self.search("graphic"), [])
+
+    def test_search_without_words_falls_back_to_substring(self):
+        self.assertEqual(self.search("%2B%2B"), [])
+
+
+class TestOfferPackageMinValues(APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.client = TestDataFactory.authenticate_user(self.business_user_1)
+
+    def test_min_values_stored_on_create(self):
+        offer = {
+            "title": "Graphics Package",
+            "description": "A comprehensive graphics package for businesses.",
+            "details": [
+                {
+                    "title": "Basic Design",
+                    "revisions": 2,
+                    "delivery_time_in_days": 4,
+                    "price": 90.5,
+                    "features": ["Logo Design"],
+                    "offer_type": "basic",
+                },
+                {
+                    "title": "Standard Design",
+                    "revisions": 5,
+                    "delivery_time_in_days": 7,
+                    "price": 200,
+                    "features": ["Logo Design", "Letterhead"],
+                    "offer_type": "standard",
+                },
+                {
+                    "title": "Premium Design",
+                    "revisions": 10,
+                    "delivery_time_in_days": 10,
+                    "price": 500,
+                    "features": ["Logo Design", "Letterhead", "Flyer"],
+                    "offer_type": "premium",
+                },
+            ],
+        }
+        url = reverse("offerpackage-list")
+        response = self.client.post(url, offer, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        package = OfferPackage.objects.get(pk=response.json()["id"])
+        self.assertEqual(package.min_price, 90.5)
+        self.assertEqual(package.min_delivery_time, 4)
+
+    def test_min_values_recalculated_on_update(self):
+        url = reverse(
+            "offerpackage-detail", kwargs={"pk": self.offer_package_1.pk}
+        )
+        patch_data = {
+            "details": [
+                {
+                    "title": "Basic Web Package",
+                    "delivery_time_in_days": 2,
+                    "price": 600,
+                    "offer_type": "basic",
+                }
+            ],
+        }
+        response = self.client.patch(url, patch_data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.offer_package_1.refresh_from_db()
+        self.assertEqual(self.offer_package_1.min_price, 250)
+        self.assertEqual(self.offer_package_1.min_delivery_time, 2)
+
+    def test_reconcile_command_repairs_drift(self):
+        OfferPackage.objects.filter(pk=self.offer_package_1.pk).update(
+            min_price=None, min_delivery_time=99
+        )
+        out = StringIO()
+
+        call_command("reconcile_offer_min_values", "--dry-run", stdout=out)
+        self.assertIn("1 package(s) drifted.", out.getvalue())
+
+        call_command("reconcile_offer_min_values", stdout=out)
+        self.offer_package_1.refresh_from_db()
+        self.assertEqual(self.offer_package_1.min_price, 100.1)
+        self.assertEqual(self.offer_package_1.min_delivery_time, 5)
+        self.offer_package_2.refresh_from_db()
+        self.assertEqual(self.offer_package_2.min_price, 80)
+
+
+class TestOfferPackageCursorPagination(APITestCaseWithSetup):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for index in range(7):
+            package = OfferPackage.objects.create(
+                user=cls.business_user_2, title=f"Tied Package {index}"
+            )
+            Offer.objects.create(
+                title=f"Tied Offer {index}",
+                delivery_time_in_days=3,
+                price=80,
+                offer_type="basic",
+                package=package,
+            )
+            package.update_min_values()
+
+    def collect_pages(self, url):
+        ids, previous_links = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            self.assertNotIn("count", data)
+            ids.extend(item["id"] for item in data["results"])
+            previous_links.append(data["previous"])
+            url = data["next"]
+        return ids, previous_links
+
+    def test_cursor_pages_follow_ordering_with_id_tie_breaker(self):
+        for ordering in ["min_price", "-min_price", "updated_at", ""]:
+            url = (
+                reverse("offerpackage-list")
+                + f"?pagination=cursor&page_size=4&ordering={ordering}"
+            )
+            ids, _ = self.collect_pages(url)
+
+            expected = OfferPackage.objects.order_by(
+                *OfferPackageCursorPagination.orderings.get(
+                    ordering, OfferPackageCursorPagination.ordering
+                )
+            ).values_list("id", flat=True)
+            self.assertEqual(ids, list(expected), ordering)
+
+    def test_cursor_previous_link_returns_previous_page(self):
+        url = (
+            reverse("offerpackage-list")
+            + "?pagination=cursor&page_size=4&ordering=min_price"
+        )
+        first_page = self.client.get(url).json()
+        second_page = self.client.get(first_page["next"]).json()
+        previous_page = self.client.get(second_page["previous"]).json()
+
+        self.assertEqual(previous_page["results"], first_page["results"])
+        self.assertIsNone(previous_page["previous"])
+
+    def test_cursor_page_runs_no_count_query(self):
+        url = reverse("offerpackage-list") + "?pagination=cursor"
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_cursor_invalid(self):
+        url = reverse("offerpackage-list") + "?pagination=cursor&cursor=abc"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
 class TestOfferDetailsView(APITestCase):
     @classmethod
     def setUpTestData(cls):
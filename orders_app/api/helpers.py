@@ -0,0 +1,79 @@
+from django.contrib.auth.models import User
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from rest_framework.generics import get_object_or_404
+
+from orders_app.models import BusinessOrderCount, Order
+
+
+def get_business_order_count(business_user_id, status):
+    """
+    Return the number of orders of a business user with a status.
+
+    Reads the user by primary key and its counter (see
+    BusinessOrderCount) by the unique (business_user, status) index in
+    a single query. Users without a counter have no such orders.
+
+    Args:
+        business_user_id (int): The ID of the business user.
+        status (str): The order status to count.
+
+    Returns:
+        int: The number of orders.
+
+    Raises:
+        Http404: If the user does not exist.
+    """
+    counter = BusinessOrderCount.objects.filter(
+        business_user=OuterRef("pk"), status=status
+    ).values("count")
+    counts = User.objects.annotate(
+        order_count=Coalesce(Subquery(counter), Value(0))
+    ).values_list("order_count", flat=True)
+    return get_object_or_404(counts, pk=business_user_id)
+
+
+def get_business_order_stats(business_user_ids):
+    """
+    Return the order counts per status of several business users.
+
+    Reads the users and their counters (see BusinessOrderCount) in one
+    query, joined by the unique (business_user, status) index, however
+    many users are requested.
+
+    Args:
+        business_user_ids (list): The IDs of the business users.
+
+    Returns:
+        list: One dict per existing user, in the requested order, with
+            'business_user', 'order_count' (in progress),
+            'completed_order_count' and 'cancelled_order_count'. Unknown
+            IDs are left out.
+    """
+    stats = {}
+    rows = User.objects.filter(pk__in=business_user_ids).values_list(
+        "pk", "order_counts__status", "order_counts__count"
+    )
+    for business_user_id, status, count in rows:
+        counts = stats.setdefault(
+            business_user_id,
+            {status: 0 for status in Order.StatusType.values},
+        )
+        if status is not None:
+            counts[status] = count
+    return [
+        {
+            "business_user": business_user_id,
+            "order_count": stats[business_user_id][
+                Order.StatusType.IN_PROGRESS
+            ],
+            "completed_order_count": stats[business_user_id][
+                Order.StatusType.COMPLETED
+            ],
+            "cancelled_order_count": stats[business_user_id][
+                Order.StatusType.CANCELLED
+            ],
+        }
+        for business_user_id in business_user_ids
+        if business_user_id in stats
+    ]
@@ -0,0 +1,23 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OrderCursorPagination(CursorPagination):
+    """
+    Keyset pagination class for the order list.
+
+    Opt-in, selected with the 'pagination=cursor' query parameter.
+    Orders are ordered by their creation time, newest first, which the
+    per-user indexes on created_at serve directly, so deep pages cost
+    the same as the first one. No COUNT query runs.
+
+    Attributes:
+        page_size (int): Default number of items per page (20).
+        page_size_query_param (str): Query parameter name for custom page size.
+        max_page_size (int): Maximum allowed items per page (100).
+        ordering (str): Keyset ordering (newest orders first).
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-created_at"
@@ -0,0 +1,27 @@
+from core.projection import (
+    DateTimeField,
+    Field,
+    PriceDecimalField,
+    Projection,
+)
+from orders_app.models import Order
+
+
+class OrderProjection(Projection):
+    """Projection of BaseOrderSerialier and its subclasses' output."""
+
+    model = Order
+    fields = {
+        "id": Field(),
+        "customer_user": Field(),
+        "business_user": Field(),
+        "status": Field(),
+        "created_at": DateTimeField(),
+        "updated_at": DateTimeField(),
+        "title": Field(),
+        "revisions": Field(),
+        "delivery_time_in_days": Field(),
+        "price": PriceDecimalField(),
+        "features": Field(),
+        "offer_type": Field(),
+    }
@@ -0,0 +1,237 @@
+from datetime import datetime, time
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from offers_app.api.query import get_query_param_values
+from orders_app.models import Order
+
+ORDER_FILTER_PARAMS = [
+    "status",
+    "created_after",
+    "created_before",
+    "counterparty",
+]
+MAX_ORDER_STATS_USERS = 100
+# Largest primary key the database backends store (signed 64 bits).
+MAX_USER_ID = 2**63 - 1
+
+
+def get_order_filter_values(request):
+    """
+    Validate and cast the order list filters of a request.
+
+    Accepts 'status' (one of Order.StatusType), 'created_after' and
+    'created_before' (ISO dates or datetimes, dates meaning the start or
+    end of the day) and 'counterparty' (user id of the other party, from
+    1 to MAX_USER_ID).
+
+    Args:
+        request: The HTTP request object containing query parameters.
+
+    Raises:
+        ValidationError: If a value is invalid.
+
+    Returns:
+        dict: Filter values, None for parameters that are not present.
+    """
+    values = get_query_param_values(request, ORDER_FILTER_PARAMS)
+    errors = {}
+
+    status = values["status"]
+    if status is not None and status not in Order.StatusType.values:
+        errors["status"] = (
+            f"Invalid value '{status}'. Expected one of: "
+            f"{', '.join(Order.StatusType.values)}."
+        )
+
+    for param, end_of_day in [
+        ("created_after", False),
+        ("created_before", True),
+    ]:
+        value = values[param]
+        if value is None:
+            continue
+        moment = parse_moment(value, end_of_day)
+        if moment is None:
+            errors[param] = (
+                f"Invalid value '{value}'. Expected an ISO date or datetime."
+            )
+        values[param] = moment
+
+    counterparty = values["counterparty"]
+    if counterparty is not None:
+        try:
+            values["counterparty"] = int(counterparty)
+        except ValueError:
+            errors["counterparty"] = (
+                f"Invalid value '{counterparty}'. Expected type: int."
+            )
+        else:
+            if not 1 <= values["counterparty"] <= MAX_USER_ID:
+                errors["counterparty"] = (
+                    f"Invalid value '{counterparty}'. Expected a user id "
+                    f"from 1 to {MAX_USER_ID}."
+                )
+
+    if errors:
+        raise ValidationError(errors)
+    return values
+
+
+def parse_moment(value, end_of_day=False):
+    """
+    Parse an ISO date or datetime into an aware datetime.
+
+    Args:
+        value (str): The date or datetime to parse.
+        end_of_day (bool): Whether a date means the end of the day
+            instead of its start.
+
+    Returns:
+        datetime: The parsed moment, or None if the value is invalid.
+    """
+    try:
+        # Checked first, parse_datetime reads dates as midnight.
+        day = parse_date(value)
+        if day is not None:
+            moment = datetime.combine(
+                day, time.max if end_of_day else time.min
+            )
+        else:
+            moment = parse_datetime(value)
+    except ValueError:
+        return None
+    if moment is None:
+        return None
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_participant(queryset, user):
+    """
+    Filter queryset to the orders a user placed or fulfils.
+
+    Each side of the condition is served by an index starting with the
+    user's column (see Order.Meta.indexes), so the cost depends on the
+    user's orders rather than on the whole table.
+
+    Args:
+        queryset: The Django queryset to filter.
+        user (User): The customer or business user.
+
+    Returns:
+        QuerySet: Orders where the user is customer_user or
+            business_user.
+    """
+    return queryset.filter(Q(customer_user=user) | Q(business_user=user))
+
+
+def filter_counterparty(queryset, user, counterparty_id):
+    """
+    Filter a user's orders by the other party of the order.
+
+    Args:
+        queryset: The Django queryset to filter.
+        user (User): The user the orders belong to.
+        counterparty_id (int): User id of the other party. If None, no
+            filtering is applied.
+
+    Returns:
+        QuerySet: Orders between the user and the counterparty, or the
+            original queryset if counterparty_id is None.
+    """
+    if counterparty_id is not None:
+        queryset = queryset.filter(
+            Q(customer_user=user, business_user_id=counterparty_id)
+            | Q(business_user=user, customer_user_id=counterparty_id)
+        )
+    return queryset
+
+
+def filter_status(queryset, status):
+    """
+    Filter queryset by order status.
+
+    Args:
+        queryset: The Django queryset to filter.
+        status (str): The status to filter by. If None, no filtering is
+            applied.
+
+    Returns:
+        QuerySet: Orders with the status, or the original queryset if
+            status is None.
+    """
+    if status is not None:
+        queryset = queryset.filter(status=status)
+    return queryset
+
+
+def filter_created_range(queryset, created_after, created_before):
+    """
+    Filter queryset by creation time, both bounds inclusive.
+
+    Args:
+        queryset: The Django queryset to filter.
+        created_after (datetime): Earliest creation time, or None.
+        created_before (datetime): Latest creation time, or None.
+
+    Returns:
+        QuerySet: Orders created within the range.
+    """
+    if created_after is not None:
+        queryset = queryset.filter(created_at__gte=created_after)
+    if created_before is not None:
+        queryset = queryset.filter(created_at__lte=created_before)
+    return queryset
+
+
+def get_business_user_ids(request):
+    """
+    Validate and cast the 'business_user_ids' query parameter.
+
+    Accepts a comma-separated list of up to MAX_ORDER_STATS_USERS user
+    ids from 1 to MAX_USER_ID. Duplicates are dropped, the order is
+    kept.
+
+    Args:
+        request: The HTTP request object containing query parameters.
+
+    Raises:
+        ValidationError: If the list is missing, too long or contains
+            values that are not integers in the id range.
+
+    Returns:
+        list: The user ids.
+    """
+    value = request.query_params.get("business_user_ids", "")
+    try:
+        ids = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        ids = None
+    if ids is None or not all(1 <= user_id <= MAX_USER_ID for user_id in ids):
+        raise ValidationError(
+            {
+                "business_user_ids": (
+                    f"Invalid value '{value}'. Expected comma-separated "
+                    f"integers from 1 to {MAX_USER_ID}."
+                )
+            }
+        )
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ValidationError(
+            {"business_user_ids": "At least one user id is required."}
+        )
+    if len(ids) > MAX_ORDER_STATS_USERS:
+        raise ValidationError(
+            {
+                "business_user_ids": (
+                    f"At most {MAX_ORDER_STATS_USERS} user ids are allowed."
+                )
+            }
+        )
+    return ids
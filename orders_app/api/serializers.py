@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from rest_framework.fields import CurrentUserDefault
 
-from offers_app.api.serializers import PriceField
+from core.fields import PriceField
 from offers_app.models import Offer
 from orders_app.models import Order
 
@@ -4,6 +4,7 @@ from rest_framework.routers import SimpleRouter
 from orders_app.api.views import (
     OrderCountBusinessAPIView,
     OrderCountCompletedBusinessAPIView,
+    OrderStatsBusinessAPIView,
     OrdersViewSet,
 )
 
@@ -22,4 +23,9 @@ urlpatterns += [
         OrderCountCompletedBusinessAPIView.as_view(),
         name="completed-order-count",
     ),
+    path(
+        "order-stats/",
+        OrderStatsBusinessAPIView.as_view(),
+        name="order-stats",
+    ),
 ]
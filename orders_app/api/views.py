@@ -1,6 +1,5 @@
-from django.contrib.auth.models import User
 from rest_framework import status
-from rest_framework.generics import RetrieveAPIView, get_object_or_404
+from rest_framework.generics import RetrieveAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
@@ -10,6 +9,22 @@ from auth_app.api.permissions import (
     IsBusinessUser,
     IsCustomerUser,
 )
+from core.pagination import CursorOptInMixin
+from core.projection import ProjectionMixin
+from orders_app.api.helpers import (
+    get_business_order_count,
+    get_business_order_stats,
+)
+from orders_app.api.pagination import OrderCursorPagination
+from orders_app.api.projections import OrderProjection
+from orders_app.api.query import (
+    filter_counterparty,
+    filter_created_range,
+    filter_participant,
+    filter_status,
+    get_business_user_ids,
+    get_order_filter_values,
+)
 from orders_app.api.serializers import (
     CreateOrderSerializer,
     PatchOrderSerializer,
@@ -17,17 +32,58 @@ from orders_app.api.serializers import (
 from orders_app.models import Order
 
 
-class OrdersViewSet(ModelViewSet):
+class OrdersViewSet(CursorOptInMixin, ProjectionMixin, ModelViewSet):
     """
     ViewSet for managing orders.
 
     Provides CRUD operations for orders with role-based permissions.
     Customer users can create orders, business users can update order status,
-    and admin/staff can delete orders.
+    and admin/staff can delete orders. Reads are rendered by
+    OrderProjection.
+
+    The list only contains the orders the user placed or fulfils.
+    Supported query parameters:
+        - status: Filter by order status.
+        - created_after: Filter by earliest creation date or datetime.
+        - created_before: Filter by latest creation date or datetime.
+        - counterparty: Filter by user ID of the other party.
+        - pagination: 'cursor' switches the list to keyset pagination.
+        - page_size: Amount of items per page.
     """
 
     queryset = Order.objects.all()
     serializer_class = CreateOrderSerializer
+    cursor_pagination_class = OrderCursorPagination
+    projection_classes = {
+        "list": OrderProjection,
+        "retrieve": OrderProjection,
+    }
+
+    def get_queryset(self):
+        """
+        Return the orders, scoped and filtered for the list action.
+
+        The list is restricted to the user's own orders, so its cost
+        scales with them instead of the whole table. Other actions look
+        up orders among all of them, as before.
+        """
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+
+        user = self.request.user
+        filter_values = get_order_filter_values(self.request)
+        queryset = filter_participant(queryset, user)
+        queryset = filter_counterparty(
+            queryset, user, filter_values["counterparty"]
+        )
+        queryset = filter_status(queryset, filter_values["status"])
+        queryset = filter_created_range(
+            queryset,
+            filter_values["created_after"],
+            filter_values["created_before"],
+        )
+        return queryset.order_by("id")
 
     def get_serializer_class(self):
         """Use patch serializer for partial update actions."""
@@ -52,17 +108,16 @@ class OrderCountBusinessAPIView(RetrieveAPIView):
     """
     API view for retrieving total order count for a business user.
 
-    Provides an endpoint to get the total number of orders associated
-    with a specific business user.
+    Provides an endpoint to get the number of in-progress orders
+    associated with a specific business user, read from its
+    BusinessOrderCount.
     """
 
     def retrieve(self, request, *args, **kwargs):
         """Return the total order count for the given business user."""
-        business_user_id = kwargs["business_user_id"]
-        business_user = get_object_or_404(User, id=business_user_id)
-
-        orders = business_user.orders_as_business.all()
-        in_progress_order_count = orders.filter(status="in_progress").count()
+        in_progress_order_count = get_business_order_count(
+            kwargs["business_user_id"], Order.StatusType.IN_PROGRESS
+        )
 
         return Response(
             {"order_count": in_progress_order_count}, status=status.HTTP_200_OK
@@ -74,18 +129,36 @@ class OrderCountCompletedBusinessAPIView(RetrieveAPIView):
     API view for retrieving completed order count for a business user.
 
     Provides an endpoint to get the number of completed orders for a
-    specific business user.
+    specific business user, read from its BusinessOrderCount.
     """
 
     def retrieve(self, request, *args, **kwargs):
         """Return the completed order count for the given business user."""
-        business_user_id = kwargs["business_user_id"]
-        business_user = get_object_or_404(User, id=business_user_id)
-
-        orders = business_user.orders_as_business.all()
-        completed_order_count = orders.filter(status="completed").count()
+        completed_order_count = get_business_order_count(
+            kwargs["business_user_id"], Order.StatusType.COMPLETED
+        )
 
         return Response(
             {"completed_order_count": completed_order_count},
             status=status.HTTP_200_OK,
         )
+
+
+class OrderStatsBusinessAPIView(RetrieveAPIView):
+    """
+    API view for retrieving the order counts of several business users.
+
+    Replaces one order-count and one completed-order-count request per
+    business user: the 'business_user_ids' query parameter takes a
+    comma-separated list of user ids, and the in-progress, completed and
+    cancelled counts of all of them are read in one query.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the order counts of the requested business users."""
+        business_user_ids = get_business_user_ids(request)
+
+        return Response(
+            get_business_order_stats(business_user_ids),
+            status=status.HTTP_200_OK,
+        )
@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete
 
 
 class OrdersAppConfig(AppConfig):
-    name = 'orders_app'
+    name = "orders_app"
+
+    def ready(self):
+        """Connect the signal handlers of the orders app."""
+        from orders_app.models import Order
+        from orders_app.signals import decrement_order_count_on_delete
+
+        post_delete.connect(decrement_order_count_on_delete, sender=Order)
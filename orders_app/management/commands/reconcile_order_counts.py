@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from orders_app.models import BusinessOrderCount, Order
+
+
+class Command(BaseCommand):
+    """
+    Backfill or repair the business order counters.
+
+    Compares every BusinessOrderCount with the number of orders of its
+    business user and status and rewrites the counters that have
+    drifted, e.g. after raw SQL writes or updates with expressions.
+    Missing counters are created; counters of combinations without
+    orders are set to zero.
+    """
+
+    help = "Recalculate the per-status order counts of business users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the number of drifted counters.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = self.get_drifted_counts()
+
+            if options["dry_run"]:
+                self.stdout.write(f"{len(drifted)} counter(s) drifted.")
+                return
+
+            for (business_user_id, status), count in drifted.items():
+                BusinessOrderCount.objects.update_or_create(
+                    business_user_id=business_user_id,
+                    status=status,
+                    defaults={"count": count},
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(drifted)} counter(s) reconciled.")
+        )
+
+    def get_drifted_counts(self):
+        """
+        Return the expected values of the counters that have drifted.
+
+        Returns:
+            dict: Expected counts keyed by (business user id, status).
+        """
+        expected = {
+            (row["business_user"], row["status"]): row["count"]
+            for row in Order.objects.order_by()
+            .values("business_user", "status")
+            .annotate(count=Count("id"))
+        }
+        stored = {
+            (business_user_id, status): count
+            for business_user_id, status, count in (
+                BusinessOrderCount.objects.values_list(
+                    "business_user_id", "status", "count"
+                )
+            )
+        }
+        return {
+            key: expected.get(key, 0)
+            for key in expected.keys() | stored.keys()
+            if expected.get(key, 0) != stored.get(key, 0)
+        }
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-17 07:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0003_order_order_business_status_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer_user', 'status'], name='order_customer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer_user', 'created_at'], name='order_customer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business_user', 'created_at'], name='order_business_created_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-17 07:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_order_counts(apps, schema_editor):
+    Order = apps.get_model('orders_app', 'Order')
+    BusinessOrderCount = apps.get_model('orders_app', 'BusinessOrderCount')
+    counts = Order.objects.order_by().values('business_user', 'status').annotate(count=Count('id'))
+    BusinessOrderCount.objects.bulk_create(
+        BusinessOrderCount(business_user_id=row['business_user'], status=row['status'], count=row['count'])
+        for row in counts
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0004_order_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('in_progress', 'in_progress'), ('cancelled', 'cancelled'), ('completed', 'completed')], max_length=11)),
+                ('count', models.IntegerField(default=0)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('business_user', 'status'), name='businessordercount_user_status_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_order_counts, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,71 @@
+from collections import Counter
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 
 from offers_app.models import BaseOffer
 
+COUNTED_FIELDS = {"business_user", "business_user_id", "status"}
+
+
+class OrderQuerySet(models.QuerySet):
+    """
+    QuerySet of orders that keeps BusinessOrderCount up to date.
+
+    Bulk updates and creations bypass Order.save, so they adjust the
+    counters themselves in the same transaction; the admin's bulk status
+    actions go through update. Deletions are counted by a post_delete
+    signal (see orders_app.signals), which also fires for bulk and
+    cascading deletes.
+    """
+
+    def update(self, **kwargs):
+        """
+        Update the orders and move them between the counters.
+
+        Updates of business_user or status lock and read the affected
+        rows first. The new values must be plain values or users, not
+        expressions.
+        """
+        if not COUNTED_FIELDS & set(kwargs):
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            rows = list(
+                self.select_for_update().values_list(
+                    "pk", "business_user_id", "status"
+                )
+            )
+            updated = self.model._base_manager.filter(
+                pk__in=[row[0] for row in rows]
+            ).update(**kwargs)
+
+            business_user = kwargs.get(
+                "business_user_id", kwargs.get("business_user")
+            )
+            business_user_id = getattr(business_user, "pk", business_user)
+            changes = Counter()
+            for _, previous_business_user_id, previous_status in rows:
+                changes[(previous_business_user_id, previous_status)] -= 1
+                changes[
+                    (
+                        business_user_id or previous_business_user_id,
+                        kwargs.get("status", previous_status),
+                    )
+                ] += 1
+            BusinessOrderCount.add(changes)
+        return updated
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Create the orders and count them in the same transaction."""
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            BusinessOrderCount.add(
+                Counter((obj.business_user_id, obj.status) for obj in objs)
+            )
+        return objs
+
 
 class Order(BaseOffer):
     """
@@ -50,3 +113,121 @@ class Order(BaseOffer):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Covers the per-status order counts of a business user.
+            models.Index(
+                fields=["business_user", "status"],
+                name="order_business_status_idx",
+            ),
+            # Serve the order list of a user, filtered by status or
+            # ordered and filtered by creation time.
+            models.Index(
+                fields=["customer_user", "status"],
+                name="order_customer_status_idx",
+            ),
+            models.Index(
+                fields=["customer_user", "created_at"],
+                name="order_customer_created_idx",
+            ),
+            models.Index(
+                fields=["business_user", "created_at"],
+                name="order_business_created_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save the order and adjust BusinessOrderCount with it.
+
+        The counter of the order's business user and status is updated
+        in the same transaction as the order. Changes of business_user or
+        status read the stored values first to move the order from the
+        former counter.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not (
+            COUNTED_FIELDS & set(update_fields)
+        ):
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic(using=kwargs.get("using")):
+            changes = Counter()
+            if not self._state.adding:
+                previous = (
+                    Order.objects.filter(pk=self.pk)
+                    .select_for_update()
+                    .values_list("business_user_id", "status")
+                    .first()
+                )
+                if previous is not None:
+                    changes[previous] -= 1
+            super().save(*args, **kwargs)
+            changes[(self.business_user_id, self.status)] += 1
+            BusinessOrderCount.add(changes)
+
+
+class BusinessOrderCount(models.Model):
+    """
+    Number of orders of a business user per status.
+
+    Denormalized from Order, so the order count endpoints read one row
+    instead of counting orders. Maintained by Order.save, OrderQuerySet
+    and the post_delete signal of orders; the reconcile_order_counts
+    command repairs drift.
+
+    Attributes:
+        business_user (User): The business user fulfilling the orders.
+        status (str): The status of the counted orders.
+        count (int): Number of orders of the user with the status.
+    """
+
+    business_user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="order_counts"
+    )
+    status = models.CharField(max_length=11, choices=Order.StatusType.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["business_user", "status"],
+                name="businessordercount_user_status_uniq",
+            ),
+        ]
+
+    @classmethod
+    def add(cls, changes):
+        """
+        Add amounts to the counters, creating missing ones.
+
+        Callers should run this inside the transaction that changed the
+        orders.
+
+        Args:
+            changes (dict): Amounts to add, keyed by (business user id,
+                status). Zero amounts are skipped.
+        """
+        for (business_user_id, status), amount in changes.items():
+            if not amount:
+                continue
+            counter = cls.objects.filter(
+                business_user_id=business_user_id, status=status
+            )
+            if counter.update(count=F("count") + amount) or amount < 0:
+                # A missing counter is not decremented; the command
+                # reconcile_order_counts repairs it.
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        business_user_id=business_user_id,
+                        status=status,
+                        count=amount,
+                    )
+            except IntegrityError:
+                # Created concurrently since the update above.
+                counter.update(count=F("count") + amount)
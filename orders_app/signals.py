@@ -0,0 +1,11 @@
+from orders_app.models import BusinessOrderCount
+
+
+def decrement_order_count_on_delete(sender, instance, **kwargs):
+    """
+    Remove a deleted order from its business order counter.
+
+    Fires for single, bulk and cascading deletes alike, inside their
+    transaction.
+    """
+    BusinessOrderCount.add({(instance.business_user_id, instance.status): -1})
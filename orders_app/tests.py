@@ -1,16 +1,25 @@
+from datetime import datetime, timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib import admin
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 
 from core.test_factory.authenticate import TestDataFactory
 from core.test_factory.data import APITestCaseWithSetup
-from orders_app.models import Order
+from orders_app.admin import OrderAdmin
+from orders_app.api.views import OrdersViewSet
+from orders_app.models import BusinessOrderCount, Order
 
 # Create your tests here.
 
 
 class TestOrdersViewSet(APITestCaseWithSetup):
     def setUp(self):
+        super().setUp()
         self.client = TestDataFactory.authenticate_user(self.customer_user_1)
 
     def test_order_list_ok(self):
@@ -229,3 +238,351 @@ class TestOrdersViewSet(APITestCaseWithSetup):
             data.pop("completed_order_count"), completed_order_count
         )
         self.assertEqual(data, {}, "Response contains unexpected fields")
+
+    def test_order_count_uses_business_status_index(self):
+        plan = Order.objects.filter(
+            business_user=self.business_user_1, status="completed"
+        ).explain()
+
+        self.assertIn(
+            "INDEX order_business_status_idx "
+            "(business_user_id=? AND status=?)",
+            plan,
+        )
+
+    def test_order_projection_matches_serializer(self):
+        self.order_1.price = 99.995
+        self.order_1.save()
+        for url in [
+            reverse("order-list"),
+            reverse("order-detail", kwargs={"pk": self.order_1.pk}),
+        ]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                with mock.patch.object(
+                    OrdersViewSet, "projection_classes", {}
+                ):
+                    expected = self.client.get(url)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.content, expected.content)
+
+
+class TestOrderListScope(APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.client = TestDataFactory.authenticate_user(self.customer_user_1)
+        self.url = reverse("order-list")
+
+    def get_ids(self, params=None):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [order["id"] for order in response.json()]
+
+    def test_customer_sees_own_orders(self):
+        self.assertEqual(self.get_ids(), [self.order_1.id, self.order_3.id])
+
+    def test_business_user_sees_own_orders(self):
+        self.client = TestDataFactory.authenticate_user(self.business_user_1)
+
+        self.assertEqual(
+            self.get_ids(),
+            [self.order_1.id, self.order_2.id, self.order_4.id],
+        )
+
+    def test_filter_by_status(self):
+        self.assertEqual(
+            self.get_ids({"status": "cancelled"}), [self.order_3.id]
+        )
+
+    def test_filter_by_counterparty(self):
+        self.assertEqual(
+            self.get_ids({"counterparty": self.business_user_2.id}),
+            [self.order_3.id],
+        )
+
+    def test_filter_by_created_range(self):
+        Order.objects.filter(id=self.order_1.id).update(
+            created_at=datetime(2025, 1, 15, 12, tzinfo=timezone.utc)
+        )
+        Order.objects.filter(id=self.order_3.id).update(
+            created_at=datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+        )
+
+        self.assertEqual(
+            self.get_ids({"created_after": "2025-02-01"}), [self.order_3.id]
+        )
+        self.assertEqual(
+            self.get_ids({"created_before": "2025-01-15"}), [self.order_1.id]
+        )
+        self.assertEqual(
+            self.get_ids(
+                {
+                    "created_after": "2025-01-15T13:00:00Z",
+                    "created_before": "2025-03-01",
+                }
+            ),
+            [self.order_3.id],
+        )
+
+    def test_invalid_filters_are_rejected(self):
+        response = self.client.get(
+            self.url,
+            {
+                "status": "unknown",
+                "created_after": "yesterday",
+                "counterparty": "abc",
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            set(response.json()),
+            {"status", "created_after", "counterparty"},
+        )
+
+    def test_out_of_range_counterparty_is_rejected(self):
+        for counterparty in ["0", str(2**63)]:
+            with self.subTest(counterparty=counterparty):
+                response = self.client.get(
+                    self.url, {"counterparty": counterparty}
+                )
+
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST
+                )
+                self.assertIn("counterparty", response.json())
+
+    def test_cursor_pages_walk_own_orders(self):
+        self.client = TestDataFactory.authenticate_user(self.business_user_1)
+        url = f"{self.url}?pagination=cursor&page_size=2"
+        order_ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            order_ids += [order["id"] for order in data["results"]]
+            url = data["next"]
+
+        self.assertEqual(
+            order_ids, [self.order_4.id, self.order_2.id, self.order_1.id]
+        )
+
+    def test_customer_orders_use_customer_index(self):
+        plan = Order.objects.filter(
+            customer_user=self.customer_user_1, status="cancelled"
+        ).explain()
+
+        self.assertIn("INDEX order_customer_status_idx", plan)
+
+
+class TestBusinessOrderCount(APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.client = TestDataFactory.authenticate_user(self.customer_user_1)
+
+    def get_counts(self, business_user):
+        return dict(
+            BusinessOrderCount.objects.filter(
+                business_user=business_user
+            ).values_list("status", "count")
+        )
+
+    def test_created_orders_are_counted(self):
+        self.assertEqual(
+            self.get_counts(self.business_user_1),
+            {"in_progress": 2, "completed": 1},
+        )
+        self.assertEqual(
+            self.get_counts(self.business_user_2), {"cancelled": 1}
+        )
+
+    def test_order_count_is_a_single_query(self):
+        url = reverse(
+            "order-count", kwargs={"business_user_id": self.business_user_1.id}
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        self.assertEqual(response.json(), {"order_count": 2})
+
+    def test_user_without_orders_has_zero_count(self):
+        url = reverse(
+            "completed-order-count",
+            kwargs={"business_user_id": self.business_user_2.id},
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.json(), {"completed_order_count": 0})
+
+    def test_status_change_moves_order(self):
+        self.client = TestDataFactory.authenticate_user(self.business_user_1)
+        url = reverse("order-detail", kwargs={"pk": self.order_1.pk})
+
+        response = self.client.patch(url, {"status": "completed"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_counts(self.business_user_1),
+            {"in_progress": 1, "completed": 2},
+        )
+
+    def test_admin_bulk_action_moves_orders(self):
+        order_admin = OrderAdmin(Order, admin.site)
+        queryset = order_admin.get_queryset(None).filter(
+            business_user=self.business_user_1
+        )
+
+        with mock.patch.object(order_admin, "message_user"):
+            order_admin.mark_as_cancelled(None, queryset)
+
+        self.assertEqual(
+            self.get_counts(self.business_user_1),
+            {"in_progress": 0, "completed": 0, "cancelled": 3},
+        )
+
+    def test_deleted_orders_are_uncounted(self):
+        self.order_1.delete()
+        self.customer_user_2.delete()
+
+        self.assertEqual(
+            self.get_counts(self.business_user_1),
+            {"in_progress": 0, "completed": 0},
+        )
+
+    def test_bulk_created_orders_are_counted(self):
+        Order.objects.bulk_create(
+            [
+                Order(
+                    business_user=self.business_user_2,
+                    customer_user=self.customer_user_1,
+                    title="Bulk order",
+                    delivery_time_in_days=1,
+                    offer_type="basic",
+                    status="completed",
+                )
+            ]
+        )
+
+        self.assertEqual(
+            self.get_counts(self.business_user_2),
+            {"cancelled": 1, "completed": 1},
+        )
+
+    def test_reconcile_command_repairs_drift(self):
+        BusinessOrderCount.objects.filter(
+            business_user=self.business_user_1, status="in_progress"
+        ).update(count=7)
+        BusinessOrderCount.objects.filter(
+            business_user=self.business_user_2
+        ).delete()
+        out = StringIO()
+
+        call_command("reconcile_order_counts", "--dry-run", stdout=out)
+        self.assertIn("2 counter(s) drifted.", out.getvalue())
+
+        call_command("reconcile_order_counts", stdout=out)
+        self.assertIn("2 counter(s) reconciled.", out.getvalue())
+        self.assertEqual(
+            self.get_counts(self.business_user_1),
+            {"in_progress": 2, "completed": 1},
+        )
+        self.assertEqual(
+            self.get_counts(self.business_user_2), {"cancelled": 1}
+        )
+
+
+class TestOrderStats(APITestCaseWithSetup):
+    def setUp(self):
+        super().setUp()
+        self.client = TestDataFactory.authenticate_user(self.customer_user_1)
+        self.url = reverse("order-stats")
+
+    def get_stats(self, ids):
+        return self.client.get(self.url, {"business_user_ids": ids})
+
+    def test_stats_of_several_users_in_one_query(self):
+        ids = f"{self.business_user_2.id},{self.business_user_1.id}"
+
+        with self.assertNumQueries(1):
+            response = self.get_stats(ids)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            [
+                {
+                    "business_user": self.business_user_2.id,
+                    "order_count": 0,
+                    "completed_order_count": 0,
+                    "cancelled_order_count": 1,
+                },
+                {
+                    "business_user": self.business_user_1.id,
+                    "order_count": 2,
+                    "completed_order_count": 1,
+                    "cancelled_order_count": 0,
+                },
+            ],
+        )
+
+    def test_users_without_orders_and_unknown_ids(self):
+        response = self.get_stats(f"{self.customer_user_1.id},999")
+
+        self.assertEqual(
+            response.json(),
+            [
+                {
+                    "business_user": self.customer_user_1.id,
+                    "order_count": 0,
+                    "completed_order_count": 0,
+                    "cancelled_order_count": 0,
+                }
+            ],
+        )
+
+    def test_stats_match_single_count_endpoints(self):
+        data = self.get_stats(str(self.business_user_1.id)).json()[0]
+
+        order_count = self.client.get(
+            reverse(
+                "order-count",
+                kwargs={"business_user_id": self.business_user_1.id},
+            )
+        ).json()
+        completed_order_count = self.client.get(
+            reverse(
+                "completed-order-count",
+                kwargs={"business_user_id": self.business_user_1.id},
+            )
+        ).json()
+        self.assertEqual(data["order_count"], order_count["order_count"])
+        self.assertEqual(
+            data["completed_order_count"],
+            completed_order_count["completed_order_count"],
+        )
+
+    def test_invalid_ids_are_rejected(self):
+        for ids in [
+            "",
+            "1,abc",
+            "1,0",
+            f"1,{2**63}",
+            ",".join(str(id) for id in range(1, 102)),
+        ]:
+            with self.subTest(ids=ids):
+                response = self.get_stats(ids)
+
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST
+                )
+                self.assertIn("business_user_ids", response.json())
+
+    def test_stats_not_authorized(self):
+        self.client.force_authenticate(user=None)
+
+        response = self.get_stats("1")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,17 @@
+from core.projection import DateTimeField, Field, Projection
+from reviews_app.models import Review
+
+
+class ReviewProjection(Projection):
+    """Projection of BaseReviewSerializer."""
+
+    model = Review
+    fields = {
+        "id": Field(),
+        "business_user": Field(),
+        "reviewer": Field(),
+        "rating": Field(),
+        "description": Field(),
+        "created_at": DateTimeField(),
+        "updated_at": DateTimeField(),
+    }
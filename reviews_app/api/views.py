@@ -2,7 +2,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
 from auth_app.api.permissions import IsCustomerUser
+from core.projection import ProjectionMixin
 from reviews_app.api.permissions import IsReviewCreator
+from reviews_app.api.projections import ReviewProjection
 from reviews_app.api.serializers import (
     BaseReviewSerializer,
     CreateReviewSerializer,
@@ -10,17 +12,22 @@ from reviews_app.api.serializers import (
 from reviews_app.models import Review
 
 
-class ReviewsViewSet(ModelViewSet):
+class ReviewsViewSet(ProjectionMixin, ModelViewSet):
     """
     ViewSet for managing reviews.
 
     Provides CRUD operations for reviews with role-based permissions.
     Customer users can create reviews, and only the review creator can
-    update or delete their own reviews.
+    update or delete their own reviews. Reads are rendered by
+    ReviewProjection.
     """
 
     serializer_class = BaseReviewSerializer
     queryset = Review.objects.all()
+    projection_classes = {
+        "list": ReviewProjection,
+        "retrieve": ReviewProjection,
+    }
 
     def get_permissions(self):
         """Return permissions based on the current action and user role."""
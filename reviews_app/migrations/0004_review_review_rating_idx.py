@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-17 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews_app', '0003_alter_review_description'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['rating'], name='review_rating_idx'),
+        ),
+    ]
@@ -41,6 +41,12 @@ class Review(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        # (business_user, reviewer) lookups use the index of the unique
+        # constraint below.
+        indexes = [
+            # Covers the average rating without reading review rows.
+            models.Index(fields=["rating"], name="review_rating_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["business_user", "reviewer"],
@@ -1,10 +1,12 @@
 import json
+from unittest import mock
 
 from django.urls import reverse
 from rest_framework import status
 
 from core.test_factory.authenticate import TestDataFactory
 from core.test_factory.data import APITestCaseWithSetup
+from reviews_app.api.views import ReviewsViewSet
 from reviews_app.models import Review
 
 # Create your tests here.
@@ -12,6 +14,7 @@ from reviews_app.models import Review
 
 class TestReviewViewSet(APITestCaseWithSetup):
     def setUp(self):
+        super().setUp()
         self.client = TestDataFactory.authenticate_user(self.customer_user_1)
 
     def test_reviews_list_ok(self):
@@ -243,3 +246,18 @@ class TestReviewViewSet(APITestCaseWithSetup):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_review_projection_matches_serializer(self):
+        for url in [
+            reverse("review-list"),
+            reverse("review-detail", kwargs={"pk": self.review_1.pk}),
+        ]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                with mock.patch.object(
+                    ReviewsViewSet, "projection_classes", {}
+                ):
+                    expected = self.client.get(url)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.content, expected.content)